@@ -0,0 +1,78 @@
+"""Initial schema
+
+Tables as created by SQLModel.metadata.create_all before migrations existed.
+Uses if_not_exists so databases created that way can be upgraded in place.
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "items",
+        sa.Column("description", sa.String(length=255), nullable=True),
+        sa.Column("id", sa.Uuid(), nullable=False),
+        sa.Column("title", sa.String(length=255), nullable=False),
+        sa.Column("owner_id", sa.Uuid(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_items_owner_id", "items", ["owner_id"], unique=False, if_not_exists=True
+    )
+    op.create_table(
+        "matches",
+        sa.Column("public_id", sa.Uuid(), nullable=False),
+        sa.Column("business_public_id", sa.Uuid(), nullable=True),
+        sa.Column("court_public_id", sa.Uuid(), nullable=True),
+        sa.Column("court_name", sa.String(), nullable=True),
+        sa.Column("time", sa.Integer(), nullable=True),
+        sa.Column("date", sa.Date(), nullable=True),
+        sa.Column("status", sa.String(), nullable=True),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "court_name",
+            "court_public_id",
+            "time",
+            "date",
+            name="uq_match_constraints",
+        ),
+        sa.UniqueConstraint("public_id"),
+        if_not_exists=True,
+    )
+    op.create_table(
+        "matches_players",
+        sa.Column("match_public_id", sa.Uuid(), nullable=True),
+        sa.Column("user_public_id", sa.Uuid(), nullable=False),
+        sa.Column("distance", sa.Float(), nullable=False),
+        sa.Column("reserve", sa.String(), nullable=True),
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(
+            ["match_public_id"], ["matches.public_id"], ondelete="CASCADE"
+        ),
+        sa.PrimaryKeyConstraint("id"),
+        sa.UniqueConstraint(
+            "match_public_id", "user_public_id", name="uq_match_player"
+        ),
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("matches_players")
+    op.drop_table("matches")
+    op.drop_index("ix_items_owner_id", table_name="items")
+    op.drop_table("items")
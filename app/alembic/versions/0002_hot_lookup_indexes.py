@@ -0,0 +1,48 @@
+"""Indexes for the hot lookup columns
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 10:30:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_matches_players_user_public_id",
+        "matches_players",
+        ["user_public_id"],
+        unique=False,
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_matches_players_match_public_id_reserve_distance",
+        "matches_players",
+        ["match_public_id", "reserve", "distance"],
+        unique=False,
+        if_not_exists=True,
+    )
+    op.create_index(
+        "ix_matches_business_public_id_date",
+        "matches",
+        ["business_public_id", "date"],
+        unique=False,
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_matches_business_public_id_date", table_name="matches")
+    op.drop_index(
+        "ix_matches_players_match_public_id_reserve_distance",
+        table_name="matches_players",
+    )
+    op.drop_index("ix_matches_players_user_public_id", table_name="matches_players")
@@ -0,0 +1,29 @@
+"""Index for the matches keyset pagination
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 11:30:00.000000
+
+"""
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_matches_date_time_id",
+        "matches",
+        ["date", "time", "id"],
+        unique=False,
+        if_not_exists=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_matches_date_time_id", table_name="matches")
@@ -0,0 +1,47 @@
+"""Players activity
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "0005"
+down_revision = "0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "players_activity",
+        sa.Column("user_public_id", sa.Uuid(), nullable=False),
+        sa.Column("last_match_date", sa.Date(), nullable=True),
+        sa.Column("n_matches", sa.Integer(), nullable=False),
+        sa.Column("last_assigned_at", sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint("user_public_id"),
+        if_not_exists=True,
+    )
+    # Backfill from the reserved matches the players are inside of
+    op.execute(
+        """
+        INSERT INTO players_activity (user_public_id, last_match_date, n_matches)
+        SELECT
+            matches_players.user_public_id,
+            MAX(matches.date) FILTER (WHERE matches.status = 'Reserved'),
+            COUNT(*)
+        FROM matches_players
+        JOIN matches ON matches.public_id = matches_players.match_public_id
+        WHERE matches_players.reserve = 'inside'
+        GROUP BY matches_players.user_public_id
+        ON CONFLICT (user_public_id) DO NOTHING
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("players_activity")
@@ -5,6 +5,7 @@ from app.api.routes import (
     items_service,
     matches,
     matches_players,
+    monitoring,
     players_matches,
 )
 
@@ -28,3 +29,8 @@ api_router.include_router(
     prefix="/players/{user_public_id}/matches",
     tags=["players"],
 )
+api_router.include_router(
+    monitoring.router,
+    prefix="/monitoring",
+    tags=["monitoring"],
+)
@@ -1,11 +1,15 @@
-from typing import Any
+from collections.abc import AsyncIterator
+from typing import Annotated, Any
 from uuid import UUID
 
-from fastapi import APIRouter, Depends, status
+from fastapi import APIRouter, Depends, Query, status
+from fastapi.responses import StreamingResponse
 
+from app.core.config import settings
 from app.models.match import (
     Match,
     MatchCreate,
+    MatchCursor,
     MatchFilters,
     MatchListPublic,
     MatchPublic,
@@ -16,7 +20,6 @@ from app.models.match_generation import (
     MatchGenerationCreate,
     MatchGenerationCreateExtended,
 )
-from app.services.bot_service import BotService
 from app.services.match_generator_service import MatchGeneratorService
 from app.services.match_service import MatchService
 from app.utilities.dependencies import SessionDep
@@ -68,10 +71,7 @@ async def generate_matches(
         session, match_gen_create
     )
     matches = await match_gen_service.get_matches(session, matches_public_ids)
-    list_of_matches = MatchesExtendedListPublic.from_private(matches)
-    message_service = BotService()
-    await message_service.send_new_matches(list_of_matches.get_list_player_assigned())
-    return list_of_matches
+    return MatchesExtendedListPublic.from_private(matches)
 
 
 @router.post(
@@ -90,10 +90,7 @@ async def generate_matches_all(
         session, match_gen_create
     )
     matches = await match_gen_service.get_matches(session, matches_public_ids)
-    list_of_matches = MatchesExtendedListPublic.from_private(matches)
-    message_service = BotService()
-    await message_service.send_new_matches(list_of_matches.get_list_player_assigned())
-    return list_of_matches
+    return MatchesExtendedListPublic.from_private(matches)
 
 
 @router.get("/{public_id}", status_code=status.HTTP_200_OK)
@@ -108,19 +105,51 @@ async def get_match(session: SessionDep, public_id: UUID) -> MatchPublic:
     return match_public
 
 
-@router.get("/", status_code=status.HTTP_200_OK)
+async def _matches_ndjson(
+    session: SessionDep, prov_match_filters: MatchFilters, cursor: MatchCursor | None
+) -> AsyncIterator[str]:
+    # The session dependency is already closed when the body is streamed,
+    # the session checks out a new connection and must be closed here.
+    try:
+        async for match in match_service.stream_matches(
+            session, prov_match_filters, cursor
+        ):
+            yield MatchPublic.from_private(match).model_dump_json() + "\n"
+    finally:
+        await session.close()
+
+
+@router.get("/", response_model=MatchListPublic, status_code=status.HTTP_200_OK)
 async def get_matches(
-    session: SessionDep, prov_match_filters: MatchFilters = Depends()
-) -> MatchListPublic:
+    session: SessionDep,
+    prov_match_filters: MatchFilters = Depends(),
+    cursor: str | None = None,
+    limit: Annotated[
+        int, Query(ge=1, le=settings.MATCHES_PAGE_SIZE_MAX)
+    ] = settings.MATCHES_PAGE_SIZE,
+    stream: bool = False,
+) -> Any:
     """
-    Get matches, that match the filters.
+    Get matches, that match the filters, ordered by date, time and id.
     :param session: database.
     :param prov_match_filters: filters (optional None for no filter).
-    :return: list of matches that match the given filter.
+    :param cursor: next_cursor of the previous page (None for the first page).
+    :param limit: max number of matches in the page.
+    :param stream: stream all the matches after the cursor as NDJSON instead.
+    :return: page of matches that match the given filter.
     """
-    matches = await match_service.get_matches(session, prov_match_filters)
-    matches_public = MatchListPublic.from_private(matches)
-    return matches_public
+    match_cursor = MatchCursor.decode(cursor) if cursor else None
+    if stream:
+        return StreamingResponse(
+            _matches_ndjson(session, prov_match_filters, match_cursor),
+            media_type="application/x-ndjson",
+        )
+    matches, next_cursor = await match_service.get_matches_page(
+        session, prov_match_filters, limit, match_cursor
+    )
+    return MatchListPublic.from_private(
+        matches, next_cursor.encode() if next_cursor else None
+    )
 
 
 @router.patch(
@@ -9,6 +9,7 @@ from app.models.match_player import (
     MatchPlayerListPublic,
     MatchPlayerPayPublic,
     MatchPlayerPublic,
+    MatchPlayersReserveUpdate,
     MatchPlayerUpdate,
 )
 from app.services.match_player_service import MatchPlayerService
@@ -108,6 +109,31 @@ async def get_match_player(
     return match_player_public
 
 
+@router.patch(
+    "/bulk/",
+    response_model=MatchPlayerListPublic,
+    status_code=status.HTTP_200_OK,
+)
+async def update_match_players_reserve(
+    *,
+    session: SessionDep,
+    match_public_id: UUID,
+    match_players_in: MatchPlayersReserveUpdate,
+) -> MatchPlayerListPublic:
+    """
+    Set the reserve of many match players at once.
+    Unlike the update of one match player, it does not create payments
+    nor assign new players.
+    """
+    match_players = await match_player_service.update_match_players_reserve(
+        session,
+        match_public_id,
+        match_players_in.user_public_ids,
+        match_players_in.reserve,
+    )
+    return MatchPlayerListPublic.from_private(match_players)
+
+
 @router.patch(
     "/{user_public_id}/",
     response_model=MatchPlayerPayPublic,
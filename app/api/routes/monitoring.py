@@ -0,0 +1,53 @@
+from fastapi import APIRouter, status
+from fastapi.responses import PlainTextResponse
+
+from app.core.db import get_pool_status
+from app.core.metrics import (
+    PROMETHEUS_CONTENT_TYPE,
+    http_client_metrics,
+    render_http_client_metrics,
+)
+from app.models.monitoring import CacheStatus, DBPoolStatus
+from app.utilities.cache import get_caches_status
+
+router = APIRouter()
+
+
+@router.get(
+    "/db-pool",
+    response_model=DBPoolStatus,
+    status_code=status.HTTP_200_OK,
+)
+async def get_db_pool_status() -> DBPoolStatus:
+    """
+    Get the DB connection pool status and checkout wait statistics.
+    """
+    return DBPoolStatus(**get_pool_status())
+
+
+@router.get(
+    "/caches",
+    response_model=list[CacheStatus],
+    status_code=status.HTTP_200_OK,
+)
+async def get_caches_status_list() -> list[CacheStatus]:
+    """
+    Get the size and hit/miss counters of the in-process caches.
+    """
+    return [CacheStatus(**cache_status) for cache_status in get_caches_status()]
+
+
+@router.get(
+    "/metrics",
+    response_class=PlainTextResponse,
+    status_code=status.HTTP_200_OK,
+)
+async def get_metrics() -> PlainTextResponse:
+    """
+    Get the downstream services latency, responses and in-flight requests,
+    in the Prometheus text format.
+    """
+    return PlainTextResponse(
+        render_http_client_metrics(http_client_metrics),
+        media_type=PROMETHEUS_CONTENT_TYPE,
+    )
@@ -0,0 +1,119 @@
+"""
+Query plans of the hot lookups, before and after the hot lookup indexes.
+
+Seeds synthetic matches and players, runs EXPLAIN ANALYZE without the
+indexes and then with them. Everything runs in one transaction that is
+rolled back, so the target DB is left untouched.
+
+Usage:
+    python -m app.benchmarks.query_plans --matches 20000 --players 8
+"""
+
+import argparse
+import asyncio
+from typing import Any
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.core.config import settings
+from app.core.db import get_async_engine, init_db
+from app.seeds.seed_synthetic import seed_matches
+
+INDEXES = {
+    "ix_matches_players_user_public_id": (
+        "CREATE INDEX ix_matches_players_user_public_id "
+        "ON matches_players (user_public_id)"
+    ),
+    "ix_matches_players_match_public_id_reserve_distance": (
+        "CREATE INDEX ix_matches_players_match_public_id_reserve_distance "
+        "ON matches_players (match_public_id, reserve, distance)"
+    ),
+    "ix_matches_business_public_id_date": (
+        "CREATE INDEX ix_matches_business_public_id_date "
+        "ON matches (business_public_id, date)"
+    ),
+}
+
+QUERIES = {
+    "player matches": (
+        "SELECT * FROM matches_players WHERE user_public_id = :user_public_id"
+    ),
+    "closest similar players": (
+        "SELECT * FROM matches_players "
+        "WHERE match_public_id = :match_public_id AND reserve = 'similar' "
+        "ORDER BY distance LIMIT 3"
+    ),
+    "business day matches": (
+        "SELECT * FROM matches "
+        "WHERE business_public_id = :business_public_id AND date = :date"
+    ),
+}
+
+
+async def sample_params(conn: AsyncConnection) -> dict[str, Any]:
+    match = (
+        await conn.execute(
+            text("SELECT public_id, business_public_id, date FROM matches LIMIT 1")
+        )
+    ).one()
+    player = (
+        await conn.execute(text("SELECT user_public_id FROM matches_players LIMIT 1"))
+    ).one()
+    return {
+        "match_public_id": match.public_id,
+        "business_public_id": match.business_public_id,
+        "date": match.date,
+        "user_public_id": player.user_public_id,
+    }
+
+
+async def explain(
+    conn: AsyncConnection, query: str, params: dict[str, Any]
+) -> list[str]:
+    result = await conn.execute(
+        text(f"EXPLAIN (ANALYZE, COSTS OFF) {query}"),
+        {k: v for k, v in params.items() if f":{k}" in query},
+    )
+    return [row[0] for row in result]
+
+
+async def print_plans(conn: AsyncConnection, title: str) -> None:
+    await conn.execute(text("ANALYZE matches"))
+    await conn.execute(text("ANALYZE matches_players"))
+    params = await sample_params(conn)
+    print(f"\n===== {title} =====")
+    for name, query in QUERIES.items():
+        print(f"\n--- {name} ---")
+        for line in await explain(conn, query, params):
+            print(line)
+
+
+async def main(engine_url: str, n_matches: int, n_players: int) -> None:
+    await init_db(engine_url)
+    engine = get_async_engine(engine_url)
+    async with engine.connect() as conn:
+        transaction = await conn.begin()
+        try:
+            for index in INDEXES:
+                await conn.execute(text(f"DROP INDEX IF EXISTS {index}"))
+            await seed_matches(conn, n_matches, n_players)
+            await print_plans(conn, "without indexes")
+
+            for create_index in INDEXES.values():
+                await conn.execute(text(create_index))
+            await print_plans(conn, "with indexes")
+        finally:
+            await transaction.rollback()
+    await engine.dispose()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--matches", type=int, default=20000)
+    parser.add_argument("--players", type=int, default=8)
+    parser.add_argument(
+        "--url", type=str, default=str(settings.SQLALCHEMY_DATABASE_URI)
+    )
+    args = parser.parse_args()
+    asyncio.run(main(args.url, args.matches, args.players))
@@ -24,6 +24,55 @@ class Settings(BaseSettings):
     POSTGRES_DB: str
     API_KEY: str
 
+    # Connection pool (per worker)
+    POSTGRES_POOL_SIZE: int = 10
+    POSTGRES_POOL_MAX_OVERFLOW: int = 10
+    POSTGRES_POOL_TIMEOUT: float = 30.0
+    POSTGRES_POOL_RECYCLE: int = 1800
+    POSTGRES_POOL_PRE_PING: bool = True
+
+    # Log statements slower than this, in seconds (None to disable)
+    SLOW_QUERY_THRESHOLD: float | None = None
+
+    # Outbound HTTP clients (one shared client per downstream host)
+    HTTP_CLIENT_MAX_CONNECTIONS: int = 100
+    HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_CLIENT_KEEPALIVE_EXPIRY: float = 30.0
+    # Needs the h2 package (httpx[http2]), only negotiated over TLS
+    HTTP_CLIENT_HTTP2: bool = False
+
+    # Match generation
+    MATCH_GENERATION_CONCURRENCY: int = 8
+
+    # Matches listing (page sizes in rows)
+    MATCHES_PAGE_SIZE: int = 100
+    MATCHES_PAGE_SIZE_MAX: int = 1000
+    MATCHES_STREAM_YIELD_PER: int = 500
+
+    # Business service cache
+    BUSINESS_CACHE_MAXSIZE: int = 1024
+    BUSINESS_CACHE_COURTS_TTL: float = 300.0
+    BUSINESS_CACHE_AVAILABLE_TIMES_TTL: float = 30.0
+
+    # Players service candidates cache (TTL in seconds), kept short since
+    # availability changes often
+    PLAYERS_CACHE_MAXSIZE: int = 1024
+    PLAYERS_CACHE_TTL: float = 10.0
+
+    # Users service telegram ids cache (TTL in seconds) and lookup concurrency
+    USER_CACHE_MAXSIZE: int = 10000
+    USER_CACHE_TELEGRAM_ID_TTL: float = 3600.0
+    USER_SERVICE_CONCURRENCY: int = 10
+
+    # Outbox (side effects delivered in background, times in seconds)
+    OUTBOX_WORKERS: int = 2
+    OUTBOX_POLL_INTERVAL: float = 1.0
+    OUTBOX_BATCH_SIZE: int = 100
+    OUTBOX_LEASE: float = 60.0
+    OUTBOX_MAX_ATTEMPTS: int = 8
+    OUTBOX_BACKOFF_BASE: float = 2.0
+    OUTBOX_BACKOFF_MAX: float = 300.0
+
     # Services
     ITEMS_SERVICE_HOST: str
     ITEMS_SERVICE_PORT: int | None = None
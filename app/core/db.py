@@ -1,22 +1,230 @@
+import contextvars
+import logging
+import time
+from typing import Any
+
+from sqlalchemy import event, exc
+from sqlalchemy.engine import Connection, ExecutionContext
 from sqlalchemy.ext.asyncio import AsyncEngine, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, PoolProxiedConnection
 from sqlmodel import SQLModel
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
-from app.models import Item, Match, MatchPlayer  # noqa: F401
+from app.models import (  # noqa: F401
+    Item,
+    Match,
+    MatchPlayer,
+    OutboxMessage,
+    PlayerActivity,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class PoolStats:
+    """Checkout counters of a connection pool."""
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_time_total = 0.0
+        self.wait_time_max = 0.0
+
+    def add_checkout(self, wait_time: float) -> None:
+        self.checkouts += 1
+        self.wait_time_total += wait_time
+        self.wait_time_max = max(self.wait_time_max, wait_time)
+
+    @property
+    def wait_time_avg(self) -> float:
+        if self.checkouts == 0:
+            return 0.0
+        return self.wait_time_total / self.checkouts
+
+
+class InstrumentedQueuePool(AsyncAdaptedQueuePool):
+    """AsyncAdaptedQueuePool that records how long each checkout waits."""
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self.stats = PoolStats()
+
+    def connect(self) -> PoolProxiedConnection:
+        start = time.perf_counter()
+        try:
+            connection = super().connect()
+        except exc.TimeoutError:
+            self.stats.timeouts += 1
+            raise
+        self.stats.add_checkout(time.perf_counter() - start)
+        return connection
+
+
+class QueryStats:
+    """
+    Statements executed, and their time, within a unit of work (a request).
+    Nested stats also add to the enclosing ones.
+    """
+
+    def __init__(self, parent: "QueryStats | None" = None) -> None:
+        self.parent = parent
+        self.count = 0
+        self.time_total = 0.0
+
+    def add_query(self, elapsed: float) -> None:
+        self.count += 1
+        self.time_total += elapsed
+        if self.parent is not None:
+            self.parent.add_query(elapsed)
+
+
+# Query stats of the current request, set by track_queries
+_query_stats: contextvars.ContextVar[QueryStats | None] = contextvars.ContextVar(
+    "query_stats", default=None
+)
+
+
+def track_queries() -> tuple[QueryStats, contextvars.Token[QueryStats | None]]:
+    """
+    Count the statements run from the current context, and the tasks it
+    starts, on any engine. Stop with untrack_queries(token).
+    """
+    stats = QueryStats(parent=_query_stats.get())
+    return stats, _query_stats.set(stats)
+
+
+def untrack_queries(token: contextvars.Token[QueryStats | None]) -> None:
+    _query_stats.reset(token)
+
+
+def _before_cursor_execute(conn: Connection, *_: Any) -> None:
+    conn.info["query_start_time"] = time.perf_counter()
+
+
+def _after_cursor_execute(
+    conn: Connection,
+    _cursor: Any,
+    statement: str,
+    _parameters: Any,
+    _context: ExecutionContext | None,
+    executemany: bool,
+) -> None:
+    elapsed = time.perf_counter() - conn.info.pop("query_start_time")
+    stats = _query_stats.get()
+    if stats is not None:
+        stats.add_query(elapsed)
+    threshold = settings.SLOW_QUERY_THRESHOLD
+    if threshold is not None and elapsed >= threshold:
+        # Without the parameters, they may hold personal data
+        logger.warning(
+            "Slow query (%.1f ms%s): %s",
+            elapsed * 1000,
+            ", executemany" if executemany else "",
+            statement,
+        )
 
 
 def get_async_engine(
     engine_url: str = str(settings.SQLALCHEMY_DATABASE_URI),
 ) -> AsyncEngine:
-    return create_async_engine(engine_url)
+    engine = create_async_engine(
+        engine_url,
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.POSTGRES_POOL_SIZE,
+        max_overflow=settings.POSTGRES_POOL_MAX_OVERFLOW,
+        pool_timeout=settings.POSTGRES_POOL_TIMEOUT,
+        pool_recycle=settings.POSTGRES_POOL_RECYCLE,
+        pool_pre_ping=settings.POSTGRES_POOL_PRE_PING,
+    )
+    event.listen(engine.sync_engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine.sync_engine, "after_cursor_execute", _after_cursor_execute)
+    return engine
+
+
+# Process wide engine, one per worker. Created on app startup.
+_engine: AsyncEngine | None = None
+_async_session: Any = None
+
+
+def init_engine(
+    engine_url: str = str(settings.SQLALCHEMY_DATABASE_URI),
+) -> AsyncEngine:
+    global _engine, _async_session
+    if _engine is None:
+        _engine = get_async_engine(engine_url)
+        _async_session = sessionmaker(
+            bind=_engine,
+            class_=AsyncSession,
+            expire_on_commit=False,  # type: ignore[call-overload]
+        )
+    return _engine
+
+
+def get_engine() -> AsyncEngine:
+    """Get the process wide engine, creating it if startup did not."""
+    return init_engine()
+
+
+def get_session() -> AsyncSession:
+    init_engine()
+    return _async_session()  # type: ignore[no-any-return]
+
+
+async def dispose_engine() -> None:
+    global _engine, _async_session
+    if _engine is not None:
+        await _engine.dispose()
+    _engine = None
+    _async_session = None
+
+
+def get_pool_status() -> dict[str, Any]:
+    pool = get_engine().pool
+    status: dict[str, Any] = {
+        "size": 0,
+        "checked_in": 0,
+        "checked_out": 0,
+        "overflow": 0,
+        "checkouts": 0,
+        "timeouts": 0,
+        "wait_time_total": 0.0,
+        "wait_time_max": 0.0,
+        "wait_time_avg": 0.0,
+    }
+    if isinstance(pool, InstrumentedQueuePool):
+        status.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            overflow=pool.overflow(),
+            checkouts=pool.stats.checkouts,
+            timeouts=pool.stats.timeouts,
+            wait_time_total=pool.stats.wait_time_total,
+            wait_time_max=pool.stats.wait_time_max,
+            wait_time_avg=pool.stats.wait_time_avg,
+        )
+    return status
 
 
 async def init_db(engine_url: str = str(settings.SQLALCHEMY_DATABASE_URI)) -> None:
-    async with get_async_engine(engine_url).begin() as conn:
+    """
+    Create the tables of the models, for the test and benchmark DBs only:
+    the app DB schema is owned by the Alembic migrations.
+    """
+    engine = get_async_engine(engine_url)
+    async with engine.begin() as conn:
         await conn.run_sync(SQLModel.metadata.create_all)
+    await engine.dispose()
 
 
 async def restart_db(engine_url: str = str(settings.SQLALCHEMY_DATABASE_URI)) -> None:
-    async with get_async_engine(engine_url).begin() as conn:
+    engine = get_async_engine(engine_url)
+    async with engine.begin() as conn:
         await conn.exec_driver_sql("DROP SCHEMA public CASCADE;")
         await conn.exec_driver_sql("CREATE SCHEMA public;")
+    await engine.dispose()
@@ -0,0 +1,75 @@
+import importlib.util
+import logging
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Process wide clients, one per downstream base URL. Closed on app shutdown.
+_clients: dict[str, httpx.AsyncClient] = {}
+# Transports used instead of the network, by base URL (e.g. fake services)
+_transports: dict[str, httpx.AsyncBaseTransport] = {}
+
+
+def _is_http2_available() -> bool:
+    return importlib.util.find_spec("h2") is not None
+
+
+def get_http_limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=settings.HTTP_CLIENT_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.HTTP_CLIENT_MAX_KEEPALIVE_CONNECTIONS,
+        keepalive_expiry=settings.HTTP_CLIENT_KEEPALIVE_EXPIRY,
+    )
+
+
+def create_http_client(base_url: str) -> httpx.AsyncClient:
+    transport = _transports.get(base_url)
+    if transport is not None:
+        return httpx.AsyncClient(base_url=base_url, transport=transport)
+    http2 = settings.HTTP_CLIENT_HTTP2
+    if http2 and not _is_http2_available():
+        logger.warning("HTTP/2 requested but 'h2' is not installed, using HTTP/1.1")
+        http2 = False
+    return httpx.AsyncClient(
+        base_url=base_url,
+        limits=get_http_limits(),
+        http2=http2,
+    )
+
+
+def get_http_client(base_url: str) -> httpx.AsyncClient:
+    """Get the shared keep-alive client for a downstream base URL."""
+    client = _clients.get(base_url)
+    if client is None or client.is_closed:
+        client = create_http_client(base_url)
+        _clients[base_url] = client
+    return client
+
+
+async def close_http_clients() -> None:
+    clients = list(_clients.values())
+    _clients.clear()
+    for client in clients:
+        await client.aclose()
+
+
+async def mount_http_transport(
+    base_url: str, transport: httpx.AsyncBaseTransport
+) -> None:
+    """Route the requests to a base URL through `transport`, e.g. an ASGI app."""
+    _transports[base_url] = transport
+    client = _clients.pop(base_url, None)
+    if client is not None:
+        await client.aclose()
+
+
+async def unmount_http_transports() -> None:
+    base_urls = list(_transports)
+    _transports.clear()
+    for base_url in base_urls:
+        client = _clients.pop(base_url, None)
+        if client is not None:
+            await client.aclose()
@@ -0,0 +1,125 @@
+import bisect
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+# Upper bounds, in seconds, of the downstream latency histogram buckets
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+class Histogram:
+    """Counts of observations by bucket, plus their sum, as Prometheus does."""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS) -> None:
+        self.buckets = buckets
+        # Not cumulative, the last one for the values over every bucket
+        self.bucket_counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.bucket_counts[bisect.bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative_counts(self) -> Iterator[tuple[str, int]]:
+        """(le, count) pairs, ending with +Inf."""
+        total = 0
+        for bound, count in zip(self.buckets, self.bucket_counts, strict=False):
+            total += count
+            yield f"{bound}", total
+        yield "+Inf", self.count
+
+
+class HttpClientMetrics:
+    """Latency, responses and in-flight requests, by downstream service."""
+
+    def __init__(self) -> None:
+        self.reset()
+
+    def reset(self) -> None:
+        # By (service, method)
+        self.latency: dict[tuple[str, str], Histogram] = {}
+        # By (service, method, status), status is "error" without a response
+        self.responses: dict[tuple[str, str, str], int] = {}
+        # By service
+        self.in_flight: dict[str, int] = {}
+
+    @contextmanager
+    def track(self, service: str, method: str) -> Iterator["RequestTracker"]:
+        tracker = RequestTracker()
+        self.in_flight[service] = self.in_flight.get(service, 0) + 1
+        try:
+            yield tracker
+        finally:
+            self.in_flight[service] -= 1
+            key = (service, method)
+            histogram = self.latency.get(key)
+            if histogram is None:
+                histogram = self.latency[key] = Histogram()
+            histogram.observe(tracker.elapsed())
+            status_key = (service, method, tracker.status)
+            self.responses[status_key] = self.responses.get(status_key, 0) + 1
+
+
+class RequestTracker:
+    """Set status to the response status code, it is "error" otherwise."""
+
+    def __init__(self) -> None:
+        self.start = time.perf_counter()
+        self.status = "error"
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.start
+
+
+http_client_metrics = HttpClientMetrics()
+
+
+def _labels(**labels: str) -> str:
+    escaped = (
+        (name, value.replace("\\", "\\\\").replace('"', '\\"'))
+        for name, value in labels.items()
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
+
+
+def render_http_client_metrics(metrics: HttpClientMetrics) -> str:
+    """The metrics in the Prometheus text exposition format."""
+    lines = [
+        "# HELP downstream_request_duration_seconds "
+        "Latency of the requests to the downstream services.",
+        "# TYPE downstream_request_duration_seconds histogram",
+    ]
+    for (service, method), histogram in sorted(metrics.latency.items()):
+        for le, count in histogram.cumulative_counts():
+            labels = _labels(service=service, method=method, le=le)
+            lines.append(f"downstream_request_duration_seconds_bucket{labels} {count}")
+        labels = _labels(service=service, method=method)
+        lines.append(f"downstream_request_duration_seconds_sum{labels} {histogram.sum}")
+        lines.append(
+            f"downstream_request_duration_seconds_count{labels} {histogram.count}"
+        )
+
+    lines += [
+        "# HELP downstream_requests_total "
+        "Requests to the downstream services, by response status.",
+        "# TYPE downstream_requests_total counter",
+    ]
+    for (service, method, status), count in sorted(metrics.responses.items()):
+        labels = _labels(service=service, method=method, status=status)
+        lines.append(f"downstream_requests_total{labels} {count}")
+
+    lines += [
+        "# HELP downstream_requests_in_flight "
+        "Requests to the downstream services waiting for a response.",
+        "# TYPE downstream_requests_in_flight gauge",
+    ]
+    for service, in_flight in sorted(metrics.in_flight.items()):
+        lines.append(
+            f"downstream_requests_in_flight{_labels(service=service)} {in_flight}"
+        )
+
+    return "\n".join(lines) + "\n"
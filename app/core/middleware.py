@@ -0,0 +1,68 @@
+import logging
+import time
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.db import QueryStats, track_queries, untrack_queries
+
+logger = logging.getLogger(__name__)
+
+
+def server_timing(stats: QueryStats, duration: float) -> str:
+    """Server-Timing header value, durations in milliseconds."""
+    return (
+        f'db;dur={stats.time_total * 1000:.1f};desc="{stats.count} queries", '
+        f"total;dur={duration * 1000:.1f}"
+    )
+
+
+class QueryTimingMiddleware:
+    """
+    Count the SQL statements of each request and their time.
+    They go in the Server-Timing header, with the totals when the response
+    starts, and in one log line per request, with the totals when it ends
+    (streamed bodies included).
+    """
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status_code = 500
+        stats, token = track_queries()
+
+        async def send_with_timing(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Server-Timing", server_timing(stats, time.perf_counter() - start)
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            untrack_queries(token)
+            duration = time.perf_counter() - start
+            fields = {
+                "method": scope["method"],
+                "path": scope["path"],
+                "status": status_code,
+                "duration_ms": round(duration * 1000, 1),
+                "db_queries": stats.count,
+                "db_time_ms": round(stats.time_total * 1000, 1),
+            }
+            logger.info(
+                "request method=%s path=%s status=%s duration_ms=%s "
+                "db_queries=%s db_time_ms=%s",
+                *fields.values(),
+                extra=fields,
+            )
@@ -5,7 +5,10 @@ from fastapi.routing import APIRoute
 
 from app.api.main import api_router
 from app.core.config import settings
-from app.core.db import init_db
+from app.core.db import dispose_engine, init_engine
+from app.core.http import close_http_clients
+from app.core.middleware import QueryTimingMiddleware
+from app.services.outbox_service import OutboxWorker
 from app.utilities.dependencies import get_token_header
 
 
@@ -15,9 +18,14 @@ def custom_generate_unique_id(route: APIRoute) -> str:
 
 @asynccontextmanager
 async def lifespan(_: FastAPI):  # type:ignore[no-untyped-def]
-    # await restart_db()
-    await init_db()
+    # The schema is created by the migrations (scripts/prestart.sh)
+    init_engine()
+    outbox_worker = OutboxWorker()
+    outbox_worker.start()
     yield
+    await outbox_worker.stop()
+    await close_http_clients()
+    await dispose_engine()
 
 
 app = FastAPI(
@@ -28,5 +36,7 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
+app.add_middleware(QueryTimingMiddleware)
+
 # Register routes
 app.include_router(api_router, prefix=settings.API_V1_STR)
@@ -1,5 +1,7 @@
 from app.models.item import Item
 from app.models.match import Match
 from app.models.match_player import MatchPlayer
+from app.models.outbox import OutboxMessage
+from app.models.player_activity import PlayerActivity
 
-__all__ = ["Item", "MatchPlayer", "Match"]
+__all__ = ["Item", "MatchPlayer", "Match", "OutboxMessage", "PlayerActivity"]
@@ -22,6 +22,7 @@ class ItemUpdate(ItemBase):
 # Database model, database table inferred from class name
 class Item(ItemBase, table=True):
     __tablename__ = "items"
+    __mapper_args__ = {"eager_defaults": True}
     id: uuid.UUID = Field(default_factory=uuid.uuid4, primary_key=True)
     title: str = Field(max_length=255)
     owner_id: uuid.UUID = Field(nullable=False, index=True)
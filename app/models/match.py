@@ -1,12 +1,16 @@
+import base64
 import datetime
 import uuid
 from enum import Enum
+from typing import Any, ClassVar
 from uuid import UUID, uuid4
 
-from sqlalchemy import UniqueConstraint
+from pydantic import ValidationError
+from sqlalchemy import Index, UniqueConstraint
 from sqlmodel import Field, SQLModel
 
 from app.models.available_time import AvailableTime
+from app.utilities.exceptions import InvalidCursorException
 
 
 class MatchStatus(str, Enum):
@@ -41,6 +45,9 @@ class MatchUpdate(MatchBase):
 class Match(MatchBase, MatchInmutable, table=True):
     id: int = Field(default=None, primary_key=True)
 
+    # Order of the pages when listing matches
+    KEYSET: ClassVar[list[str]] = ["date", "time", "id"]
+
     __tablename__ = "matches"
     __table_args__ = (
         UniqueConstraint(
@@ -50,7 +57,10 @@ class Match(MatchBase, MatchInmutable, table=True):
             "date",
             name="uq_match_constraints",
         ),
+        Index("ix_matches_business_public_id_date", "business_public_id", "date"),
+        Index("ix_matches_date_time_id", "date", "time", "id"),
     )
+    __mapper_args__ = {"eager_defaults": True}
 
     @classmethod
     def name(cls) -> str:
@@ -60,21 +70,45 @@ class Match(MatchBase, MatchInmutable, table=True):
 class MatchPublic(MatchBase, MatchInmutable):
     @classmethod
     def from_private(cls, match: Match) -> "MatchPublic":
-        data = match.model_dump()
-        return cls(**data)
+        return cls.model_validate(match)
+
+
+class MatchCursor(SQLModel):
+    """Keyset of the last match of a page, the next page starts after it."""
+
+    date: datetime.date | None = None
+    time: int | None = None
+    id: int
+
+    @classmethod
+    def from_match(cls, match: Match) -> "MatchCursor":
+        return cls(date=match.date, time=match.time, id=match.id)
+
+    @classmethod
+    def decode(cls, cursor: str) -> "MatchCursor":
+        try:
+            return cls.model_validate_json(base64.urlsafe_b64decode(cursor))
+        except (ValueError, ValidationError):
+            raise InvalidCursorException()
+
+    def encode(self) -> str:
+        return base64.urlsafe_b64encode(self.model_dump_json().encode()).decode()
+
+    def to_keyset(self) -> list[Any]:
+        return [getattr(self, attr) for attr in Match.KEYSET]
 
 
 class MatchListPublic(SQLModel):
     data: list[MatchPublic]
     count: int
+    next_cursor: str | None = None
 
     @classmethod
-    def from_private(cls, match_list: list[Match]) -> "MatchListPublic":
-        data = []
-        for match in match_list:
-            data.append(MatchPublic.from_private(match))
-        count = len(match_list)
-        return cls(data=data, count=count)
+    def from_private(
+        cls, match_list: list[Match], next_cursor: str | None = None
+    ) -> "MatchListPublic":
+        data = [MatchPublic.from_private(match) for match in match_list]
+        return cls(data=data, count=len(data), next_cursor=next_cursor)
 
 
 class MatchFilters(MatchBase):
@@ -1,7 +1,7 @@
 from enum import Enum
 from uuid import UUID
 
-from sqlalchemy import UniqueConstraint
+from sqlalchemy import Index, UniqueConstraint
 from sqlmodel import Field, SQLModel
 
 
@@ -52,6 +52,11 @@ class MatchPlayerUpdate(MatchPlayerBase):
         return self.reserve == ReserveStatus.INSIDE
 
 
+class MatchPlayersReserveUpdate(SQLModel):
+    user_public_ids: list[UUID]
+    reserve: ReserveStatus
+
+
 class MatchPlayer(MatchPlayerBase, MatchPlayerInmmutableExtended, table=True):
     id: int = Field(default=None, primary_key=True)
 
@@ -62,7 +67,15 @@ class MatchPlayer(MatchPlayerBase, MatchPlayerInmmutableExtended, table=True):
             "user_public_id",
             name="uq_match_player",
         ),
+        Index("ix_matches_players_user_public_id", "user_public_id"),
+        Index(
+            "ix_matches_players_match_public_id_reserve_distance",
+            "match_public_id",
+            "reserve",
+            "distance",
+        ),
     )
+    __mapper_args__ = {"eager_defaults": True}
 
     @classmethod
     def name(cls) -> str:
@@ -72,6 +85,35 @@ class MatchPlayer(MatchPlayerBase, MatchPlayerInmmutableExtended, table=True):
         return self.reserve == ReserveStatus.ASSIGNED
 
 
+class MatchPlayersReserve:
+    """Reserve status snapshot of all the players of one match."""
+
+    def __init__(self, match_players: list[MatchPlayer]):
+        self.match_players = sorted(match_players, key=lambda x: x.distance)
+
+    def get_player(self, user_public_id: UUID) -> MatchPlayer | None:
+        for match_player in self.match_players:
+            if match_player.user_public_id == user_public_id:
+                return match_player
+        return None
+
+    def set_player(self, match_player: MatchPlayer) -> None:
+        self.match_players = [
+            x
+            for x in self.match_players
+            if x.user_public_id != match_player.user_public_id
+        ]
+        self.match_players.append(match_player)
+        self.match_players.sort(key=lambda x: x.distance)
+
+    def get_players(self, reserve: ReserveStatus) -> list[MatchPlayer]:
+        """Players with the reserve status, ordered by distance."""
+        return [x for x in self.match_players if x.reserve == reserve]
+
+    def count(self, reserve: ReserveStatus) -> int:
+        return len(self.get_players(reserve))
+
+
 class MatchPlayerPublic(MatchPlayerBase, MatchPlayerInmmutableExtended):
     @classmethod
     def from_private(cls, match_player: MatchPlayer) -> "MatchPlayerPublic":
@@ -0,0 +1,22 @@
+from sqlmodel import SQLModel
+
+
+class DBPoolStatus(SQLModel):
+    size: int
+    checked_in: int
+    checked_out: int
+    overflow: int
+    checkouts: int
+    timeouts: int
+    wait_time_total: float
+    wait_time_max: float
+    wait_time_avg: float
+
+
+class CacheStatus(SQLModel):
+    name: str
+    size: int
+    maxsize: int
+    ttl: float
+    hits: int
+    misses: int
@@ -0,0 +1,54 @@
+import datetime
+from enum import Enum
+from typing import Any
+
+from sqlalchemy import JSON, Column, DateTime, Index
+from sqlmodel import Field, SQLModel
+
+
+def utc_now() -> datetime.datetime:
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+class OutboxStatus(str, Enum):
+    PENDING = "pending"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class OutboxKind(str, Enum):
+    NEW_MATCHES = "new_matches"
+
+
+class OutboxMessageBase(SQLModel):
+    kind: str = Field()
+    payload: dict[str, Any] = Field(default_factory=dict, sa_type=JSON)
+
+
+class OutboxMessageCreate(OutboxMessageBase):
+    pass
+
+
+class OutboxMessage(OutboxMessageBase, table=True):
+    id: int = Field(default=None, primary_key=True)
+    status: str = Field(default=OutboxStatus.PENDING)
+    attempts: int = Field(default=0)
+    next_attempt_at: datetime.datetime = Field(
+        default_factory=utc_now,
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+    )
+    last_error: str | None = Field(default=None)
+    created_at: datetime.datetime = Field(
+        default_factory=utc_now,
+        sa_column=Column(DateTime(timezone=True), nullable=False),
+    )
+
+    __tablename__ = "outbox_messages"
+    __table_args__ = (
+        Index("ix_outbox_messages_status_next_attempt_at", "status", "next_attempt_at"),
+    )
+    __mapper_args__ = {"eager_defaults": True}
+
+    @classmethod
+    def name(cls) -> str:
+        return "OutboxMessage"
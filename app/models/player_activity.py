@@ -0,0 +1,29 @@
+import datetime
+from uuid import UUID
+
+from sqlalchemy import Column, DateTime
+from sqlmodel import Field, SQLModel
+
+
+class PlayerActivity(SQLModel, table=True):
+    """
+    Denormalized from the matches players, to prioritize the players
+    without a full scan of their matches. Kept up to date by the
+    MatchPlayerUpdateService and the MatchGeneratorService.
+    """
+
+    user_public_id: UUID = Field(primary_key=True)
+    # Date of the last reserved match the player was inside
+    last_match_date: datetime.date | None = Field(default=None)
+    # Matches the player went inside
+    n_matches: int = Field(default=0)
+    last_assigned_at: datetime.datetime | None = Field(
+        default=None, sa_column=Column(DateTime(timezone=True), nullable=True)
+    )
+
+    __tablename__ = "players_activity"
+    __mapper_args__ = {"eager_defaults": True}
+
+    @classmethod
+    def name(cls) -> str:
+        return "PlayerActivity"
@@ -1,9 +1,27 @@
-import warnings
+from collections.abc import AsyncIterator
 from typing import Any, TypeVar
 
-from sqlalchemy import asc, delete, desc, or_
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import (
+    ColumnElement,
+    ForeignKeyConstraint,
+    Select,
+    and_,
+    any_,
+    asc,
+    bindparam,
+    delete,
+    desc,
+    false,
+    func,
+    insert,
+    or_,
+    update,
+)
+from sqlalchemy.dialects.postgresql import ARRAY
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.exc import IntegrityError, MultipleResultsFound
 from sqlalchemy.future import select
+from sqlalchemy.sql.schema import ColumnCollectionConstraint
 from sqlmodel import SQLModel
 from sqlmodel.ext.asyncio.session import AsyncSession
 
@@ -38,32 +56,79 @@ class BaseRepository:
         await self._commit_refresh_or_flush(should_commit, [record])
         return record
 
+    def _to_insert_values(self, model: type[M], record_create: C) -> dict[str, Any]:
+        record = model.model_validate(record_create)
+        values = record.model_dump()
+        for column in model.__table__.primary_key.columns:  # type: ignore[attr-defined]
+            if values.get(column.name) is None:
+                values.pop(column.name, None)
+        return values
+
     async def create_records(
         self, model: type[M], records_create: list[C], should_commit: bool = True
     ) -> list[M]:
-        records = [model.model_validate(record) for record in records_create]
-        self.session.add_all(records)
-        await self._commit_refresh_or_flush(should_commit, records)
+        """
+        Insert all the records with one multi-row INSERT ... RETURNING,
+        so the created records are complete without a refresh per record.
+        """
+        if not records_create:
+            return []
+        values = [self._to_insert_values(model, record) for record in records_create]
+        query = insert(model).returning(model, sort_by_parameter_order=True)
+        try:
+            result = await self.session.exec(query, params=values)  # type: ignore
+        except IntegrityError as e:
+            await self.session.rollback()
+            self._handle_commit_exceptions(e)
+            raise
+        records = list(result.scalars().all())
+        await self._commit_refresh_or_flush(should_commit, [])
         return records
 
-    async def get_records(
-        self,
-        model: type[M],
-        order_by: list[tuple[str, bool]] | None = None,
-        limit: int | None = None,
-        **filters: Any,
+    async def create_missing_records(
+        self, model: type[M], records_create: list[C], should_commit: bool = True
     ) -> list[M]:
         """
-        order_by: List of tuples(M.attribute, is_ascending)
-        to order the result.
-        limit: Max number of records to get.
+        Like create_records, but the records that already exist, by any
+        unique constraint, are skipped instead of failing the transaction
+        (INSERT ... ON CONFLICT DO NOTHING RETURNING).
+        Returns only the created records, in no particular order.
         """
-        query = select(model)
+        if not records_create:
+            return []
+        values = [self._to_insert_values(model, record) for record in records_create]
+        query = pg_insert(model).on_conflict_do_nothing().returning(model)
+        result = await self.session.exec(query, params=values)  # type: ignore
+        records = list(result.scalars().all())
+        await self._commit_refresh_or_flush(should_commit, [])
+        return records
 
-        # Filters
+    def _filter_conditions(
+        self, model: type[M], **filters: Any
+    ) -> list[ColumnElement[bool]]:
+        """
+        M.attribute == value, or M.attribute = ANY(values) for collections.
+        The values go in one array parameter, so the SQL text does not
+        depend on how many there are.
+        """
+        conditions = []
         for key, value in filters.items():
             attr = getattr(model, key)
-            query = query.where(attr == value)
+            if isinstance(value, list | tuple | set):
+                values = bindparam(None, list(value), type_=ARRAY(attr.type))
+                conditions.append(attr == any_(values))
+            else:
+                conditions.append(attr == value)
+        return conditions
+
+    def _select_records(
+        self,
+        model: type[M],
+        order_by: list[tuple[str, bool]] | None = None,
+        limit: int | None = None,
+        **filters: Any,
+    ) -> Select[Any]:
+        query = select(model).where(*self._filter_conditions(model, **filters))
 
         # Order
         if order_by is None:
@@ -78,15 +143,145 @@ class BaseRepository:
         if limit is not None:
             query = query.limit(limit)
 
+        return query
+
+    async def get_records(
+        self,
+        model: type[M],
+        order_by: list[tuple[str, bool]] | None = None,
+        limit: int | None = None,
+        **filters: Any,
+    ) -> list[M]:
+        """
+        order_by: List of tuples(M.attribute, is_ascending)
+        to order the result.
+        limit: Max number of records to get.
+        filters: M.attribute=value, or M.attribute=[values] to match any of them.
+        """
+        query = self._select_records(model, order_by, limit, **filters)
+        result = await self.session.exec(query)  # type: ignore
+        return list(result.scalars().all())
+
+    def _keyset_after(
+        self, model: type[M], keyset: list[str], after: list[Any]
+    ) -> ColumnElement[bool]:
+        """
+        Condition for the records after `after` in ascending keyset order.
+        NULLs sort last, as Postgres does for ascending order.
+        """
+        conditions = []
+        equals: list[ColumnElement[bool]] = []
+        for attr, value in zip(keyset, after, strict=True):
+            column = getattr(model, attr)
+            if value is None:
+                greater: ColumnElement[bool] = false()
+                equal = column.is_(None)
+            else:
+                greater = or_(column > value, column.is_(None))
+                equal = column == value
+            conditions.append(and_(*equals, greater))
+            equals.append(equal)
+        return or_(*conditions)
+
+    async def get_records_page(
+        self,
+        model: type[M],
+        keyset: list[str],
+        limit: int,
+        after: list[Any] | None = None,
+        **filters: Any,
+    ) -> list[M]:
+        """
+        Keyset pagination: up to `limit` records ordered by the `keyset`
+        attributes, starting after the keyset values `after` of the last
+        record of the previous page. The last keyset attribute must be unique.
+        """
+        query = self._select_records(
+            model, [(attr, True) for attr in keyset], limit, **filters
+        )
+        if after is not None:
+            query = query.where(self._keyset_after(model, keyset, after))
         result = await self.session.exec(query)  # type: ignore
         return list(result.scalars().all())
 
+    async def stream_records(
+        self,
+        model: type[M],
+        keyset: list[str],
+        after: list[Any] | None = None,
+        yield_per: int = 1000,
+        **filters: Any,
+    ) -> AsyncIterator[M]:
+        """
+        Like get_records_page without limit, but the records are fetched from
+        a server side cursor `yield_per` rows at a time.
+        """
+        query = self._select_records(
+            model, [(attr, True) for attr in keyset], **filters
+        )
+        if after is not None:
+            query = query.where(self._keyset_after(model, keyset, after))
+        result = await self.session.stream_scalars(
+            query.execution_options(yield_per=yield_per)
+        )
+        async for record in result:
+            yield record
+
     async def get_record(self, model: type[M], **filters: Any) -> M:
         result = await self.get_records(model, **filters)
         if not result:
             raise NotFoundException(model.name())  # type: ignore
         return result[0]
 
+    async def _update_returning(
+        self, model: type[M], update_dict: dict[str, Any], **filters: Any
+    ) -> list[M]:
+        query = (
+            update(model)
+            .where(*self._filter_conditions(model, **filters))
+            .values(**update_dict)
+            .returning(model)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        try:
+            result = await self.session.exec(query)  # type: ignore
+        except IntegrityError as e:
+            await self.session.rollback()
+            self._handle_commit_exceptions(e)
+            raise
+        return list(result.scalars().all())
+
+    def _filters_unique_key(self, model: type[M], **filters: Any) -> bool:
+        """
+        Whether the filters fix all the columns of a unique key (primary key
+        or unique constraint) to one value, so they match one record at most.
+        """
+        fixed = {
+            key
+            for key, value in filters.items()
+            if value is not None and not isinstance(value, list | tuple | set)
+        }
+        return any(
+            {column.name for column in constraint.columns} <= fixed
+            for constraint in model.__table__.constraints  # type: ignore[attr-defined]
+            if isinstance(constraint, ColumnCollectionConstraint)
+            and not isinstance(constraint, ForeignKeyConstraint)
+        )
+
+    async def _count_records(self, model: type[M], limit: int, **filters: Any) -> int:
+        """Number of records that match the filters, counting up to `limit`."""
+        matching = (
+            select(1)
+            .select_from(model)
+            .where(*self._filter_conditions(model, **filters))
+            .limit(limit)
+            .subquery()
+        )
+        result = await self.session.exec(  # type: ignore
+            select(func.count()).select_from(matching)
+        )
+        return int(result.scalar_one())
+
     async def update_record(
         self,
         model: type[M],
@@ -94,25 +289,53 @@ class BaseRepository:
         should_commit: bool = True,
         **filters: Any,
     ) -> M:
-        record = await self.get_record(model, **filters)
+        """
+        One UPDATE ... RETURNING of the record that matches the filters,
+        raises NotFoundException if there is none. Unless the filters are a
+        unique key, the matching records are counted first: if there is more
+        than one, MultipleResultsFound is raised before updating anything,
+        leaving the rest of the transaction as it was. Use update_records
+        for those.
+        """
         update_dict = record_update.model_dump(exclude_none=True)
-        record.sqlmodel_update(update_dict)
-        self.session.add(record)
-        await self._commit_refresh_or_flush(should_commit, [record])
-        return record
+        if not update_dict:
+            return await self.get_record(model, **filters)
+        if not self._filters_unique_key(model, **filters):
+            if await self._count_records(model, limit=2, **filters) > 1:
+                raise MultipleResultsFound(
+                    f"{model.name()} filters match more than one record"  # type: ignore
+                )
+        records = await self._update_returning(model, update_dict, **filters)
+        if not records:
+            raise NotFoundException(model.name())  # type: ignore
+        await self._commit_refresh_or_flush(should_commit, [])
+        return records[0]
+
+    async def update_records(
+        self,
+        model: type[M],
+        record_update: U,
+        should_commit: bool = True,
+        **filters: Any,
+    ) -> list[M]:
+        """
+        One UPDATE ... RETURNING of all the records that match the filters.
+        filters: M.attribute=value, or M.attribute=[values] to match any of them.
+        """
+        update_dict = record_update.model_dump(exclude_none=True)
+        if not update_dict:
+            return await self.get_records(model, **filters)
+        records = await self._update_returning(model, update_dict, **filters)
+        await self._commit_refresh_or_flush(should_commit, [])
+        return records
 
     async def delete_records(
         self, model: type[M], should_commit: bool = True, **filters: Any
     ) -> None:
-        query = delete(model)
-
-        for key, values in filters.items():
-            attr = getattr(model, key)
-            or_conditions = [attr == value for value in values]
-            query = query.where(or_(False, *or_conditions))
-
-        with warnings.catch_warnings():
-            warnings.simplefilter("ignore", DeprecationWarning)
-            await self.session.execute(query)
+        """
+        filters: M.attribute=value, or M.attribute=[values] to match any of them.
+        """
+        query = delete(model).where(*self._filter_conditions(model, **filters))
+        await self.session.exec(query)  # type: ignore
 
         await self._commit_refresh_or_flush(should_commit, [])
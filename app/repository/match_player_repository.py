@@ -54,6 +54,16 @@ class MatchPlayerRepository(BaseRepository):
             MatchPlayer, match_player_in, should_commit, **filters
         )
 
+    async def update_match_players(
+        self,
+        match_player_in: MatchPlayerUpdate,
+        should_commit: bool = True,
+        **filters: Any,
+    ) -> list[MatchPlayer]:
+        return await self.update_records(
+            MatchPlayer, match_player_in, should_commit, **filters
+        )
+
     async def delete_match_players(
         self, should_commit: bool = True, **filters: Any
     ) -> None:
@@ -1,3 +1,4 @@
+from collections.abc import AsyncIterator
 from typing import Any
 
 from sqlalchemy.exc import IntegrityError
@@ -28,9 +29,24 @@ class MatchRepository(BaseRepository):
     ) -> list[Match]:
         return await self.create_records(Match, matches_in, should_commit)
 
+    async def create_missing_matches(
+        self, matches_in: list[MatchCreate], should_commit: bool = True
+    ) -> list[Match]:
+        return await self.create_missing_records(Match, matches_in, should_commit)
+
     async def get_matches(self, **filters: Any) -> list[Match]:
         return await self.get_records(Match, **filters)
 
+    async def get_matches_page(
+        self, limit: int, after: list[Any] | None = None, **filters: Any
+    ) -> list[Match]:
+        return await self.get_records_page(Match, Match.KEYSET, limit, after, **filters)
+
+    def stream_matches(
+        self, after: list[Any] | None = None, yield_per: int = 1000, **filters: Any
+    ) -> AsyncIterator[Match]:
+        return self.stream_records(Match, Match.KEYSET, after, yield_per, **filters)
+
     async def get_match(self, **filters: Any) -> Match:
         return await self.get_record(Match, **filters)
 
@@ -0,0 +1,68 @@
+import datetime
+from typing import Any
+
+from sqlalchemy import update
+from sqlmodel import col, select
+
+from app.models.outbox import (
+    OutboxMessage,
+    OutboxMessageCreate,
+    OutboxStatus,
+    utc_now,
+)
+from app.repository.base_repository import BaseRepository
+
+
+class OutboxRepository(BaseRepository):
+    async def create_message(
+        self, message_in: OutboxMessageCreate, should_commit: bool = True
+    ) -> OutboxMessage:
+        return await self.create_record(OutboxMessage, message_in, should_commit)
+
+    async def claim_messages(
+        self, limit: int, lease: datetime.timedelta
+    ) -> list[OutboxMessage]:
+        """
+        Claim the due pending messages, skipping the ones locked by other
+        workers. Claimed messages are leased: they are not due again until the
+        lease ends, so a crashed worker does not lose them.
+        """
+        now = utc_now()
+        due_ids = (
+            select(OutboxMessage.id)
+            .where(
+                col(OutboxMessage.status) == OutboxStatus.PENDING,
+                col(OutboxMessage.next_attempt_at) <= now,
+            )
+            .order_by(col(OutboxMessage.id))
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        query = (
+            update(OutboxMessage)
+            .where(col(OutboxMessage.id).in_(due_ids))
+            .values(
+                attempts=OutboxMessage.attempts + 1,
+                next_attempt_at=now + lease,
+            )
+            .returning(OutboxMessage)
+            .execution_options(synchronize_session=False, populate_existing=True)
+        )
+        result = await self.session.exec(query)  # type: ignore
+        messages = list(result.scalars().all())
+        await self._commit_refresh_or_flush(True, [])
+        return sorted(messages, key=lambda x: x.id)
+
+    async def update_messages(
+        self, ids: list[int], should_commit: bool = True, **values: Any
+    ) -> None:
+        if not ids:
+            return
+        query = (
+            update(OutboxMessage)
+            .where(col(OutboxMessage.id).in_(ids))
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        await self.session.exec(query)  # type: ignore
+        await self._commit_refresh_or_flush(should_commit, [])
@@ -0,0 +1,76 @@
+import datetime
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import func
+from sqlalchemy.dialects.postgresql import insert
+
+from app.models.player_activity import PlayerActivity
+from app.repository.base_repository import BaseRepository
+
+
+class PlayerActivityRepository(BaseRepository):
+    async def get_players_activity(
+        self, user_public_ids: list[UUID]
+    ) -> list[PlayerActivity]:
+        return await self.get_records(PlayerActivity, user_public_id=user_public_ids)
+
+    async def _upsert(
+        self,
+        user_public_ids: list[UUID],
+        values: dict[str, Any],
+        updates: dict[str, Any],
+        should_commit: bool,
+    ) -> None:
+        """
+        One INSERT ... ON CONFLICT DO UPDATE for all the players: the missing
+        ones are inserted with `values`, the others updated with `updates`.
+        Sorted, so concurrent upserts lock the rows in the same order.
+        """
+        if not user_public_ids:
+            return
+        rows = [
+            {"user_public_id": user_public_id, "n_matches": 0, **values}
+            for user_public_id in sorted(set(user_public_ids))
+        ]
+        query = (
+            insert(PlayerActivity)
+            .values(rows)
+            .on_conflict_do_update(index_elements=["user_public_id"], set_=updates)
+        )
+        await self.session.exec(query)  # type: ignore
+        await self._commit_refresh_or_flush(should_commit, [])
+
+    async def add_match(
+        self, user_public_ids: list[UUID], should_commit: bool = True
+    ) -> None:
+        await self._upsert(
+            user_public_ids,
+            {"n_matches": 1},
+            {"n_matches": PlayerActivity.n_matches + 1},
+            should_commit,
+        )
+
+    async def set_last_match_date(
+        self,
+        user_public_ids: list[UUID],
+        date: datetime.date,
+        should_commit: bool = True,
+    ) -> None:
+        # GREATEST ignores NULLs, and keeps a later match already set
+        await self._upsert(
+            user_public_ids,
+            {"last_match_date": date},
+            {"last_match_date": func.greatest(PlayerActivity.last_match_date, date)},
+            should_commit,
+        )
+
+    async def set_last_assigned_at(
+        self, user_public_ids: list[UUID], should_commit: bool = True
+    ) -> None:
+        await self._upsert(
+            user_public_ids,
+            {"last_assigned_at": func.now()},
+            {"last_assigned_at": func.now()},
+            should_commit,
+        )
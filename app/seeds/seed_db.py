@@ -1,5 +1,7 @@
 import asyncio
 
+from alembic import command
+from alembic.config import Config
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 import app.core.db as db
@@ -11,8 +13,9 @@ async def seed_db() -> None:
     await db.restart_db()
     print("Ok")
 
-    print("Initing DB ...", end=" ")
-    await db.init_db()
+    print("Migrating DB ...", end=" ")
+    # Alembic runs its own event loop
+    await asyncio.to_thread(command.upgrade, Config("alembic.ini"), "head")
     print("Ok")
 
     print("Loading Seed ...", end=" ")
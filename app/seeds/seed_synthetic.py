@@ -0,0 +1,46 @@
+"""
+Synthetic matches and match players, inserted set-based with generate_series
+so large volumes (100k+ rows) load in seconds.
+
+Used by the query plans and the benchmarks.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+SEED_START_DATE = "2025-01-01"
+
+
+async def seed_matches(
+    conn: AsyncConnection, n_matches: int, n_players: int, n_users: int = 5000
+) -> None:
+    """
+    n_matches: matches spread over 50 businesses, 10 courts and 16 times a day.
+    n_players: match players of each match, the first one assigned and the
+    rest similar.
+    n_users: distinct user_public_ids the match players are taken from.
+    """
+    await conn.execute(
+        text(
+            "INSERT INTO matches "
+            "(public_id, business_public_id, court_public_id, court_name, "
+            "time, date, status) "
+            "SELECT gen_random_uuid(), "
+            "('00000000-0000-0000-0000-' || lpad((i % 50)::text, 12, '0'))::uuid, "
+            "gen_random_uuid(), (i % 10)::text, 6 + i % 16, "
+            f"DATE '{SEED_START_DATE}' + (i / 160), 'Provisional' "
+            "FROM generate_series(0, :n_matches - 1) AS i"
+        ),
+        {"n_matches": n_matches},
+    )
+    await conn.execute(
+        text(
+            "INSERT INTO matches_players "
+            "(match_public_id, user_public_id, distance, reserve) "
+            "SELECT m.public_id, "
+            "('00000000-0000-0000-0000-' || lpad(((m.id * 7 + j) % :n_users)::text, 12, '0'))::uuid, "
+            "j, CASE WHEN j = 0 THEN 'assigned' ELSE 'similar' END "
+            "FROM matches m, generate_series(0, :n_players - 1) AS j"
+        ),
+        {"n_players": n_players, "n_users": n_users},
+    )
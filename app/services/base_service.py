@@ -4,9 +4,32 @@ from typing import Any
 import httpx
 from httpx._types import QueryParamTypes, RequestData
 
+from app.core.http import get_http_client
+from app.core.metrics import http_client_metrics
+
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Headers whose values are never logged
+SENSITIVE_HEADERS = frozenset(
+    {"authorization", "proxy-authorization", "cookie", "x-api-key"}
+)
+
+
+class RedactedHeaders:
+    """Headers for logging, redacted only when the log record is formatted."""
+
+    def __init__(self, headers: dict[str, str]) -> None:
+        self.headers = headers
+
+    def __str__(self) -> str:
+        return str(
+            {
+                name: "***" if name.lower() in SENSITIVE_HEADERS else value
+                for name, value in self.headers.items()
+            }
+        )
+
 
 class BaseService:
     def __init__(self) -> None:
@@ -32,24 +55,47 @@ class BaseService:
         """Set base headers for all requests."""
         self.base_headers = headers
 
+    def _get_client(self) -> httpx.AsyncClient:
+        """Get the shared keep-alive client for the service host."""
+        return get_http_client(self.base_url)
+
     def generate_url(self, endpoint: str) -> str:
         """Generate a full URL from an endpoint."""
         return f"{self.base_url}{endpoint}"
 
-    async def get(
+    async def _request(
         self,
+        method: str,
         endpoint: str,
-        params: QueryParamTypes | None = None,
         headers: dict[str, str] | None = None,
+        **kwargs: Any,
     ) -> Any:
-        """Send a GET request."""
+        """Send a request, recording its latency and status by service."""
         url = self.generate_url(endpoint)
         all_headers = {**self.base_headers, **(headers or {})}
-        logger.info(f"GET request to {url}, params: {params}, headers: {all_headers}")
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.get(url, params=params, headers=all_headers)
+        logger.debug(
+            "%s request to %s, %s, headers: %s",
+            method,
+            url,
+            kwargs,
+            RedactedHeaders(all_headers),
+        )
+        with http_client_metrics.track(type(self).__name__, method) as tracker:
+            response = await self._get_client().request(
+                method, url, headers=all_headers, timeout=self.timeout, **kwargs
+            )
+            tracker.status = str(response.status_code)
         return await self._handle_response(response)
 
+    async def get(
+        self,
+        endpoint: str,
+        params: QueryParamTypes | None = None,
+        headers: dict[str, str] | None = None,
+    ) -> Any:
+        """Send a GET request."""
+        return await self._request("GET", endpoint, headers, params=params)
+
     async def post(
         self,
         endpoint: str,
@@ -58,14 +104,7 @@ class BaseService:
         headers: dict[str, str] | None = None,
     ) -> Any:
         """Send a POST request."""
-        url = self.generate_url(endpoint)
-        all_headers = {**self.base_headers, **(headers or {})}
-        logger.info(
-            f"POST request to {url}, data: {data}, json: {json}, headers: {all_headers}"
-        )
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(url, data=data, json=json, headers=all_headers)
-        return await self._handle_response(response)
+        return await self._request("POST", endpoint, headers, data=data, json=json)
 
     async def put(
         self,
@@ -75,23 +114,11 @@ class BaseService:
         headers: dict[str, str] | None = None,
     ) -> Any:
         """Send a PUT request."""
-        url = self.generate_url(endpoint)
-        all_headers = {**self.base_headers, **(headers or {})}
-        logger.info(
-            f"PUT request to {url}, data: {data}, json: {json}, headers: {all_headers}"
-        )
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.put(url, data=data, json=json, headers=all_headers)
-        return await self._handle_response(response)
+        return await self._request("PUT", endpoint, headers, data=data, json=json)
 
     async def delete(self, endpoint: str, headers: dict[str, str] | None = None) -> Any:
         """Send a DELETE request."""
-        url = self.generate_url(endpoint)
-        all_headers = {**self.base_headers, **(headers or {})}
-        logger.info(f"DELETE request to {url}, headers: {all_headers}")
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.delete(url, headers=all_headers)
-        return await self._handle_response(response)
+        return await self._request("DELETE", endpoint, headers)
 
     async def _handle_response(self, response: httpx.Response) -> Any | None:
         """Handle the response, raise an exception for bad responses."""
@@ -99,8 +126,8 @@ class BaseService:
             response.raise_for_status()
             return response.json()
         except httpx.HTTPStatusError as e:
-            logger.info(f"HTTP error: {e}")
+            logger.info("HTTP error: %s", e)
             return None
         except Exception as e:
-            logger.info(f"Error: {e}")
+            logger.info("Error: %s", e)
             return None
@@ -32,11 +32,9 @@ class BotService(BaseService):
     async def send_new_matches(self, user_public_ids: list[uuid.UUID]) -> Any:
         if not user_public_ids:
             return None
-        unique_user_public_ids = list(set(user_public_ids))
+        telegram_ids = await UserService().get_telegram_ids(user_public_ids)
         messages: list[BotMessage] = []
-        user_service = UserService()
-        for user_public_id in unique_user_public_ids:
-            telegram_id = await user_service.get_telegram_id(user_public_id)
+        for telegram_id in telegram_ids.values():
             message = BotMessage(
                 chat_id=telegram_id,
                 message=self.MESSAGE_NEW_MATCH,
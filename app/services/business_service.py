@@ -5,11 +5,27 @@ from typing import Any
 from app.core.config import settings
 from app.models.available_time import AvailableTime
 from app.models.court import Court
+from app.utilities.cache import AsyncTTLCache
 
 from .base_service import BaseService
 
+# Courts of every business, fetched at once
+courts_cache: AsyncTTLCache[str, dict[str, list[Court]]] = AsyncTTLCache(
+    "business_courts", maxsize=1, ttl=settings.BUSINESS_CACHE_COURTS_TTL
+)
+# Available times by (business_public_id, court_name, date)
+available_times_cache: AsyncTTLCache[
+    tuple[uuid.UUID, str, date], list[AvailableTime]
+] = AsyncTTLCache(
+    "business_available_times",
+    maxsize=settings.BUSINESS_CACHE_MAXSIZE,
+    ttl=settings.BUSINESS_CACHE_AVAILABLE_TIMES_TTL,
+)
+
 
 class BusinessService(BaseService):
+    COURTS_CACHE_KEY: str = "all"
+
     def __init__(self) -> None:
         """Init the service."""
         super().__init__()
@@ -22,28 +38,39 @@ class BusinessService(BaseService):
             self.set_base_headers({"x-api-key": settings.BUSINESS_SERVICE_API_KEY})
 
     async def get_courts(self, business_public_id: uuid.UUID) -> list[Court]:
+        courts = await courts_cache.get_or_fetch(
+            self.COURTS_CACHE_KEY, self._fetch_courts
+        )
+        return list(courts.get(str(business_public_id), []))
+
+    async def _fetch_courts(self) -> dict[str, list[Court]]:
+        """Get the courts of all the businesses, by business public id."""
         content = await self.get("/api/v1/padel-courts/")
         data = content["data"]
-        business_data = []
+        courts: dict[str, list[Court]] = {}
         for datum in data:
-            if datum["business_public_id"] == str(business_public_id):
-                business_data.append(datum)
-
-        courts = []
-        for datum in business_data:
-            avail_time = Court(
+            court = Court(
                 business_public_id=datum["business_public_id"],
                 court_public_id=datum["court_public_id"],
                 court_name=datum["name"],
                 price_per_hour=datum["price_per_hour"],
             )
-            courts.append(avail_time)
+            courts.setdefault(datum["business_public_id"], []).append(court)
         return courts
 
     async def get_available_times(
         self, business_public_id: uuid.UUID, court_name: str, date: date
     ) -> list[AvailableTime]:
         "Get available times from business service"
+        avail_times = await available_times_cache.get_or_fetch(
+            (business_public_id, court_name, date),
+            lambda: self._fetch_available_times(business_public_id, court_name, date),
+        )
+        return list(avail_times)
+
+    async def _fetch_available_times(
+        self, business_public_id: uuid.UUID, court_name: str, date: date
+    ) -> list[AvailableTime]:
         params: dict[str, Any] = {
             "business_id": business_public_id,
             "court_name": court_name,
@@ -79,3 +106,22 @@ class BusinessService(BaseService):
             if avail_time.time == time:
                 return avail_time
         return None
+
+    @staticmethod
+    def invalidate_courts() -> None:
+        courts_cache.clear()
+
+    @staticmethod
+    def invalidate_available_times(
+        business_public_id: uuid.UUID | None = None,
+        court_name: str | None = None,
+        date: date | None = None,
+    ) -> None:
+        """Drop the cached available times that match all the given values."""
+        available_times_cache.invalidate_where(
+            lambda key: (
+                (business_public_id is None or key[0] == business_public_id)
+                and (court_name is None or key[1] == court_name)
+                and (date is None or key[2] == date)
+            )
+        )
@@ -1,6 +1,6 @@
 import uuid
+from collections import defaultdict
 
-from app.models.match import Match
 from app.models.match_extended import MatchExtended
 from app.models.match_player import MatchPlayer
 from app.services.match_player_service import MatchPlayerService
@@ -18,26 +18,46 @@ class MatchExtendedService:
         )
         return MatchExtended(match, match_players)
 
-    async def get_player_matches(
-        self, session: SessionDep, player_id: uuid.UUID
+    async def get_matches(
+        self, session: SessionDep, match_public_ids: list[uuid.UUID]
     ) -> list[MatchExtended]:
-        match_player_service = MatchPlayerService()
-        player_matches: list[
-            MatchPlayer
-        ] = await match_player_service.get_player_matches(session, player_id)
-        if not player_matches:
+        """
+        Load the matches and all their players in two queries,
+        keeping the order of the given public ids.
+        """
+        if not match_public_ids:
             return []
-        result = []
-        match_service = MatchService()
-        for player_match in player_matches:
-            match_id = player_match.match_public_id
-            if match_id is None:
+        matches = await MatchService().get_matches_by_public_ids(
+            session, match_public_ids
+        )
+        match_players = await MatchPlayerService().get_match_players(
+            session, order_by=[("id", True)], match_public_id=match_public_ids
+        )
+
+        matches_by_public_id = {match.public_id: match for match in matches}
+        players_by_match: dict[uuid.UUID, list[MatchPlayer]] = defaultdict(list)
+        for match_player in match_players:
+            if match_player.match_public_id is None:
                 continue
-            match: Match = await match_service.get_match(session, match_id)
-            match_players = await match_player_service.get_match_players(
-                session, match_public_id=match_id
-            )
-            if match_players is None:
+            players_by_match[match_player.match_public_id].append(match_player)
+
+        result = []
+        for match_public_id in dict.fromkeys(match_public_ids):
+            match = matches_by_public_id.get(match_public_id)
+            if match is None:
                 continue
-            result.append(MatchExtended(match, match_players))
+            result.append(MatchExtended(match, players_by_match[match_public_id]))
         return result
+
+    async def get_player_matches(
+        self, session: SessionDep, player_id: uuid.UUID
+    ) -> list[MatchExtended]:
+        player_matches = await MatchPlayerService().get_player_matches(
+            session, player_id
+        )
+        match_public_ids = [
+            player_match.match_public_id
+            for player_match in player_matches
+            if player_match.match_public_id is not None
+        ]
+        return await self.get_matches(session, match_public_ids)
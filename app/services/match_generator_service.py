@@ -1,8 +1,11 @@
+import datetime
+from collections import defaultdict
 from typing import ClassVar
 from uuid import UUID
 
+from app.core.config import settings
 from app.models.available_time import AvailableTime
-from app.models.match import MatchCreate
+from app.models.match import MatchCreate, MatchFilters
 from app.models.match_extended import MatchExtended
 from app.models.match_generation import (
     MatchGenerationCreate,
@@ -10,57 +13,173 @@ from app.models.match_generation import (
 )
 from app.models.match_player import MatchPlayer, MatchPlayerCreate, ReserveStatus
 from app.models.player import Player, PlayerFilters
+from app.models.player_activity import PlayerActivity
 from app.services.business_service import BusinessService
 from app.services.match_extended_service import MatchExtendedService
 from app.services.match_player_service import MatchPlayerService
 from app.services.match_service import MatchService
+from app.services.outbox_service import OutboxService
+from app.services.player_activity_service import PlayerActivityService
 from app.services.players_service import PlayersService
+from app.utilities.assignment import FORBIDDEN_COST, solve_assignment
 from app.utilities.commit import commit_refresh_or_flush
+from app.utilities.concurrency import gather_with_concurrency
 from app.utilities.dependencies import SessionDep
-from app.utilities.exceptions import NotUniqueException
+from app.utilities.similarity import score_players
 
 
 class MatchGeneratorService:
     MIN_SIM_PLAYERS: ClassVar[int] = 1
     FACTOR_SIM_PLAYERS: ClassVar[int] = 4
     N_SIM_PLAYERS: ClassVar[int] = MIN_SIM_PLAYERS * FACTOR_SIM_PLAYERS
+    # Added to the cost of a player that played on the day of the match,
+    # decreasing to 0 for the ones that last played RECENT_MATCH_DAYS before
+    RECENT_MATCH_PENALTY_KM: ClassVar[float] = 25.0
+    RECENT_MATCH_DAYS: ClassVar[int] = 14
 
     async def get_matches(
         self, session: SessionDep, matches_public_ids: list[UUID]
     ) -> list[MatchExtended]:
-        matches_extended = [
-            await MatchExtendedService().get_match(session, match_public_id)
-            for match_public_id in matches_public_ids
-        ]
-
-        return matches_extended
+        return await MatchExtendedService().get_matches(session, matches_public_ids)
 
-    def _choose_priority_player(self, players: list[Player]) -> Player:
-        # TODO: Choose priority player base on last played match w.r.t. today.
-        return players[0]
+    def _choose_priority_player(
+        self,
+        avail_time: AvailableTime,
+        players: list[Player],
+        players_activity: dict[UUID, PlayerActivity],
+    ) -> Player:
+        """The player with the lowest assignment cost, the first one on ties."""
+        costs = self._assignment_costs(avail_time, players, players_activity)
+        return players[costs.index(min(costs))]
 
     async def _choose_match_players(
-        self, avail_time: AvailableTime, exclude_uuids: list[UUID] | None = None
+        self,
+        session: SessionDep,
+        avail_time: AvailableTime,
+        exclude_uuids: list[UUID] | None = None,
     ) -> tuple[Player | None, list[Player]]:
-        if exclude_uuids is None:
-            exclude_uuids = []
-
-        players_filters = PlayerFilters.from_available_time(avail_time)
-        avail_players = await PlayersService().get_players_by_filters(
-            players_filters, exclude_uuids
-        )
+        avail_players = await self._get_candidate_players(avail_time, exclude_uuids)
 
         if not len(avail_players) > 0:
             return None, []
 
-        assigned_player = self._choose_priority_player(avail_players)
+        players_activity = await PlayerActivityService().get_players_activity(
+            session, [player.user_public_id for player in avail_players]
+        )
+        assigned_player = self._choose_priority_player(
+            avail_time, avail_players, players_activity
+        )
+        similar_players = await self._get_similar_players(
+            avail_time, assigned_player, exclude_uuids
+        )
+        return assigned_player, similar_players
+
+    async def _get_candidate_players(
+        self, avail_time: AvailableTime, exclude_uuids: list[UUID] | None = None
+    ) -> list[Player]:
+        players_filters = PlayerFilters.from_available_time(avail_time)
+        return await PlayersService().get_players_by_filters(
+            players_filters, exclude_uuids or []
+        )
+
+    async def _get_similar_players(
+        self,
+        avail_time: AvailableTime,
+        assigned_player: Player | None,
+        exclude_uuids: list[UUID] | None = None,
+    ) -> list[Player]:
+        if assigned_player is None:
+            return []
 
+        players_filters = PlayerFilters.from_available_time(avail_time)
         players_filters.user_public_id = assigned_player.user_public_id
-        players_filters.n_players = self.N_SIM_PLAYERS + len(exclude_uuids)
+        players_filters.n_players = self.N_SIM_PLAYERS
         similar_players = await PlayersService().get_players_by_filters(
-            players_filters, exclude_uuids
+            players_filters, exclude_uuids or []
         )
-        return assigned_player, similar_players
+        return [
+            player
+            for player in similar_players
+            if player.user_public_id != assigned_player.user_public_id
+        ]
+
+    def _recent_match_penalty(
+        self, avail_time: AvailableTime, player_activity: PlayerActivity | None
+    ) -> float:
+        if player_activity is None or player_activity.last_match_date is None:
+            return 0.0
+        days = max((avail_time.date - player_activity.last_match_date).days, 0)
+        recent_days = max(self.RECENT_MATCH_DAYS - days, 0)
+        return self.RECENT_MATCH_PENALTY_KM * recent_days / self.RECENT_MATCH_DAYS
+
+    def _assignment_costs(
+        self,
+        avail_time: AvailableTime,
+        players: list[Player],
+        players_activity: dict[UUID, PlayerActivity],
+    ) -> list[float]:
+        """
+        Distance of each player to the available time, plus a penalty
+        for the ones that played recently, so the others go first.
+        """
+        distances = score_players(avail_time, players)
+        return [
+            distance
+            + self._recent_match_penalty(
+                avail_time,
+                players_activity.get(player.user_public_id),  # type: ignore
+            )
+            for distance, player in zip(distances, players, strict=True)
+        ]
+
+    def _assign_players(
+        self,
+        avail_times: list[AvailableTime],
+        candidates: list[list[Player]],
+        players_activity: dict[UUID, PlayerActivity],
+    ) -> list[Player | None]:
+        """
+        Assigned player of each available time, from its candidates.
+        The available times of a business, day and time band are solved
+        together as a min-cost assignment, so no player is assigned twice
+        in them while there are enough candidates. The ones left without a
+        free candidate get their priority player, even if already assigned,
+        and only the ones without candidates get None.
+        """
+        bands: dict[tuple[UUID, datetime.date, int], list[int]] = defaultdict(list)
+        for i, avail_time in enumerate(avail_times):
+            time_availability = PlayerFilters.to_time_availability(avail_time.time)
+            bands[
+                (avail_time.business_public_id, avail_time.date, time_availability)
+            ].append(i)
+
+        assigned_players: list[Player | None] = [None] * len(avail_times)
+        for indexes in bands.values():
+            players_by_uuid: dict[UUID | None, Player] = {}
+            for i in indexes:
+                for player in candidates[i]:
+                    players_by_uuid.setdefault(player.user_public_id, player)
+            columns = {uuid: j for j, uuid in enumerate(players_by_uuid)}
+
+            costs = []
+            for i in indexes:
+                row = [FORBIDDEN_COST] * len(columns)
+                players_costs = self._assignment_costs(
+                    avail_times[i], candidates[i], players_activity
+                )
+                for player, cost in zip(candidates[i], players_costs, strict=True):
+                    row[columns[player.user_public_id]] = cost
+                costs.append(row)
+
+            players = list(players_by_uuid.values())
+            for i, j in zip(indexes, solve_assignment(costs), strict=True):
+                if j is not None:
+                    assigned_players[i] = players[j]
+                elif candidates[i]:
+                    assigned_players[i] = self._choose_priority_player(
+                        avail_times[i], candidates[i], players_activity
+                    )
+        return assigned_players
 
     async def generate_match_players(
         self,
@@ -78,7 +197,7 @@ class MatchGeneratorService:
         await match_player_service.delete_match_players(
             session,
             should_commit=True,
-            match_public_id=[match_public_id],
+            match_public_id=match_public_id,
             user_public_id=old_similar_uuids,
         )
 
@@ -88,14 +207,31 @@ class MatchGeneratorService:
         outside_uuids = [player.user_public_id for player in outside_players]
 
         assigned_player, similar_players = await self._choose_match_players(
-            avail_time, exclude_uuids=outside_uuids
+            session, avail_time, exclude_uuids=outside_uuids
+        )
+        return await self._create_match_players(
+            session,
+            match_public_id,
+            avail_time,
+            assigned_player,
+            similar_players,
+            should_commit,
         )
+
+    def _get_match_players_create(
+        self,
+        match_public_id: UUID,
+        avail_time: AvailableTime,
+        assigned_player: Player | None,
+        similar_players: list[Player],
+    ) -> list[MatchPlayerCreate]:
         if not assigned_player or len(similar_players) == 0:
             return []
 
         avail_players = [assigned_player] + similar_players
-        match_players = []
-        for distance, player in enumerate(avail_players):
+        distances = score_players(avail_time, avail_players)
+        match_players_create = []
+        for distance, player in zip(distances, avail_players, strict=True):
             reserve_status = ReserveStatus.SIMILAR
             if player.user_public_id == assigned_player.user_public_id:
                 reserve_status = ReserveStatus.ASSIGNED
@@ -106,68 +242,167 @@ class MatchGeneratorService:
                 distance=distance,
                 reserve=reserve_status,
             )
+            match_players_create.append(match_player_create)
+        return match_players_create
 
-            match_player = await MatchPlayerService().create_match_player(
-                session, match_player_create, should_commit=False
-            )
-            match_players.append(match_player)
+    async def _create_match_players(
+        self,
+        session: SessionDep,
+        match_public_id: UUID,
+        avail_time: AvailableTime,
+        assigned_player: Player | None,
+        similar_players: list[Player],
+        should_commit: bool = True,
+    ) -> list[MatchPlayer]:
+        match_players_create = self._get_match_players_create(
+            match_public_id, avail_time, assigned_player, similar_players
+        )
+        if not assigned_player or not match_players_create:
+            return []
+
+        match_players = await MatchPlayerService().create_match_players(
+            session, match_players_create, should_commit=False
+        )
+        await PlayerActivityService().record_assigned(
+            session,
+            [assigned_player.user_public_id],  # type: ignore
+        )
 
         await commit_refresh_or_flush(session, should_commit)
 
         return match_players
 
-    async def generate_match(
-        self, session: SessionDep, avail_time: AvailableTime, should_commit: bool = True
-    ) -> MatchExtended:
-        match_create = MatchCreate.from_available_time(avail_time)
+    async def _filter_new_available_times(
+        self, session: SessionDep, avail_times: list[AvailableTime]
+    ) -> list[AvailableTime]:
+        """Drop the available times that already have a match."""
+        business_days = {
+            (avail_time.business_public_id, avail_time.date)
+            for avail_time in avail_times
+        }
+        existing_slots: set[tuple[UUID | None, str | None, int | None]] = set()
+        for business_public_id, date in business_days:
+            matches = await MatchService().get_matches(
+                session, MatchFilters(business_public_id=business_public_id, date=date)
+            )
+            existing_slots.update(
+                (match.court_public_id, match.court_name, match.time)
+                for match in matches
+            )
+        return [
+            avail_time
+            for avail_time in avail_times
+            if (avail_time.court_public_id, avail_time.court_name, avail_time.time)
+            not in existing_slots
+        ]
+
+    async def _generate_matches(
+        self, session: SessionDep, avail_times: list[AvailableTime]
+    ) -> list[UUID]:
+        """
+        Players are looked up concurrently for the available times without
+        a match, bounded by MATCH_GENERATION_CONCURRENCY, and assigned to
+        them at once (see _assign_players). The matches are then inserted
+        in one statement that skips the ones created meanwhile, and the
+        players of the created ones in another, committed together.
+        """
+        avail_times = await self._filter_new_available_times(session, avail_times)
+        if not avail_times:
+            return []
 
-        match = await MatchService().create_match(
-            session, match_create, should_commit=False
+        candidates = await gather_with_concurrency(
+            settings.MATCH_GENERATION_CONCURRENCY,
+            *(self._get_candidate_players(avail_time) for avail_time in avail_times),
+        )
+        players_activity = await PlayerActivityService().get_players_activity(
+            session,
+            [player.user_public_id for players in candidates for player in players],
+        )
+        assigned_players = self._assign_players(
+            avail_times, candidates, players_activity
+        )
+        similar_players_list = await gather_with_concurrency(
+            settings.MATCH_GENERATION_CONCURRENCY,
+            *(
+                self._get_similar_players(avail_time, assigned_player)
+                for avail_time, assigned_player in zip(
+                    avail_times, assigned_players, strict=True
+                )
+            ),
         )
 
-        match_players = await self.generate_match_players(
-            session, match.public_id, avail_time, should_commit=False
+        matches = await MatchService().create_missing_matches(
+            session,
+            [MatchCreate.from_available_time(avail_time) for avail_time in avail_times],
+            should_commit=False,
         )
+        matches_by_slot = {
+            (match.court_public_id, match.court_name, match.date, match.time): match
+            for match in matches
+        }
 
-        await commit_refresh_or_flush(
-            session, should_commit, records=[match] + match_players
+        matches_public_ids = []
+        match_players_create = []
+        assigned_uuids = []
+        for avail_time, assigned_player, similar_players in zip(
+            avail_times, assigned_players, similar_players_list, strict=True
+        ):
+            slot = (
+                avail_time.court_public_id,
+                avail_time.court_name,
+                avail_time.date,
+                avail_time.time,
+            )
+            match = matches_by_slot.pop(slot, None)
+            if match is None:
+                # Created meanwhile by another generation
+                continue
+            matches_public_ids.append(match.public_id)
+
+            players_create = self._get_match_players_create(
+                match.public_id, avail_time, assigned_player, similar_players
+            )
+            if assigned_player is not None and players_create:
+                match_players_create += players_create
+                assigned_uuids.append(assigned_player.user_public_id)
+
+        await MatchPlayerService().create_match_players(
+            session, match_players_create, should_commit=False
         )
+        await PlayerActivityService().record_assigned(session, assigned_uuids)  # type: ignore
+        await OutboxService().enqueue_new_matches(session, assigned_uuids)  # type: ignore
+        await commit_refresh_or_flush(session, True)
 
-        return MatchExtended(match, match_players)
+        return matches_public_ids
 
     async def generate_matches(
         self, session: SessionDep, match_gen_create: MatchGenerationCreateExtended
     ) -> list[UUID]:
-        matches_public_ids = []
-
         avail_times = await BusinessService().get_available_times(
             **match_gen_create.model_dump()
         )
-        for avail_time in avail_times:
-            try:
-                match_extended = await self.generate_match(
-                    session, avail_time, should_commit=True
-                )
-            except NotUniqueException:
-                continue
-            matches_public_ids.append(match_extended.match.public_id)
-
-        return matches_public_ids
+        return await self._generate_matches(session, avail_times)
 
     async def generate_matches_all(
         self, session: SessionDep, match_gen_create: MatchGenerationCreate
     ) -> list[UUID]:
-        matches_public_ids = []
-
         courts = await BusinessService().get_courts(match_gen_create.business_public_id)
 
-        for court in courts:
-            match_gen_create_ext = MatchGenerationCreateExtended(
-                court_name=court.court_name, **match_gen_create.model_dump()
-            )
-            _matches_public_ids = await self.generate_matches(
-                session, match_gen_create_ext
-            )
-            matches_public_ids += _matches_public_ids
+        courts_avail_times = await gather_with_concurrency(
+            settings.MATCH_GENERATION_CONCURRENCY,
+            *(
+                BusinessService().get_available_times(
+                    **MatchGenerationCreateExtended(
+                        court_name=court.court_name, **match_gen_create.model_dump()
+                    ).model_dump()
+                )
+                for court in courts
+            ),
+        )
+        avail_times = [
+            avail_time
+            for court_avail_times in courts_avail_times
+            for avail_time in court_avail_times
+        ]
 
-        return matches_public_ids
+        return await self._generate_matches(session, avail_times)
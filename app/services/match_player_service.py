@@ -5,10 +5,15 @@ from app.models.match_extended import MatchExtended
 from app.models.match_player import (
     MatchPlayer,
     MatchPlayerCreate,
+    MatchPlayersReserve,
+    MatchPlayerUpdate,
+    ReserveStatus,
 )
 from app.repository.match_player_repository import MatchPlayerRepository
 from app.services.match_service import MatchService
+from app.utilities.commit import commit_refresh_or_flush
 from app.utilities.dependencies import SessionDep
+from app.utilities.exceptions import NotFoundException
 
 
 class MatchPlayerService:
@@ -24,10 +29,15 @@ class MatchPlayerService:
         )
 
     async def create_match_players(
-        self, session: SessionDep, match_players_in: list[MatchPlayerCreate]
+        self,
+        session: SessionDep,
+        match_players_in: list[MatchPlayerCreate],
+        should_commit: bool = True,
     ) -> list[MatchPlayer]:
         repo_match_player = MatchPlayerRepository(session)
-        return await repo_match_player.create_match_players(match_players_in)
+        return await repo_match_player.create_match_players(
+            match_players_in, should_commit
+        )
 
     async def get_match_player(
         self,
@@ -64,6 +74,15 @@ class MatchPlayerService:
         repo_match_player = MatchPlayerRepository(session)
         return await repo_match_player.get_matches_players(order_by, limit, **filters)
 
+    async def get_match_players_reserve(
+        self, session: SessionDep, match_public_id: UUID
+    ) -> MatchPlayersReserve:
+        """Reserve status snapshot of the match players, in one query."""
+        match_players = await self.get_match_players(
+            session, order_by=[("distance", True)], match_public_id=match_public_id
+        )
+        return MatchPlayersReserve(match_players)
+
     async def get_player_matches(
         self,
         session: SessionDep,
@@ -74,6 +93,31 @@ class MatchPlayerService:
             user_public_id=user_public_id
         )
 
+    async def update_match_players_reserve(
+        self,
+        session: SessionDep,
+        match_public_id: UUID,
+        user_public_ids: list[UUID],
+        reserve: ReserveStatus,
+        should_commit: bool = True,
+    ) -> list[MatchPlayer]:
+        """
+        Set the reserve of the players of the match in one statement.
+        Nothing is updated if any of the players is not in the match.
+        """
+        repo_match_player = MatchPlayerRepository(session)
+        match_players = await repo_match_player.update_match_players(
+            MatchPlayerUpdate(reserve=reserve),
+            should_commit=False,
+            match_public_id=match_public_id,
+            user_public_id=user_public_ids,
+        )
+        if len(match_players) != len(set(user_public_ids)):
+            await session.rollback()
+            raise NotFoundException(MatchPlayer.name())
+        await commit_refresh_or_flush(session, should_commit)
+        return sorted(match_players, key=lambda x: x.distance)
+
     async def delete_match_players(
         self, session: SessionDep, should_commit: bool = True, **filters: Any
     ) -> None:
@@ -1,21 +1,24 @@
 from uuid import UUID
 
 from app.models.match import MatchStatus, MatchUpdate
+from app.models.match_extended import MatchExtended
 from app.models.match_player import (
     MatchPlayer,
     MatchPlayerPay,
+    MatchPlayersReserve,
     MatchPlayerUpdate,
     ReserveStatus,
 )
 from app.repository.match_player_repository import MatchPlayerRepository
-from app.services.bot_service import BotService
 from app.services.business_service import BusinessService
 from app.services.match_generator_service import MatchGeneratorService
 from app.services.match_player_service import MatchPlayerService
 from app.services.match_service import MatchService
+from app.services.outbox_service import OutboxService
 from app.services.payment_service import PaymentsService
+from app.services.player_activity_service import PlayerActivityService
 from app.utilities.dependencies import SessionDep
-from app.utilities.exceptions import NotAuthorizedException
+from app.utilities.exceptions import NotAuthorizedException, NotFoundException
 
 
 class MatchPlayerUpdateService:
@@ -28,43 +31,47 @@ class MatchPlayerUpdateService:
         user_public_id: UUID,
         match_player_in: MatchPlayerUpdate,
     ) -> MatchPlayerPay:
+        reserve = await MatchPlayerService().get_match_players_reserve(
+            session, match_public_id
+        )
+
         pay_url = None
         if match_player_in.is_inside():
-            await self._validate_accept_match_player(
-                session, match_public_id, user_public_id
+            old_match_player = self._validate_accept_match_player(
+                reserve, user_public_id
             )
             pay_url = await self._create_payment(
-                session, match_public_id, user_public_id
+                session, match_public_id, old_match_player
             )
+            # Committed together with the player update
+            await PlayerActivityService().record_inside(session, [user_public_id])
 
         match_player = await self._update_match_player(
             session, match_public_id, user_public_id, match_player_in
         )
+        reserve.set_player(match_player)
 
-        await self._update_match_first(session, match_public_id)
+        await self._update_match_first(session, match_public_id, reserve)
 
-        await self._update_match_similars(session, match_public_id)
+        await self._update_match_similars(session, match_public_id, reserve)
 
         return MatchPlayerPay.from_match_player(match_player, pay_url)
 
-    async def _validate_accept_match_player(
-        self,
-        session: SessionDep,
-        match_public_id: UUID,
-        user_public_id: UUID,
-    ) -> None:
-        match_player = await MatchPlayerService().get_match_player(
-            session, match_public_id, user_public_id
-        )
+    def _validate_accept_match_player(
+        self, reserve: MatchPlayersReserve, user_public_id: UUID
+    ) -> MatchPlayer:
+        match_player = reserve.get_player(user_public_id)
+        if match_player is None:
+            raise NotFoundException(MatchPlayer.name())
         if not match_player.is_assigned():
             raise NotAuthorizedException()
+        return match_player
 
     async def _create_payment(
-        self, session: SessionDep, match_public_id: UUID, user_public_id: UUID
+        self, session: SessionDep, match_public_id: UUID, match_player: MatchPlayer
     ) -> str | None:
-        match_player_extended = await MatchPlayerService().get_match_player_extended(
-            session, match_public_id, user_public_id
-        )
+        match = await MatchService().get_match(session, match_public_id)
+        match_player_extended = MatchExtended(match, [match_player])
         payment = await PaymentsService().create_payment(match_player_extended)
         return payment.pay_url
 
@@ -84,13 +91,9 @@ class MatchPlayerUpdateService:
         return match_player
 
     async def _update_match_first(
-        self, session: SessionDep, match_public_id: UUID
+        self, session: SessionDep, match_public_id: UUID, reserve: MatchPlayersReserve
     ) -> None:
-        inside_players = await MatchPlayerService().get_match_players(
-            session, match_public_id=match_public_id, reserve=ReserveStatus.INSIDE
-        )
-
-        if inside_players:
+        if reserve.count(ReserveStatus.INSIDE) > 0:
             return
 
         match = await MatchService().get_match(session, match_public_id)
@@ -106,46 +109,51 @@ class MatchPlayerUpdateService:
             )
 
     async def _update_match_similars(
-        self, session: SessionDep, match_public_id: UUID
+        self, session: SessionDep, match_public_id: UUID, reserve: MatchPlayersReserve
     ) -> None:
-        inside_players = await MatchPlayerService().get_match_players(
-            session, match_public_id=match_public_id, reserve=ReserveStatus.INSIDE
-        )
-        n_inside = len(inside_players)
+        n_inside = reserve.count(ReserveStatus.INSIDE)
 
         if n_inside <= 0:
             return
 
-        assigned_players = await MatchPlayerService().get_match_players(
-            session, match_public_id=match_public_id, reserve=ReserveStatus.ASSIGNED
-        )
-        n_assigned = len(assigned_players)
+        n_assigned = reserve.count(ReserveStatus.ASSIGNED)
 
         n_missing_players = self.MAX_MATCH_PLAYERS - n_assigned - n_inside
 
         if n_inside == self.MAX_MATCH_PLAYERS:
-            await MatchService().update_match(
-                session, match_public_id, MatchUpdate(status=MatchStatus.reserved)
+            match = await MatchService().update_match(
+                session,
+                match_public_id,
+                MatchUpdate(status=MatchStatus.reserved),
+                should_commit=False,
+            )
+            inside_uuids = [
+                player.user_public_id
+                for player in reserve.get_players(ReserveStatus.INSIDE)
+            ]
+            await PlayerActivityService().record_reserved(
+                session,
+                inside_uuids,
+                match.date,  # type: ignore
+                should_commit=True,
+            )
+            BusinessService.invalidate_available_times(
+                match.business_public_id, match.court_name, match.date
             )
 
         next_assign_players = []
         if n_missing_players > 0:
-            next_assign_players = await MatchPlayerService().get_match_players(
-                session,
-                order_by=[("distance", True)],
-                limit=n_missing_players,
-                match_public_id=match_public_id,
-                reserve=ReserveStatus.SIMILAR,
-            )
+            next_assign_players = reserve.get_players(ReserveStatus.SIMILAR)[
+                :n_missing_players
+            ]
 
-        next_assign_uuids = []
-        for player in next_assign_players:
-            await self._update_match_player(
-                session,
-                match_public_id,
-                player.user_public_id,
-                MatchPlayerUpdate(reserve=ReserveStatus.ASSIGNED),
-            )
-            next_assign_uuids.append(player.user_public_id)
+        if not next_assign_players:
+            return
 
-        await BotService().send_new_matches(next_assign_uuids)
+        next_assign_uuids = [player.user_public_id for player in next_assign_players]
+        # Committed together with the players update
+        await OutboxService().enqueue_new_matches(session, next_assign_uuids)
+        await PlayerActivityService().record_assigned(session, next_assign_uuids)
+        await MatchPlayerService().update_match_players_reserve(
+            session, match_public_id, next_assign_uuids, ReserveStatus.ASSIGNED
+        )
@@ -1,10 +1,13 @@
+from collections.abc import AsyncIterator
 from uuid import UUID
 
 from fastapi import Depends
 
+from app.core.config import settings
 from app.models.match import (
     Match,
     MatchCreate,
+    MatchCursor,
     MatchFilters,
     MatchUpdate,
 )
@@ -25,6 +28,16 @@ class MatchService:
         repo_match = MatchRepository(session)
         return await repo_match.create_matches(matches_in)
 
+    async def create_missing_matches(
+        self,
+        session: SessionDep,
+        matches_in: list[MatchCreate],
+        should_commit: bool = True,
+    ) -> list[Match]:
+        """Create the matches whose court, date and time are free, in one INSERT."""
+        repo_match = MatchRepository(session)
+        return await repo_match.create_missing_matches(matches_in, should_commit)
+
     async def get_match(
         self,
         session: SessionDep,
@@ -33,6 +46,12 @@ class MatchService:
         repo_match = MatchRepository(session)
         return await repo_match.get_match(public_id=public_id)
 
+    async def get_matches_by_public_ids(
+        self, session: SessionDep, public_ids: list[UUID]
+    ) -> list[Match]:
+        repo_match = MatchRepository(session)
+        return await repo_match.get_matches(public_id=public_ids)
+
     async def get_matches(
         self, session: SessionDep, prov_match_opt: MatchFilters = Depends()
     ) -> list[Match]:
@@ -40,14 +59,51 @@ class MatchService:
         filters = prov_match_opt.model_dump(exclude_unset=True, exclude_none=True)
         return await repo_match.get_matches(**filters)
 
+    async def get_matches_page(
+        self,
+        session: SessionDep,
+        prov_match_opt: MatchFilters,
+        limit: int,
+        cursor: MatchCursor | None = None,
+    ) -> tuple[list[Match], MatchCursor | None]:
+        """
+        Page of matches ordered by date, time and id.
+        Returns the matches and the cursor of the next page, if there is one.
+        """
+        repo_match = MatchRepository(session)
+        filters = prov_match_opt.model_dump(exclude_unset=True, exclude_none=True)
+        after = cursor.to_keyset() if cursor else None
+        matches = await repo_match.get_matches_page(limit + 1, after, **filters)
+        if len(matches) <= limit:
+            return matches, None
+        matches = matches[:limit]
+        return matches, MatchCursor.from_match(matches[-1])
+
+    def stream_matches(
+        self,
+        session: SessionDep,
+        prov_match_opt: MatchFilters,
+        cursor: MatchCursor | None = None,
+    ) -> AsyncIterator[Match]:
+        """All the matches, in the order of the pages, from a server side cursor."""
+        repo_match = MatchRepository(session)
+        filters = prov_match_opt.model_dump(exclude_unset=True, exclude_none=True)
+        after = cursor.to_keyset() if cursor else None
+        return repo_match.stream_matches(
+            after, settings.MATCHES_STREAM_YIELD_PER, **filters
+        )
+
     async def update_match(
         self,
         session: SessionDep,
         public_id: UUID,
         match_in: MatchUpdate,
+        should_commit: bool = True,
     ) -> Match:
         repo_match = MatchRepository(session)
-        return await repo_match.update_match(match_in, public_id=public_id)
+        return await repo_match.update_match(
+            match_in, should_commit, public_id=public_id
+        )
 
     async def is_match_create_valid(
         self, session: SessionDep, match_in: MatchCreate
@@ -0,0 +1,208 @@
+import asyncio
+import datetime
+import logging
+from collections.abc import Awaitable, Callable
+from typing import Any
+from uuid import UUID
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.db import get_session
+from app.models.outbox import (
+    OutboxKind,
+    OutboxMessage,
+    OutboxMessageCreate,
+    OutboxStatus,
+    utc_now,
+)
+from app.repository.outbox_repository import OutboxRepository
+from app.services.bot_service import BotService
+from app.utilities.commit import commit_refresh_or_flush
+from app.utilities.dependencies import SessionDep
+from app.utilities.exceptions import ServiceUnavailableException
+
+logger = logging.getLogger(__name__)
+
+
+class OutboxService:
+    """
+    Side effects written to the DB in the same transaction as the changes
+    that cause them, and delivered later by the OutboxWorker.
+    """
+
+    async def enqueue(
+        self,
+        session: SessionDep,
+        kind: OutboxKind,
+        payload: dict[str, Any],
+        should_commit: bool = False,
+    ) -> OutboxMessage:
+        # The workers are woken up once the message is committed
+        session.info[_OUTBOX_PENDING] = True
+        repo_outbox = OutboxRepository(session)
+        return await repo_outbox.create_message(
+            OutboxMessageCreate(kind=kind, payload=payload), should_commit
+        )
+
+    async def enqueue_new_matches(
+        self,
+        session: SessionDep,
+        user_public_ids: list[UUID],
+        should_commit: bool = False,
+    ) -> OutboxMessage | None:
+        if not user_public_ids:
+            return None
+        payload = {"user_public_ids": [str(x) for x in user_public_ids]}
+        return await self.enqueue(
+            session, OutboxKind.NEW_MATCHES, payload, should_commit
+        )
+
+    async def _send_new_matches(self, payloads: list[dict[str, Any]]) -> None:
+        """All the pending new matches go out in one bot bulk message."""
+        user_public_ids = [
+            UUID(user_public_id)
+            for payload in payloads
+            for user_public_id in payload["user_public_ids"]
+        ]
+        # Failed responses come back as None, retried as any other failure
+        if await BotService().send_new_matches(user_public_ids) is None:
+            raise ServiceUnavailableException("Bot")
+
+    def _get_handler(
+        self, kind: str
+    ) -> Callable[[list[dict[str, Any]]], Awaitable[None]]:
+        handlers = {OutboxKind.NEW_MATCHES: self._send_new_matches}
+        return handlers[OutboxKind(kind)]
+
+    def _get_backoff(self, attempts: int) -> datetime.timedelta:
+        seconds = settings.OUTBOX_BACKOFF_BASE * 2 ** max(attempts - 1, 0)
+        return datetime.timedelta(seconds=min(seconds, settings.OUTBOX_BACKOFF_MAX))
+
+    async def process_pending(self, session: SessionDep) -> int:
+        """
+        Deliver one batch of due messages. Messages of the same kind are
+        delivered together. Failed deliveries are retried with exponential
+        backoff, up to OUTBOX_MAX_ATTEMPTS.
+        Returns the number of claimed messages.
+        """
+        repo_outbox = OutboxRepository(session)
+        messages = await repo_outbox.claim_messages(
+            settings.OUTBOX_BATCH_SIZE,
+            datetime.timedelta(seconds=settings.OUTBOX_LEASE),
+        )
+
+        messages_by_kind: dict[str, list[OutboxMessage]] = {}
+        for message in messages:
+            messages_by_kind.setdefault(message.kind, []).append(message)
+
+        for kind, kind_messages in messages_by_kind.items():
+            ids = [message.id for message in kind_messages]
+            try:
+                handler = self._get_handler(kind)
+                await handler([message.payload for message in kind_messages])
+            except Exception as e:
+                logger.warning("Outbox %s delivery failed: %r", kind, e)
+                await self._retry_messages(repo_outbox, kind_messages, repr(e))
+                continue
+            await repo_outbox.update_messages(
+                ids, status=OutboxStatus.DONE, last_error=None
+            )
+
+        return len(messages)
+
+    async def _retry_messages(
+        self, repo_outbox: OutboxRepository, messages: list[OutboxMessage], error: str
+    ) -> None:
+        now = utc_now()
+        for message in messages:
+            if message.attempts >= settings.OUTBOX_MAX_ATTEMPTS:
+                await repo_outbox.update_messages(
+                    [message.id],
+                    should_commit=False,
+                    status=OutboxStatus.FAILED,
+                    last_error=error,
+                )
+            else:
+                await repo_outbox.update_messages(
+                    [message.id],
+                    should_commit=False,
+                    next_attempt_at=now + self._get_backoff(message.attempts),
+                    last_error=error,
+                )
+        await commit_refresh_or_flush(repo_outbox.session, True)
+
+
+# Wakes the workers up as soon as a message is enqueued
+_outbox_event: asyncio.Event | None = None
+
+
+# Session.info key of the sessions with uncommitted outbox messages
+_OUTBOX_PENDING = "outbox_pending"
+
+
+def notify_outbox() -> None:
+    if _outbox_event is not None:
+        _outbox_event.set()
+
+
+def _after_commit(session: Session) -> None:
+    if session.info.pop(_OUTBOX_PENDING, False):
+        notify_outbox()
+
+
+def _after_rollback(session: Session) -> None:
+    session.info.pop(_OUTBOX_PENDING, None)
+
+
+event.listen(Session, "after_commit", _after_commit)
+event.listen(Session, "after_rollback", _after_rollback)
+
+
+class OutboxWorker:
+    """Pool of asyncio tasks draining the outbox with their own sessions."""
+
+    def __init__(
+        self,
+        n_workers: int = settings.OUTBOX_WORKERS,
+        poll_interval: float = settings.OUTBOX_POLL_INTERVAL,
+    ) -> None:
+        self.n_workers = n_workers
+        self.poll_interval = poll_interval
+        self._tasks: list[asyncio.Task[None]] = []
+
+    async def _run(self) -> None:
+        assert _outbox_event is not None
+        while True:
+            try:
+                async with get_session() as session:
+                    n_messages = await OutboxService().process_pending(session)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("Outbox worker failed")
+                n_messages = 0
+            if n_messages:
+                continue
+            try:
+                await asyncio.wait_for(_outbox_event.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+            _outbox_event.clear()
+
+    def start(self) -> None:
+        global _outbox_event
+        _outbox_event = asyncio.Event()
+        self._tasks = [
+            asyncio.create_task(self._run(), name=f"outbox-worker-{i}")
+            for i in range(self.n_workers)
+        ]
+
+    async def stop(self) -> None:
+        global _outbox_event
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        _outbox_event = None
@@ -0,0 +1,61 @@
+import datetime
+from collections.abc import Sequence
+from uuid import UUID
+
+from app.models.player_activity import PlayerActivity
+from app.repository.player_activity_repository import PlayerActivityRepository
+from app.utilities.dependencies import SessionDep
+
+
+class PlayerActivityService:
+    """
+    Last match, matches count and last assignment of each player.
+    The records are meant to be written in the same transaction as the
+    match players changes that cause them, so they are not committed
+    by default.
+    """
+
+    async def get_players_activity(
+        self, session: SessionDep, user_public_ids: Sequence[UUID | None]
+    ) -> dict[UUID, PlayerActivity]:
+        """One lookup for all the players, the ones without activity are missing."""
+        uuids = {uuid for uuid in user_public_ids if uuid is not None}
+        if not uuids:
+            return {}
+        repo_activity = PlayerActivityRepository(session)
+        players_activity = await repo_activity.get_players_activity(list(uuids))
+        return {
+            player_activity.user_public_id: player_activity
+            for player_activity in players_activity
+        }
+
+    async def record_inside(
+        self,
+        session: SessionDep,
+        user_public_ids: list[UUID],
+        should_commit: bool = False,
+    ) -> None:
+        await PlayerActivityRepository(session).add_match(
+            user_public_ids, should_commit
+        )
+
+    async def record_reserved(
+        self,
+        session: SessionDep,
+        user_public_ids: list[UUID],
+        date: datetime.date,
+        should_commit: bool = False,
+    ) -> None:
+        await PlayerActivityRepository(session).set_last_match_date(
+            user_public_ids, date, should_commit
+        )
+
+    async def record_assigned(
+        self,
+        session: SessionDep,
+        user_public_ids: list[UUID],
+        should_commit: bool = False,
+    ) -> None:
+        await PlayerActivityRepository(session).set_last_assigned_at(
+            user_public_ids, should_commit
+        )
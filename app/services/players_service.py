@@ -1,11 +1,20 @@
+from collections.abc import Hashable
 from typing import Any
 from uuid import UUID
 
 from app.core.config import settings
 from app.models.player import Player, PlayerFilters
+from app.utilities.cache import AsyncTTLCache
 
 from .base_service import BaseService
 
+# Candidate players by normalized filters, shared whatever the exclusions
+players_cache: AsyncTTLCache[tuple[Hashable, ...], list[Player]] = AsyncTTLCache(
+    "players_by_filters",
+    maxsize=settings.PLAYERS_CACHE_MAXSIZE,
+    ttl=settings.PLAYERS_CACHE_TTL,
+)
+
 
 class PlayersService(BaseService):
     def __init__(self) -> None:
@@ -24,17 +33,53 @@ class PlayersService(BaseService):
         player_filters: PlayerFilters,
         exclude_uuids: list[UUID] | None = None,
     ) -> list[Player]:
-        "Get players by filters from players service"
-        if exclude_uuids is None:
-            exclude_uuids = []
-        content = await self.get(
-            "/api/v1/players/", params=player_filters.model_dump(exclude_none=True)
+        """
+        Get players by filters from players service.
+        The lookup is cached by the filters alone and the exclusions applied
+        here, so lookups that only differ in their exclusions share it: when
+        that leaves less than n_players, up to n_players are fetched again
+        with room for the excluded ones.
+        """
+        params = player_filters.model_dump(exclude_none=True)
+        players: list[Player] = await self._get_players(params)
+        excluded = set(exclude_uuids or [])
+        if not excluded:
+            return players
+
+        available_players = [
+            player for player in players if player.user_public_id not in excluded
+        ]
+        n_players = player_filters.n_players
+        if (
+            n_players is not None
+            and len(players) >= n_players
+            and len(available_players) < n_players
+        ):
+            params = {**params, "n_players": n_players + len(excluded)}
+            players = await self._get_players(params)
+            available_players = [
+                player for player in players if player.user_public_id not in excluded
+            ][:n_players]
+        return available_players
+
+    async def _get_players(self, params: dict[str, Any]) -> list[Player]:
+        players = await players_cache.get_or_fetch(
+            self._cache_key(params), lambda: self._fetch_players(params)
         )
-        players_data = content["data"]
-        players = []
-        for player_data in players_data:
-            player = Player(**player_data)
-            if player.user_public_id in exclude_uuids:
-                continue
-            players.append(player)
-        return players
+        return list(players)
+
+    async def _fetch_players(self, params: dict[str, Any]) -> list[Player]:
+        content = await self.get("/api/v1/players/", params=params)
+        return [Player(**player_data) for player_data in content["data"]]
+
+    @staticmethod
+    def _cache_key(params: dict[str, Any]) -> tuple[Hashable, ...]:
+        """The filters as sorted (name, value) pairs, lists as sorted tuples."""
+        return tuple(
+            (name, tuple(sorted(value)) if isinstance(value, list) else value)
+            for name, value in sorted(params.items())
+        )
+
+    @staticmethod
+    def invalidate_players() -> None:
+        players_cache.clear()
@@ -2,6 +2,15 @@ import uuid
 
 from app.core.config import settings
 from app.services.base_service import BaseService
+from app.utilities.cache import AsyncTTLCache
+from app.utilities.concurrency import gather_with_concurrency
+
+# Telegram ids by user public id
+telegram_ids_cache: AsyncTTLCache[uuid.UUID, int] = AsyncTTLCache(
+    "user_telegram_ids",
+    maxsize=settings.USER_CACHE_MAXSIZE,
+    ttl=settings.USER_CACHE_TELEGRAM_ID_TTL,
+)
 
 
 class UserService(BaseService):
@@ -17,5 +26,28 @@ class UserService(BaseService):
             self.set_base_headers({"x-api-key": settings.USER_SERVICE_API_KEY})
 
     async def get_telegram_id(self, user_public_id: uuid.UUID) -> int:
+        return await telegram_ids_cache.get_or_fetch(
+            user_public_id, lambda: self._fetch_telegram_id(user_public_id)
+        )
+
+    async def _fetch_telegram_id(self, user_public_id: uuid.UUID) -> int:
         response = await self.get(f"/api/v1/users/{user_public_id}")
         return int(response["telegram_id"])
+
+    async def get_telegram_ids(
+        self, user_public_ids: list[uuid.UUID]
+    ) -> dict[uuid.UUID, int]:
+        """Get the telegram ids of the users, looking them up concurrently."""
+        unique_user_public_ids = list(dict.fromkeys(user_public_ids))
+        telegram_ids = await gather_with_concurrency(
+            settings.USER_SERVICE_CONCURRENCY,
+            *(
+                self.get_telegram_id(user_public_id)
+                for user_public_id in unique_user_public_ids
+            ),
+        )
+        return dict(zip(unique_user_public_ids, telegram_ids, strict=True))
+
+    @staticmethod
+    def invalidate_telegram_id(user_public_id: uuid.UUID) -> None:
+        telegram_ids_cache.invalidate(user_public_id)
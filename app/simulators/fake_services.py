@@ -0,0 +1,272 @@
+"""
+In-process stand-ins for the downstream services: players, business, users,
+bot and payments.
+
+Each fake service is a small FastAPI app with configurable latency and error
+rate. install_fake_services mounts them on the shared httpx clients, so the
+services in app.services reach them through their usual base URLs, without
+network.
+"""
+
+import asyncio
+import datetime
+import random
+import uuid
+from collections.abc import Awaitable, Callable
+from typing import Annotated, Any
+
+import httpx
+from fastapi import FastAPI, Query, Request, Response
+from fastapi.responses import JSONResponse
+
+from app.core.http import mount_http_transport, unmount_http_transports
+from app.models.player import PlayerFilters
+from app.services.bot_service import BotService
+from app.services.business_service import BusinessService
+from app.services.payment_service import PaymentsService
+from app.services.players_service import PlayersService
+from app.services.users_service import UserService
+
+
+class FakeServiceConfig:
+    """
+    latency: seconds added to every response.
+    jitter: up to these many seconds added on top of the latency, at random.
+    error_rate: fraction of the requests answered with a 503.
+    """
+
+    def __init__(
+        self, latency: float = 0.0, jitter: float = 0.0, error_rate: float = 0.0
+    ) -> None:
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+
+
+class FakeWorld:
+    """Deterministic data shared by the fake services."""
+
+    def __init__(
+        self,
+        n_businesses: int = 3,
+        n_courts: int = 4,
+        n_players: int = 500,
+        times: list[int] | None = None,
+        seed: int = 0,
+    ) -> None:
+        self.rng = random.Random(seed)
+        self.times = times if times is not None else list(range(8, 23))
+        self.courts: list[dict[str, Any]] = []
+        self.locations: dict[str, tuple[float, float]] = {}
+        for _ in range(n_businesses):
+            business_public_id = str(uuid.UUID(int=self.rng.getrandbits(128)))
+            self.locations[business_public_id] = (
+                -34.6 + self.rng.uniform(-0.1, 0.1),
+                -58.4 + self.rng.uniform(-0.1, 0.1),
+            )
+            for i in range(n_courts):
+                self.courts.append(
+                    {
+                        "business_public_id": business_public_id,
+                        "court_public_id": str(
+                            uuid.UUID(int=self.rng.getrandbits(128))
+                        ),
+                        "name": f"Court {i}",
+                        "price_per_hour": 10000.0,
+                    }
+                )
+        self.players: list[dict[str, Any]] = [
+            {
+                "user_public_id": str(uuid.UUID(int=self.rng.getrandbits(128))),
+                "latitude": -34.6 + self.rng.uniform(-0.2, 0.2),
+                "longitude": -58.4 + self.rng.uniform(-0.2, 0.2),
+                "time_availability": self.rng.choice(
+                    [
+                        PlayerFilters.MORNING,
+                        PlayerFilters.AFTERNOON,
+                        PlayerFilters.EVENING,
+                    ]
+                ),
+            }
+            for _ in range(n_players)
+        ]
+        self.telegram_ids = {
+            player["user_public_id"]: i for i, player in enumerate(self.players)
+        }
+        self.messages_sent = 0
+        self.payments_created = 0
+
+    @property
+    def business_public_ids(self) -> list[str]:
+        return list(self.locations)
+
+
+def _add_fault_injection(app: FastAPI, config: FakeServiceConfig) -> None:
+    rng = random.Random()
+
+    @app.middleware("http")
+    async def inject_faults(
+        request: Request, call_next: Callable[[Request], Awaitable[Response]]
+    ) -> Response:
+        delay = config.latency + rng.uniform(0.0, config.jitter)
+        if delay > 0:
+            await asyncio.sleep(delay)
+        if rng.random() < config.error_rate:
+            return JSONResponse({"detail": "Injected error."}, status_code=503)
+        return await call_next(request)
+
+
+def create_players_app(world: FakeWorld, config: FakeServiceConfig) -> FastAPI:
+    app = FastAPI()
+    _add_fault_injection(app, config)
+
+    @app.get("/api/v1/players/")
+    async def get_players(
+        time_availability: int | None = None,
+        user_public_id: str | None = None,
+        n_players: int | None = None,
+        exclude_user_public_ids: Annotated[list[str] | None, Query()] = None,
+    ) -> dict[str, Any]:
+        excluded = set(exclude_user_public_ids or [])
+        players = [
+            player
+            for player in world.players
+            if (
+                time_availability is None
+                or player["time_availability"] == time_availability
+            )
+            and player["user_public_id"] != user_public_id
+            and player["user_public_id"] not in excluded
+        ]
+        if n_players is not None:
+            players = players[:n_players]
+        return {"data": players, "count": len(players)}
+
+    return app
+
+
+def create_business_app(world: FakeWorld, config: FakeServiceConfig) -> FastAPI:
+    app = FastAPI()
+    _add_fault_injection(app, config)
+
+    @app.get("/api/v1/padel-courts/")
+    async def get_courts() -> dict[str, Any]:
+        return {"data": world.courts, "count": len(world.courts)}
+
+    @app.get(
+        "/api/v1/businesses/{business_public_id}/padel-courts/{court_name}/available-matches/"
+    )
+    async def get_available_matches(
+        business_public_id: str, court_name: str, date: datetime.date
+    ) -> dict[str, Any]:
+        latitude, longitude = world.locations.get(business_public_id, (0.0, 0.0))
+        data = [
+            {
+                "business_public_id": business_public_id,
+                "court_public_id": court["court_public_id"],
+                "court_name": court_name,
+                "latitude": latitude,
+                "longitude": longitude,
+                "date": date.isoformat(),
+                "initial_hour": time,
+                "reserve": False,
+            }
+            for court in world.courts
+            if court["business_public_id"] == business_public_id
+            and court["name"] == court_name
+            for time in world.times
+        ]
+        return {"data": data, "count": len(data)}
+
+    return app
+
+
+def create_users_app(world: FakeWorld, config: FakeServiceConfig) -> FastAPI:
+    app = FastAPI()
+    _add_fault_injection(app, config)
+
+    @app.get("/api/v1/users/{user_public_id}")
+    async def get_user(user_public_id: str) -> dict[str, Any]:
+        telegram_id = world.telegram_ids.get(user_public_id, 0)
+        return {"public_id": user_public_id, "telegram_id": telegram_id}
+
+    return app
+
+
+def create_bot_app(world: FakeWorld, config: FakeServiceConfig) -> FastAPI:
+    app = FastAPI()
+    _add_fault_injection(app, config)
+
+    @app.post("/messages")
+    async def send_message() -> dict[str, Any]:
+        world.messages_sent += 1
+        return {"status": "sent"}
+
+    @app.post("/messages/bulk")
+    async def send_messages(messages: list[dict[str, Any]]) -> dict[str, Any]:
+        world.messages_sent += len(messages)
+        return {"status": "sent", "count": len(messages)}
+
+    return app
+
+
+def create_payments_app(world: FakeWorld, config: FakeServiceConfig) -> FastAPI:
+    app = FastAPI()
+    _add_fault_injection(app, config)
+
+    @app.post("/api/v1/payments/")
+    async def create_payment(match_extended: dict[str, Any]) -> dict[str, Any]:
+        world.payments_created += 1
+        public_id = str(uuid.uuid4())
+        return {
+            "public_id": public_id,
+            "match_public_id": match_extended["public_id"],
+            "user_public_id": match_extended["match_players"][0]["user_public_id"],
+            "pay_url": f"https://payments.invalid/checkout/{public_id}",
+        }
+
+    return app
+
+
+FAKE_SERVICES: dict[
+    str, tuple[type[Any], Callable[[FakeWorld, FakeServiceConfig], FastAPI]]
+] = {
+    "players": (PlayersService, create_players_app),
+    "business": (BusinessService, create_business_app),
+    "users": (UserService, create_users_app),
+    "bot": (BotService, create_bot_app),
+    "payments": (PaymentsService, create_payments_app),
+}
+
+
+async def install_fake_services(
+    world: FakeWorld,
+    config: FakeServiceConfig | None = None,
+    configs: dict[str, FakeServiceConfig] | None = None,
+) -> dict[str, FastAPI]:
+    """
+    Mount the fake services in place of the real ones.
+    config: used by every service without its own entry in configs.
+    configs: by service name, see FAKE_SERVICES.
+    """
+    if config is None:
+        config = FakeServiceConfig()
+    if configs is None:
+        configs = {}
+    apps = {}
+    base_urls: dict[str, str] = {}
+    for name, (service_class, create_app) in FAKE_SERVICES.items():
+        app = create_app(world, configs.get(name, config))
+        base_url = service_class().base_url
+        if base_url in base_urls:
+            raise ValueError(
+                f"Services '{base_urls[base_url]}' and '{name}' share {base_url}"
+            )
+        base_urls[base_url] = name
+        await mount_http_transport(base_url, httpx.ASGITransport(app=app))
+        apps[name] = app
+    return apps
+
+
+async def uninstall_fake_services() -> None:
+    await unmount_http_transports()
@@ -0,0 +1,209 @@
+"""
+Load test of match generation and match player updates against the fake
+downstream services.
+
+Drives POST /matches/generation/all and the match player PATCH flow
+(ASSIGNED -> INSIDE) at a target rate through the app, in process, on the
+configured DB. Reports latency percentiles and DB queries per endpoint.
+The generated matches are left in the DB, use a scratch DB.
+
+Usage:
+    python -m app.simulators.load_test --rps 20 --duration 30 --latency 0.02
+"""
+
+import argparse
+import asyncio
+import datetime
+import random
+import time
+from collections import deque
+from typing import Any
+
+import httpx
+
+from app.core.config import settings
+from app.core.db import track_queries, untrack_queries
+from app.main import app, lifespan
+from app.models.match_player import ReserveStatus
+from app.simulators.fake_services import (
+    FakeServiceConfig,
+    FakeWorld,
+    install_fake_services,
+    uninstall_fake_services,
+)
+
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, round(q / 100 * len(values)) - 1))
+    return values[index]
+
+
+class EndpointStats:
+    def __init__(self) -> None:
+        self.latencies: list[float] = []
+        self.queries: list[int] = []
+        self.errors = 0
+
+    def add(self, latency: float, queries: int, is_error: bool) -> None:
+        self.latencies.append(latency)
+        self.queries.append(queries)
+        if is_error:
+            self.errors += 1
+
+
+class LoadTest:
+    def __init__(
+        self, client: httpx.AsyncClient, world: FakeWorld, start_date: datetime.date
+    ) -> None:
+        self.client = client
+        self.world = world
+        self.start_date = start_date
+        self.stats: dict[str, EndpointStats] = {}
+        self.n_generations = 0
+        # (match_public_id, user_public_id) of the assigned players to accept
+        self.assigned: deque[tuple[str, str]] = deque()
+
+    async def _request(
+        self, name: str, method: str, url: str, **kwargs: Any
+    ) -> httpx.Response | None:
+        queries, token = track_queries()
+        start = time.perf_counter()
+        response = None
+        try:
+            response = await self.client.request(method, url, **kwargs)
+        except Exception:
+            pass
+        finally:
+            untrack_queries(token)
+        latency = time.perf_counter() - start
+        is_error = response is None or response.status_code >= 400
+        self.stats.setdefault(name, EndpointStats()).add(
+            latency, queries.count, is_error
+        )
+        return response
+
+    async def generate(self) -> None:
+        business_public_ids = self.world.business_public_ids
+        i = self.n_generations
+        self.n_generations += 1
+        # A new day for each round over the businesses, so every call has work
+        date = self.start_date + datetime.timedelta(days=i // len(business_public_ids))
+        response = await self._request(
+            "POST /matches/generation/all",
+            "POST",
+            f"{settings.API_V1_STR}/matches/generation/all",
+            json={
+                "business_public_id": business_public_ids[i % len(business_public_ids)],
+                "date": date.isoformat(),
+            },
+        )
+        if response is None or response.status_code != 201:
+            return
+        for match in response.json()["data"]:
+            for match_player in match["match_players"]:
+                if match_player["reserve"] == ReserveStatus.ASSIGNED:
+                    self.assigned.append(
+                        (match["public_id"], match_player["user_public_id"])
+                    )
+
+    async def accept(self) -> None:
+        if not self.assigned:
+            await self.generate()
+            return
+        match_public_id, user_public_id = self.assigned.popleft()
+        await self._request(
+            "PATCH /matches/{id}/players/{user_id}/",
+            "PATCH",
+            f"{settings.API_V1_STR}/matches/{match_public_id}/players/{user_public_id}/",
+            json={"reserve": ReserveStatus.INSIDE},
+        )
+
+    async def run(self, rps: float, duration: float, patch_ratio: float) -> None:
+        """Open loop: requests start on schedule, whether or not others ended."""
+        rng = random.Random(0)
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        tasks = []
+        for i in range(int(rps * duration)):
+            delay = start + i / rps - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            action = self.accept if rng.random() < patch_ratio else self.generate
+            tasks.append(asyncio.create_task(action()))
+        await asyncio.gather(*tasks)
+
+    def report(self, elapsed: float) -> None:
+        n_requests = sum(len(stats.latencies) for stats in self.stats.values())
+        print(f"{n_requests} requests in {elapsed:.1f}s")
+        header = f"{'endpoint':<40} {'n':>6} {'errors':>6} "
+        header += f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>8}"
+        print(header)
+        for name, stats in self.stats.items():
+            latencies = stats.latencies
+            queries = sum(stats.queries) / len(stats.queries)
+            print(
+                f"{name:<40} {len(latencies):>6} {stats.errors:>6} "
+                f"{percentile(latencies, 50) * 1000:>8.1f} "
+                f"{percentile(latencies, 95) * 1000:>8.1f} "
+                f"{percentile(latencies, 99) * 1000:>8.1f} "
+                f"{queries:>8.1f}"
+            )
+        print(
+            f"fake bot messages: {self.world.messages_sent}, "
+            f"fake payments: {self.world.payments_created}"
+        )
+
+
+async def main(args: argparse.Namespace) -> None:
+    world = FakeWorld(
+        n_businesses=args.businesses, n_courts=args.courts, n_players=args.players
+    )
+    config = FakeServiceConfig(
+        latency=args.latency, jitter=args.jitter, error_rate=args.error_rate
+    )
+    async with lifespan(app):
+        await install_fake_services(world, config)
+        try:
+            async with httpx.AsyncClient(
+                transport=httpx.ASGITransport(app=app),
+                base_url="http://load-test",
+                headers={"x-api-key": settings.API_KEY},
+                timeout=None,
+            ) as client:
+                start_date = args.start_date or datetime.date(
+                    2100, 1, 1
+                ) + datetime.timedelta(days=random.randrange(36500))
+                load_test = LoadTest(client, world, start_date)
+                start = time.perf_counter()
+                await load_test.run(args.rps, args.duration, args.patch_ratio)
+                load_test.report(time.perf_counter() - start)
+        finally:
+            await uninstall_fake_services()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rps", type=float, default=10.0)
+    parser.add_argument("--duration", type=float, default=30.0)
+    parser.add_argument(
+        "--patch-ratio",
+        type=float,
+        default=0.5,
+        help="Fraction of the requests that accept an assigned match player.",
+    )
+    parser.add_argument("--latency", type=float, default=0.02)
+    parser.add_argument("--jitter", type=float, default=0.01)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--businesses", type=int, default=3)
+    parser.add_argument("--courts", type=int, default=4)
+    parser.add_argument("--players", type=int, default=500)
+    parser.add_argument(
+        "--start-date",
+        type=datetime.date.fromisoformat,
+        default=None,
+        help="First day of the generated matches (default: a random future day).",
+    )
+    asyncio.run(main(parser.parse_args()))
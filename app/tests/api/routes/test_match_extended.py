@@ -149,3 +149,16 @@ async def test_get_player_matches_returns_all_matches_associated_to_multiple_pla
             assert player_data["user_public_id"] in list_users
             assert player_data["match_public_id"] in match_public_ids
             assert player_data["reserve"] == ReserveStatus.PROVISIONAL
+
+
+async def test_get_player_matches_without_matches_returns_empty_list(
+    async_client: AsyncClient, x_api_key_header: dict[str, str]
+) -> None:
+    response = await async_client.get(
+        f"{test_settings.API_V1_STR}/players/{uuid.uuid4()}/matches/",
+        headers=x_api_key_header,
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["count"] == 0
+    assert content["data"] == []
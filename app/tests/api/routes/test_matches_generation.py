@@ -2,17 +2,22 @@ import copy
 import uuid
 from typing import Any
 
+import pytest
 from httpx import AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import test_settings
 from app.models.match_player import ReserveStatus
 from app.models.player import PlayerFilters
 from app.services.business_service import BusinessService
+from app.services.outbox_service import OutboxService
 from app.tests.utils.utils import (
+    get_band_players,
     get_mock_get_available_times,
     initial_apply_mocks_for_generate_matches,
     set_mock_send_messages,
 )
+from app.utilities.similarity import MAX_DISTANCE_KM, haversine_km
 
 
 async def test_generate_matches_given_one_avail_time(
@@ -128,6 +133,7 @@ async def test_generate_matches_given_three_avail_time(
     matches = matches_list["data"]
     assert len(matches) == 3
 
+    match_assigned_user_public_ids = []
     for match_extended in matches:
         for k in ["court_public_id", "court_name"]:
             assert match_extended[k] in test_data[f"{k}s"]  # type: ignore
@@ -135,11 +141,10 @@ async def test_generate_matches_given_three_avail_time(
         assert match_extended["date"] == test_data["date"]
         time = match_extended["time"]
         time_avail = PlayerFilters.to_time_availability(time)
-        assigned_player = assigned_players[time_avail]["assigned"]
-        similar_players = assigned_players[time_avail]["similar"]
-        similar_players_user_public_ids = [
-            str(player.user_public_id) for player in similar_players
-        ]
+        band_players_user_public_ids = {
+            str(player.user_public_id)
+            for player in get_band_players(assigned_players, time_avail)
+        }
 
         match_players = match_extended["match_players"]
         match_assigned_players = [
@@ -150,19 +155,21 @@ async def test_generate_matches_given_three_avail_time(
         assert len(match_assigned_players) == 1
 
         match_assigned_player = match_assigned_players[0]
-        assert match_assigned_player["user_public_id"] == str(
-            assigned_player.user_public_id
-        )
+        assert match_assigned_player["user_public_id"] in band_players_user_public_ids
+        match_assigned_user_public_ids.append(match_assigned_player["user_public_id"])
 
         match_similar_players_user_public_ids = [
             player["user_public_id"]
             for player in match_players
             if player["reserve"] == ReserveStatus.SIMILAR
         ]
-        assert set(match_similar_players_user_public_ids) == set(
-            similar_players_user_public_ids
+        assert set(match_similar_players_user_public_ids) == (
+            band_players_user_public_ids - {match_assigned_player["user_public_id"]}
         )
 
+    # The times are in the same band: a different player is assigned to each
+    assert len(set(match_assigned_user_public_ids)) == len(times)
+
 
 async def test_generate_matches_twice_for_the_same_day_and_same_times(
     async_client: AsyncClient, x_api_key_header: dict[str, str], monkeypatch: Any
@@ -269,6 +276,7 @@ async def test_generate_matches_twice_for_the_same_day_and_new_times(
     new_matches_list = response_for_new_generate.json()
     new_matches = new_matches_list["data"]
     assert len(new_matches) == 4
+    match_assigned_user_public_ids = []
     for match_extended in new_matches:
         for k in ["court_public_id", "court_name"]:
             assert match_extended[k] in test_data[f"{k}s"]  # type: ignore
@@ -277,11 +285,10 @@ async def test_generate_matches_twice_for_the_same_day_and_new_times(
         assert match_extended["time"] in diff_times
         time = match_extended["time"]
         time_avail = PlayerFilters.to_time_availability(time)
-        assigned_player = assigned_players[time_avail]["assigned"]
-        similar_players = assigned_players[time_avail]["similar"]
-        similar_players_user_public_ids = [
-            str(player.user_public_id) for player in similar_players
-        ]
+        band_players_user_public_ids = {
+            str(player.user_public_id)
+            for player in get_band_players(assigned_players, time_avail)
+        }
 
         match_players = match_extended["match_players"]
         match_assigned_players = [
@@ -292,8 +299,9 @@ async def test_generate_matches_twice_for_the_same_day_and_new_times(
         assert len(match_assigned_players) == 1
 
         match_assigned_player = match_assigned_players[0]
-        assert match_assigned_player["user_public_id"] == str(
-            assigned_player.user_public_id
+        assert match_assigned_player["user_public_id"] in band_players_user_public_ids
+        match_assigned_user_public_ids.append(
+            (time_avail, match_assigned_player["user_public_id"])
         )
 
         match_similar_players_user_public_ids = [
@@ -301,10 +309,15 @@ async def test_generate_matches_twice_for_the_same_day_and_new_times(
             for player in match_players
             if player["reserve"] == ReserveStatus.SIMILAR
         ]
-        assert set(match_similar_players_user_public_ids) == set(
-            similar_players_user_public_ids
+        assert set(match_similar_players_user_public_ids) == (
+            band_players_user_public_ids - {match_assigned_player["user_public_id"]}
         )
 
+    # No player is assigned twice in a time band
+    assert len(set(match_assigned_user_public_ids)) == len(
+        match_assigned_user_public_ids
+    )
+
 
 async def test_generate_matches_for_the_same_with_new_times_twice(
     async_client: AsyncClient, x_api_key_header: dict[str, str], monkeypatch: Any
@@ -556,7 +569,7 @@ async def test_generate_matches_multiple_for_the_same_day_inverse_time(
         )
 
 
-async def test_generate_matches_creates_match_players_with_distance_equal_to_arriving_order(
+async def test_generate_matches_creates_match_players_with_their_distance_to_the_match(
     async_client: AsyncClient, x_api_key_header: dict[str, str], monkeypatch: Any
 ) -> None:
     # Test ctes
@@ -576,6 +589,12 @@ async def test_generate_matches_creates_match_players_with_distance_equal_to_arr
     assigned_players = initial_apply_mocks_for_generate_matches(
         monkeypatch, **test_data
     )
+    # The assigned player at the court, the similar ones further east each,
+    # and the last one without a location
+    time_avail = PlayerFilters.to_time_availability(times[0])
+    band_players = get_band_players(assigned_players, time_avail)
+    for i, player in enumerate(band_players[:-1]):
+        player.latitude, player.longitude = 0.0, 0.01 * i
 
     # Main request
     data = {k: v for k, v in test_data.items() if k in ["business_public_id", "date"]}
@@ -630,9 +649,22 @@ async def test_generate_matches_creates_match_players_with_distance_equal_to_arr
     ]
     assert match_similar_players_uuids == similar_players_uuids
 
+    distances = {
+        player["user_public_id"]: player["distance"] for player in match_players
+    }
+    assert distances[str(assigned_player.user_public_id)] == 0.0
+    for player in band_players[1:-1]:
+        assert distances[str(player.user_public_id)] == pytest.approx(
+            haversine_km(0.0, 0.0, 0.0, player.longitude)  # type: ignore
+        )
+    assert distances[str(band_players[-1].user_public_id)] == MAX_DISTANCE_KM
+
 
 async def test_generate_matches_and_send_message(
-    async_client: AsyncClient, x_api_key_header: dict[str, str], monkeypatch: Any
+    async_client: AsyncClient,
+    session: AsyncSession,
+    x_api_key_header: dict[str, str],
+    monkeypatch: Any,
 ) -> None:
     times = [8, 9, 10]
     test_data = {
@@ -672,6 +704,7 @@ async def test_generate_matches_and_send_message(
     matches = matches_list["data"]
     assert len(matches) == 3
 
+    match_assigned_user_public_ids = []
     for match_extended in matches:
         for k in ["court_public_id", "court_name"]:
             assert match_extended[k] in test_data[f"{k}s"]  # type: ignore
@@ -679,11 +712,10 @@ async def test_generate_matches_and_send_message(
         assert match_extended["date"] == test_data["date"]
         time = match_extended["time"]
         time_avail = PlayerFilters.to_time_availability(time)
-        assigned_player = assigned_players[time_avail]["assigned"]
-        similar_players = assigned_players[time_avail]["similar"]
-        similar_players_user_public_ids = [
-            str(player.user_public_id) for player in similar_players
-        ]
+        band_players_user_public_ids = {
+            str(player.user_public_id)
+            for player in get_band_players(assigned_players, time_avail)
+        }
 
         match_players = match_extended["match_players"]
         match_assigned_players = [
@@ -694,8 +726,9 @@ async def test_generate_matches_and_send_message(
         assert len(match_assigned_players) == 1
 
         match_assigned_player = match_assigned_players[0]
-        assert match_assigned_player["user_public_id"] == str(
-            assigned_player.user_public_id
+        assert match_assigned_player["user_public_id"] in band_players_user_public_ids
+        match_assigned_user_public_ids.append(
+            (time_avail, match_assigned_player["user_public_id"])
         )
 
         match_similar_players_user_public_ids = [
@@ -703,9 +736,15 @@ async def test_generate_matches_and_send_message(
             for player in match_players
             if player["reserve"] == ReserveStatus.SIMILAR
         ]
-        assert set(match_similar_players_user_public_ids) == set(
-            similar_players_user_public_ids
+        assert set(match_similar_players_user_public_ids) == (
+            band_players_user_public_ids - {match_assigned_player["user_public_id"]}
         )
+
+    # No player is assigned twice in a time band
+    assert len(set(match_assigned_user_public_ids)) == len(
+        match_assigned_user_public_ids
+    )
+    await OutboxService().process_pending(session)
     mock_message.assert_called_once()
-    # se llama solo una vez en vez de 3 por que el test repite el mismo user public ID en el assigned
-    mock_id.assert_called_once()
+    # un telegram ID por jugador asignado, distinto en cada horario de la franja
+    assert mock_id.call_count == len(times)
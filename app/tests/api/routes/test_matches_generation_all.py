@@ -7,6 +7,7 @@ from app.core.config import test_settings
 from app.models.match_player import ReserveStatus
 from app.models.player import PlayerFilters
 from app.tests.utils.utils import (
+    get_band_players,
     initial_apply_mocks_for_generate_matches,
 )
 
@@ -48,6 +49,7 @@ async def test_generate_matches_given_business_and_date_creates_for_each_court(
     matches = matches_list["data"]
     assert len(matches) == (n_courts * len(times))
 
+    match_assigned_user_public_ids = []
     for match_extended in matches:
         for k in ["court_public_id", "court_name"]:
             assert match_extended[k] in test_data[f"{k}s"]  # type: ignore
@@ -55,11 +57,10 @@ async def test_generate_matches_given_business_and_date_creates_for_each_court(
         assert match_extended["date"] == test_data["date"]
         time = match_extended["time"]
         time_avail = PlayerFilters.to_time_availability(time)
-        assigned_player = assigned_players[time_avail]["assigned"]
-        similar_players = assigned_players[time_avail]["similar"]
-        similar_players_user_public_ids = [
-            str(player.user_public_id) for player in similar_players
-        ]
+        band_players_user_public_ids = {
+            str(player.user_public_id)
+            for player in get_band_players(assigned_players, time_avail)
+        }
 
         # Should be one ASSIGNED player
         match_players = match_extended["match_players"]
@@ -70,8 +71,9 @@ async def test_generate_matches_given_business_and_date_creates_for_each_court(
         ]
         assert len(match_assigned_players) == 1
         match_assigned_player = match_assigned_players[0]
-        assert match_assigned_player["user_public_id"] == str(
-            assigned_player.user_public_id
+        assert match_assigned_player["user_public_id"] in band_players_user_public_ids
+        match_assigned_user_public_ids.append(
+            (time_avail, match_assigned_player["user_public_id"])
         )
 
         # Should be N SIMILAR players
@@ -80,6 +82,18 @@ async def test_generate_matches_given_business_and_date_creates_for_each_court(
             for player in match_players
             if player["reserve"] == ReserveStatus.SIMILAR
         ]
-        assert set(match_similar_players_user_public_ids) == set(
-            similar_players_user_public_ids
+        assert set(match_similar_players_user_public_ids) == (
+            band_players_user_public_ids - {match_assigned_player["user_public_id"]}
         )
+
+    # 9 slots of one time band and 7 players: each player is assigned, and
+    # the 2 slots left get the priority (mock assigned) player again
+    band_players = get_band_players(assigned_players, PlayerFilters.MORNING)
+    assert {user_public_id for _, user_public_id in match_assigned_user_public_ids} == {
+        str(player.user_public_id) for player in band_players
+    }
+    assert [
+        user_public_id for _, user_public_id in match_assigned_user_public_ids
+    ].count(str(band_players[0].user_public_id)) == 1 + n_courts * len(times) - len(
+        band_players
+    )
@@ -0,0 +1,90 @@
+import json
+import uuid
+
+from httpx import AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import test_settings
+from app.tests.utils.matches import generate_match
+
+
+async def create_matches(session: AsyncSession) -> tuple[str, list[str]]:
+    """Matches of one business, returned in date, time and id order."""
+    business_public_id = str(uuid.uuid4())
+    slots = [
+        ("2024-11-26", 8),
+        ("2024-11-25", 9),
+        ("2024-11-25", 8),
+        ("2024-11-26", None),
+        ("2024-11-25", 8),
+    ]
+    matches = []
+    for i, (date, time) in enumerate(slots):
+        match = await generate_match(
+            session,
+            {
+                "business_public_id": business_public_id,
+                "court_name": str(i),
+                "date": date,
+                "time": time,
+            },
+        )
+        matches.append(match)
+    matches.sort(key=lambda x: (x["date"], x["time"] or 24, x["id"]))
+    return business_public_id, [match["public_id"] for match in matches]
+
+
+async def test_get_matches_by_pages_follows_the_cursor(
+    async_client: AsyncClient, x_api_key_header: dict[str, str], session: AsyncSession
+) -> None:
+    business_public_id, public_ids = await create_matches(session)
+
+    pages = []
+    params: dict[str, str | int] = {
+        "business_public_id": business_public_id,
+        "limit": 2,
+    }
+    while True:
+        response = await async_client.get(
+            f"{test_settings.API_V1_STR}/matches/",
+            headers=x_api_key_header,
+            params=params,
+        )
+        assert response.status_code == 200
+        content = response.json()
+        pages.append([match["public_id"] for match in content["data"]])
+        assert content["count"] == len(content["data"])
+        if content["next_cursor"] is None:
+            break
+        params["cursor"] = content["next_cursor"]
+
+    assert pages == [public_ids[0:2], public_ids[2:4], public_ids[4:]]
+
+
+async def test_get_matches_invalid_cursor(
+    async_client: AsyncClient, x_api_key_header: dict[str, str]
+) -> None:
+    response = await async_client.get(
+        f"{test_settings.API_V1_STR}/matches/",
+        headers=x_api_key_header,
+        params={"cursor": "not-a-cursor"},
+    )
+    assert response.status_code == 400
+    assert response.json()["detail"] == "Invalid cursor."
+
+
+async def test_get_matches_stream_ndjson(
+    async_client: AsyncClient, x_api_key_header: dict[str, str], session: AsyncSession
+) -> None:
+    business_public_id, public_ids = await create_matches(session)
+
+    response = await async_client.get(
+        f"{test_settings.API_V1_STR}/matches/",
+        headers=x_api_key_header,
+        params={"business_public_id": business_public_id, "stream": True},
+    )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = response.text.splitlines()
+    assert [json.loads(line)["public_id"] for line in lines] == public_ids
@@ -8,7 +8,7 @@ from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import test_settings
 from app.models.available_time import AvailableTime
-from app.models.match import MatchCreate
+from app.models.match import MatchCreate, MatchStatus
 from app.models.match_extended import MatchExtended
 from app.models.match_player import MatchPlayerCreate, ReserveStatus
 from app.models.payment import Payment
@@ -16,7 +16,9 @@ from app.models.player import Player, PlayerFilters
 from app.services.business_service import BusinessService
 from app.services.match_player_service import MatchPlayerService
 from app.services.match_service import MatchService
+from app.services.outbox_service import OutboxService
 from app.services.payment_service import PaymentsService
+from app.services.player_activity_service import PlayerActivityService
 from app.services.players_service import PlayersService
 from app.tests.utils.utils import set_mock_send_messages
 
@@ -111,6 +113,41 @@ async def test_add_many_players_to_match(
     all(match_player in data for match_player in content)
 
 
+async def test_add_many_players_to_match_with_repeated_player_raises_exception(
+    async_client: AsyncClient, session: AsyncSession, x_api_key_header: dict[str, str]
+) -> None:
+    # Create match
+    match = await MatchService().create_match(
+        session,
+        MatchCreate(
+            business_public_id=uuid.uuid4(),
+            court_public_id=uuid.uuid4(),
+            court_name="0",
+            date="2024-11-25",
+            time=8,
+        ),
+    )
+
+    match_public_id = match.public_id
+
+    # Add players to match
+    user_public_id = str(uuid.uuid4())
+    data = [{"user_public_id": user_public_id, "distance": 0.0} for _ in range(2)]
+    response = await async_client.post(
+        f"{test_settings.API_V1_STR}/matches/{match_public_id}/players/bulk/",
+        headers=x_api_key_header,
+        json=data,
+    )
+    assert response.status_code == 409
+    content = response.json()
+    assert content["detail"] == "MatchPlayer already exists."
+
+    match_players = await MatchPlayerService().get_match_players(
+        session, match_public_id=match_public_id
+    )
+    assert len(match_players) == 0
+
+
 async def test_get_one_match_player(
     async_client: AsyncClient, session: AsyncSession, x_api_key_header: dict[str, str]
 ) -> None:
@@ -266,6 +303,90 @@ async def test_update_one_player_raises_exception_when_match_player_not_exists(
     assert content["detail"] == "MatchPlayer not found."
 
 
+async def test_update_match_players_reserve_bulk(
+    async_client: AsyncClient, session: AsyncSession, x_api_key_header: dict[str, str]
+) -> None:
+    match = await MatchService().create_match(
+        session,
+        MatchCreate(court_name="0", date="2024-11-25", time=8),
+    )
+    match_public_id = match.public_id
+    user_public_ids = [uuid.uuid4() for _ in range(3)]
+    await MatchPlayerService().create_match_players(
+        session,
+        [
+            MatchPlayerCreate(
+                match_public_id=match_public_id,
+                user_public_id=user_public_id,
+                distance=float(i),
+                reserve=ReserveStatus.SIMILAR,
+            )
+            for i, user_public_id in enumerate(user_public_ids)
+        ],
+    )
+
+    response = await async_client.patch(
+        f"{test_settings.API_V1_STR}/matches/{match_public_id}/players/bulk/",
+        headers=x_api_key_header,
+        json={
+            "user_public_ids": [str(x) for x in user_public_ids[:2]],
+            "reserve": ReserveStatus.ASSIGNED,
+        },
+    )
+
+    assert response.status_code == 200
+    content = response.json()
+    assert content["count"] == 2
+    assert [player["user_public_id"] for player in content["data"]] == [
+        str(x) for x in user_public_ids[:2]
+    ]
+    reserve = await MatchPlayerService().get_match_players_reserve(
+        session, match_public_id
+    )
+    assert [x.user_public_id for x in reserve.get_players(ReserveStatus.ASSIGNED)] == (
+        user_public_ids[:2]
+    )
+    assert [x.user_public_id for x in reserve.get_players(ReserveStatus.SIMILAR)] == (
+        user_public_ids[2:]
+    )
+
+
+async def test_update_match_players_reserve_bulk_with_unknown_player_updates_none(
+    async_client: AsyncClient, session: AsyncSession, x_api_key_header: dict[str, str]
+) -> None:
+    match = await MatchService().create_match(
+        session,
+        MatchCreate(court_name="0", date="2024-11-25", time=8),
+    )
+    match_public_id = match.public_id
+    user_public_id = uuid.uuid4()
+    await MatchPlayerService().create_match_player(
+        session,
+        MatchPlayerCreate(
+            match_public_id=match_public_id,
+            user_public_id=user_public_id,
+            distance=0.0,
+            reserve=ReserveStatus.SIMILAR,
+        ),
+    )
+
+    response = await async_client.patch(
+        f"{test_settings.API_V1_STR}/matches/{match_public_id}/players/bulk/",
+        headers=x_api_key_header,
+        json={
+            "user_public_ids": [str(user_public_id), str(uuid.uuid4())],
+            "reserve": ReserveStatus.ASSIGNED,
+        },
+    )
+
+    assert response.status_code == 404
+    assert response.json()["detail"] == "MatchPlayer not found."
+    match_player = await MatchPlayerService().get_match_player(
+        session, match_public_id, user_public_id
+    )
+    assert match_player.reserve == ReserveStatus.SIMILAR
+
+
 async def test_one_player_reserve_to_inside(
     async_client: AsyncClient,
     session: AsyncSession,
@@ -329,6 +450,77 @@ async def test_one_player_reserve_to_inside(
     assert content["pay_url"] == pay_url
 
 
+async def test_last_player_reserve_to_inside_records_the_players_activity(
+    async_client: AsyncClient,
+    session: AsyncSession,
+    x_api_key_header: dict[str, str],
+    monkeypatch: Any,
+) -> None:
+    # PRE
+    match = await MatchService().create_match(
+        session,
+        MatchCreate(
+            business_public_id=uuid.uuid4(),
+            court_public_id=uuid.uuid4(),
+            court_name="0",
+            date="2024-11-25",
+            time=8,
+        ),
+    )
+    inside_uuid = uuid.uuid4()
+    assigned_uuid = uuid.uuid4()
+
+    async def mock_create_payment(
+        _self: Any, _match_extended: MatchExtended
+    ) -> Payment:
+        return Payment(
+            public_id=uuid.uuid4(),
+            match_public_id=uuid.uuid4(),
+            user_public_id=assigned_uuid,
+            pay_url="https://www.mercadopago.com/mla/checkout/start?pref_id=123456",
+        )
+
+    monkeypatch.setattr(PaymentsService, "create_payment", mock_create_payment)
+
+    _mock_telegram_id, _mock_messages = set_mock_send_messages(monkeypatch)
+
+    for user_public_id, reserve in [
+        (inside_uuid, ReserveStatus.INSIDE),
+        (assigned_uuid, ReserveStatus.ASSIGNED),
+    ]:
+        await MatchPlayerService().create_match_player(
+            session,
+            MatchPlayerCreate(
+                match_public_id=match.public_id,
+                user_public_id=user_public_id,
+                distance=0.0,
+                reserve=reserve,
+            ),
+        )
+
+    # Action
+    # Update player ASSIGNED -> INSIDE, the match is full
+    response = await async_client.patch(
+        f"{test_settings.API_V1_STR}/matches/{match.public_id}/players/{assigned_uuid}/",
+        headers=x_api_key_header,
+        json={"reserve": ReserveStatus.INSIDE},
+    )
+
+    # POST
+    assert response.status_code == 200
+    match = await MatchService().get_match(session, match.public_id)
+    assert match.status == MatchStatus.reserved
+
+    players_activity = await PlayerActivityService().get_players_activity(
+        session, [inside_uuid, assigned_uuid]
+    )
+    assert players_activity[assigned_uuid].n_matches == 1
+    # Went inside before the activity was recorded
+    assert players_activity[inside_uuid].n_matches == 0
+    for user_public_id in [inside_uuid, assigned_uuid]:
+        assert players_activity[user_public_id].last_match_date == date(2024, 11, 25)
+
+
 async def test_one_player_reserve_to_accept_not_assigned_is_rejected(
     async_client: AsyncClient, session: AsyncSession, x_api_key_header: dict[str, str]
 ) -> None:
@@ -474,6 +666,7 @@ async def test_only_one_player_inside_then_only_one_similar_is_assigned(
         session, match.public_id, similar_uuid
     )
     assert similar_player.reserve == ReserveStatus.ASSIGNED
+    await OutboxService().process_pending(session)
     mock_messages.assert_called_once()
     mock_telegram_id.assert_called_once()
 
@@ -551,6 +744,7 @@ async def test_only_one_player_inside_then_only_three_similar_are_assigned(
         )
         assert similar_player.reserve == ReserveStatus.ASSIGNED
 
+    await OutboxService().process_pending(session)
     mock_messages.assert_called_once()
     assert mock_telegram_id.call_count == 1
 
@@ -0,0 +1,44 @@
+from httpx import AsyncClient
+
+from app.core.config import test_settings
+from app.core.metrics import http_client_metrics
+
+
+async def test_get_db_pool_status(
+    async_client: AsyncClient, x_api_key_header: dict[str, str]
+) -> None:
+    response = await async_client.get(
+        f"{test_settings.API_V1_STR}/monitoring/db-pool",
+        headers=x_api_key_header,
+    )
+    assert response.status_code == 200
+    content = response.json()
+    assert content["size"] == test_settings.POSTGRES_POOL_SIZE
+    assert content["checked_out"] >= 0
+    assert content["checkouts"] >= 0
+    assert content["wait_time_max"] >= content["wait_time_avg"] >= 0.0
+
+
+async def test_get_metrics(
+    async_client: AsyncClient, x_api_key_header: dict[str, str]
+) -> None:
+    http_client_metrics.reset()
+    with http_client_metrics.track("PlayersService", "GET") as tracker:
+        tracker.status = "200"
+
+    response = await async_client.get(
+        f"{test_settings.API_V1_STR}/monitoring/metrics",
+        headers=x_api_key_header,
+    )
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    lines = response.text.splitlines()
+    assert "# TYPE downstream_request_duration_seconds histogram" in lines
+    assert (
+        'downstream_request_duration_seconds_bucket{service="PlayersService",'
+        'method="GET",le="+Inf"} 1'
+    ) in lines
+    assert (
+        'downstream_requests_total{service="PlayersService",method="GET",status="200"} 1'
+    ) in lines
+    assert 'downstream_requests_in_flight{service="PlayersService"} 0' in lines
@@ -0,0 +1,76 @@
+import asyncio
+import os
+import uuid
+from collections.abc import AsyncGenerator, Awaitable, Callable
+from typing import Any
+
+import pytest
+import pytest_asyncio
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.match import Match
+from app.seeds.seed_synthetic import seed_matches
+from app.services.business_service import BusinessService
+from app.services.players_service import PlayersService
+from app.simulators.fake_services import (
+    FakeWorld,
+    install_fake_services,
+    uninstall_fake_services,
+)
+
+# Number of matches and of players (users) seeded, e.g. BENCHMARK_SIZES=10,1000
+BENCHMARK_SIZES = [
+    int(size) for size in os.environ.get("BENCHMARK_SIZES", "10,1000,100000").split(",")
+]
+# Match players seeded for each match
+N_MATCH_PLAYERS = 5
+ROUNDS = int(os.environ.get("BENCHMARK_ROUNDS", "5"))
+
+
+@pytest.fixture(params=BENCHMARK_SIZES, ids=lambda size: f"size={size}")
+def size(request: Any) -> int:
+    return int(request.param)
+
+
+@pytest_asyncio.fixture
+async def seeded(session: AsyncSession, size: int) -> list[uuid.UUID]:
+    """Seed size matches, over size users, and get their public_ids."""
+    conn = await session.connection()
+    await seed_matches(conn, size, N_MATCH_PLAYERS, n_users=size)
+    await session.commit()
+    result = await session.exec(select(Match.public_id))
+    return list(result.all())
+
+
+@pytest_asyncio.fixture(name="world")
+async def fake_world(size: int) -> AsyncGenerator[FakeWorld, None]:
+    """Downstream services answering with size players."""
+    world = FakeWorld(n_businesses=1, n_courts=4, n_players=size)
+    BusinessService.invalidate_courts()
+    BusinessService.invalidate_available_times()
+    PlayersService.invalidate_players()
+    await install_fake_services(world)
+    yield world
+    await uninstall_fake_services()
+    BusinessService.invalidate_courts()
+    BusinessService.invalidate_available_times()
+    PlayersService.invalidate_players()
+
+
+@pytest.fixture
+def run(benchmark: Any) -> Callable[[Callable[[], Awaitable[Any]]], Any]:
+    """
+    Benchmark an async target on the loop of the async fixtures.
+    The target is called once per round and must leave the DB as it found it.
+    """
+
+    def _run(target: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_event_loop()
+        return benchmark.pedantic(
+            lambda: loop.run_until_complete(target()),
+            rounds=ROUNDS,
+            warmup_rounds=1,
+        )
+
+    return _run
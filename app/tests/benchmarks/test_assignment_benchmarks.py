@@ -0,0 +1,16 @@
+from typing import Any
+
+from app.tests.utilities.test_assignment import get_costs
+from app.utilities import assignment
+
+# The slots of a business-day and the candidates of a time band
+N_SLOTS = 200
+N_CANDIDATES = 2_000
+
+
+def test_solve_assignment(benchmark: Any) -> None:
+    costs = get_costs(N_SLOTS, N_CANDIDATES, seed=0)
+
+    columns = benchmark(assignment.solve_assignment, costs)
+
+    assert len(set(columns)) == N_SLOTS
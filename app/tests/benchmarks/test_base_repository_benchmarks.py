@@ -0,0 +1,59 @@
+import datetime
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.match import Match, MatchCreate
+from app.models.match_player import MatchPlayer
+from app.repository.base_repository import BaseRepository
+
+
+def test_get_records(
+    run: Callable[..., Any], session: AsyncSession, seeded: list[uuid.UUID]
+) -> None:
+    async def target() -> list[Match]:
+        return await BaseRepository(session).get_records(Match, public_id=seeded)
+
+    matches = run(target)
+
+    assert len(matches) == len(seeded)
+
+
+def test_create_records(
+    run: Callable[..., Any], session: AsyncSession, size: int
+) -> None:
+    matches_create = [
+        MatchCreate(
+            business_public_id=uuid.uuid4(),
+            court_public_id=uuid.uuid4(),
+            court_name="1",
+            time=8,
+            date=datetime.date(2100, 1, 1),
+        )
+        for _ in range(size)
+    ]
+
+    async def target() -> list[Match]:
+        matches = await BaseRepository(session).create_records(
+            Match, matches_create, should_commit=False
+        )
+        await session.rollback()
+        return matches
+
+    matches = run(target)
+
+    assert len(matches) == size
+
+
+def test_delete_records(
+    run: Callable[..., Any], session: AsyncSession, seeded: list[uuid.UUID]
+) -> None:
+    async def target() -> None:
+        await BaseRepository(session).delete_records(
+            MatchPlayer, should_commit=False, match_public_id=seeded
+        )
+        await session.rollback()
+
+    run(target)
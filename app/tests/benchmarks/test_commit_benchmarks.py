@@ -0,0 +1,198 @@
+import asyncio
+import datetime
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from httpx import AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import test_settings
+from app.core.db import get_async_engine, track_queries, untrack_queries
+from app.models.match import Match, MatchCreate
+from app.models.match_player import MatchPlayer
+from app.repository.base_repository import BaseRepository
+from app.services.match_service import MatchService
+from app.tests.benchmarks.conftest import ROUNDS
+from app.utilities.commit import commit_refresh_or_flush
+
+# Records of each bulk request, at most
+MAX_BULK_SIZE = 1000
+STRATEGIES = ["refresh", "returning"]
+
+
+async def create_records_refreshed(
+    self: BaseRepository,
+    model: type[Any],
+    records_create: list[Any],
+    should_commit: bool = True,
+) -> list[Any]:
+    """The records added to the session, and refreshed one by one after commit."""
+    records = [model.model_validate(record) for record in records_create]
+    self.session.add_all(records)
+    if not should_commit:
+        await self.session.flush()
+        return records
+    await self.session.commit()
+    for record in records:
+        await self.session.refresh(record)
+    return records
+
+
+@pytest.fixture(params=STRATEGIES)
+def strategy(request: Any, monkeypatch: pytest.MonkeyPatch) -> str:
+    if request.param == "refresh":
+        monkeypatch.setattr(BaseRepository, "create_records", create_records_refreshed)
+    return str(request.param)
+
+
+async def post_counting_queries(
+    async_client: AsyncClient, url: str, headers: dict[str, str], json: Any
+) -> tuple[list[dict[str, Any]], int]:
+    stats, token = track_queries()
+    try:
+        response = await async_client.post(url, headers=headers, json=json)
+    finally:
+        untrack_queries(token)
+    assert response.status_code == 201
+    return response.json(), stats.count
+
+
+def test_create_matches_bulk(
+    run: Callable[..., Any],
+    benchmark: Any,
+    async_client: AsyncClient,
+    x_api_key_header: dict[str, str],
+    session: AsyncSession,
+    size: int,
+    strategy: str,  # noqa: ARG001
+) -> None:
+    n_matches = min(size, MAX_BULK_SIZE)
+    court_public_id = str(uuid.uuid4())
+    matches_in = [
+        {
+            "court_public_id": court_public_id,
+            "court_name": "1",
+            "date": str(datetime.date(2100, 1, 1) + datetime.timedelta(days=i)),
+            "time": 8,
+        }
+        for i in range(n_matches)
+    ]
+    queries = []
+
+    async def target() -> list[dict[str, Any]]:
+        matches, n_queries = await post_counting_queries(
+            async_client,
+            f"{test_settings.API_V1_STR}/matches/bulk",
+            x_api_key_header,
+            matches_in,
+        )
+        queries.append(n_queries)
+        await BaseRepository(session).delete_records(
+            Match, public_id=[uuid.UUID(match["public_id"]) for match in matches]
+        )
+        return matches
+
+    matches = run(target)
+
+    benchmark.extra_info["db_queries"] = queries[-1]
+    assert len(matches) == n_matches
+
+
+def test_create_match_players_bulk(
+    run: Callable[..., Any],
+    benchmark: Any,
+    async_client: AsyncClient,
+    x_api_key_header: dict[str, str],
+    session: AsyncSession,
+    size: int,
+    strategy: str,  # noqa: ARG001
+) -> None:
+    n_players = min(size, MAX_BULK_SIZE)
+    match_in = MatchCreate(court_name="1", date=datetime.date(2100, 1, 1), time=8)
+    queries = []
+
+    async def target() -> list[dict[str, Any]]:
+        match = await MatchService().create_match(session, match_in)
+        players_in = [
+            {"user_public_id": str(uuid.uuid4()), "distance": float(i)}
+            for i in range(n_players)
+        ]
+        match_players, n_queries = await post_counting_queries(
+            async_client,
+            f"{test_settings.API_V1_STR}/matches/{match.public_id}/players/bulk/",
+            x_api_key_header,
+            players_in,
+        )
+        queries.append(n_queries)
+        await BaseRepository(session).delete_records(
+            MatchPlayer, match_public_id=match.public_id
+        )
+        await BaseRepository(session).delete_records(Match, public_id=match.public_id)
+        return match_players
+
+    match_players = run(target)
+
+    benchmark.extra_info["db_queries"] = queries[-1]
+    assert len(match_players) == n_players
+
+
+@pytest.mark.parametrize("expire_on_commit", [False, True], ids=["complete", "expired"])
+def test_commit_refresh_or_flush(
+    benchmark: Any,
+    session: AsyncSession,  # noqa: ARG001
+    size: int,
+    expire_on_commit: bool,
+) -> None:
+    """
+    The commit of flushed matches, with the refresh of the ones that need
+    it: none of the complete ones, all of the expired ones.
+    The session fixture deletes the matches afterwards.
+    """
+    n_matches = min(size, MAX_BULK_SIZE)
+    loop = asyncio.get_event_loop()
+    engine = get_async_engine(str(test_settings.SQLALCHEMY_DATABASE_URI))
+    commit_session = AsyncSession(engine, expire_on_commit=expire_on_commit)
+    court_public_id = uuid.uuid4()
+    n_rounds = 0
+    queries = []
+
+    async def flush_matches() -> list[Match]:
+        nonlocal n_rounds
+        n_rounds += 1
+        matches = [
+            Match(
+                court_public_id=court_public_id,
+                court_name=str(n_rounds),
+                date=datetime.date(2100, 1, 1) + datetime.timedelta(days=i),
+                time=8,
+            )
+            for i in range(n_matches)
+        ]
+        commit_session.add_all(matches)
+        await commit_session.flush()
+        return matches
+
+    async def commit(matches: list[Match]) -> None:
+        stats, token = track_queries()
+        try:
+            await commit_refresh_or_flush(commit_session, True, records=matches)
+        finally:
+            untrack_queries(token)
+        queries.append(stats.count)
+
+    try:
+        benchmark.pedantic(
+            lambda matches: loop.run_until_complete(commit(matches)),
+            setup=lambda: ((loop.run_until_complete(flush_matches()),), {}),
+            rounds=ROUNDS,
+            warmup_rounds=1,
+        )
+    finally:
+        loop.run_until_complete(commit_session.close())
+        loop.run_until_complete(engine.dispose())
+
+    benchmark.extra_info["db_queries"] = queries[-1]
+    # One SELECT per expired match
+    assert queries[-1] == (n_matches if expire_on_commit else 0)
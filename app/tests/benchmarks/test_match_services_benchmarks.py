@@ -0,0 +1,88 @@
+import datetime
+import itertools
+import uuid
+from collections.abc import Callable
+from typing import Any
+
+import pytest
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.available_time import AvailableTime
+from app.models.match_extended import MatchExtended
+from app.models.match_generation import MatchGenerationCreate
+from app.models.match_player import MatchPlayer
+from app.services.match_extended_service import MatchExtendedService
+from app.services.match_generator_service import MatchGeneratorService
+from app.simulators.fake_services import FakeWorld
+
+
+def test_generate_match_players(
+    run: Callable[..., Any],
+    session: AsyncSession,
+    seeded: list[uuid.UUID],
+    world: FakeWorld,
+) -> None:
+    court = world.courts[0]
+    latitude, longitude = world.locations[court["business_public_id"]]
+    avail_time = AvailableTime(
+        business_public_id=court["business_public_id"],
+        court_public_id=court["court_public_id"],
+        court_name=court["name"],
+        latitude=latitude,
+        longitude=longitude,
+        date=datetime.date(2100, 1, 1),
+        time=8,
+        is_reserved=False,
+    )
+    match_public_id = seeded[0]
+
+    async def target() -> list[MatchPlayer]:
+        # The seeded similar players are deleted, and committed, on the warmup
+        match_players = await MatchGeneratorService().generate_match_players(
+            session, match_public_id, avail_time, should_commit=False
+        )
+        await session.rollback()
+        return match_players
+
+    match_players = run(target)
+
+    assert len(match_players) > 0
+
+
+@pytest.mark.usefixtures("seeded")
+def test_generate_matches_all(
+    run: Callable[..., Any],
+    session: AsyncSession,
+    world: FakeWorld,
+) -> None:
+    # A new day on each round, so every round generates the whole day
+    days = itertools.count()
+
+    async def target() -> list[uuid.UUID]:
+        match_gen_create = MatchGenerationCreate(
+            business_public_id=uuid.UUID(world.business_public_ids[0]),
+            date=datetime.date(2100, 1, 1) + datetime.timedelta(days=next(days)),
+        )
+        return await MatchGeneratorService().generate_matches_all(
+            session, match_gen_create
+        )
+
+    matches_public_ids = run(target)
+
+    assert len(matches_public_ids) == len(world.courts) * len(world.times)
+
+
+@pytest.mark.usefixtures("seeded")
+def test_get_player_matches(
+    run: Callable[..., Any],
+    session: AsyncSession,
+) -> None:
+    # Seeded user 0, in about N_MATCH_PLAYERS matches at every size
+    user_public_id = uuid.UUID(int=0)
+
+    async def target() -> list[MatchExtended]:
+        return await MatchExtendedService().get_player_matches(session, user_public_id)
+
+    matches = run(target)
+
+    assert len(matches) > 0
@@ -0,0 +1,25 @@
+from typing import Any
+
+from app.tests.utilities.test_similarity import get_avail_time, get_players
+from app.utilities import similarity
+
+# Candidates scored for one slot
+N_CANDIDATES = 10_000
+
+
+def test_score_players_python(benchmark: Any) -> None:
+    avail_time = get_avail_time(-34.6, -58.4, 14)
+    players = get_players(N_CANDIDATES)
+
+    scores = benchmark(similarity.score_players_python, avail_time, players)
+
+    assert len(scores) == len(players)
+
+
+def test_score_players_numpy(benchmark: Any) -> None:
+    avail_time = get_avail_time(-34.6, -58.4, 14)
+    players = get_players(N_CANDIDATES)
+
+    scores = benchmark(similarity.score_players_numpy, avail_time, players)
+
+    assert len(scores) == len(players)
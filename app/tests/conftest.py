@@ -15,6 +15,8 @@ from app.main import app
 from app.models.item import Item
 from app.models.match import Match
 from app.models.match_player import MatchPlayer
+from app.models.outbox import OutboxMessage
+from app.models.player_activity import PlayerActivity
 from app.tests.utils.utils import get_x_api_key_header
 from app.utilities.dependencies import get_db
 
@@ -32,6 +34,8 @@ async def db() -> AsyncGenerator[AsyncSession, None]:
             await _session.exec(delete(Item))  # type: ignore[call-overload]
             await _session.exec(delete(Match))  # type: ignore[call-overload]
             await _session.exec(delete(MatchPlayer))  # type: ignore[call-overload]
+            await _session.exec(delete(OutboxMessage))  # type: ignore[call-overload]
+            await _session.exec(delete(PlayerActivity))  # type: ignore[call-overload]
             await _session.commit()
         finally:
             await _session.close()
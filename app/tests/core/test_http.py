@@ -0,0 +1,54 @@
+import threading
+from collections.abc import Iterator
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+import pytest
+
+from app.core import http
+from app.core.config import settings
+
+
+class OkHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+@pytest.fixture(name="base_url")
+def base_url_fixture() -> Iterator[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OkHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        yield f"http://127.0.0.1:{server.server_address[1]}"
+    finally:
+        server.shutdown()
+        server.server_close()
+
+
+async def test_http_client_negotiates_http_1_1_by_default(base_url: str) -> None:
+    async with http.create_http_client(base_url) as client:
+        response = await client.get("/")
+
+    assert response.status_code == 200
+    assert response.http_version == "HTTP/1.1"
+
+
+async def test_http2_without_h2_falls_back_to_http_1_1(
+    base_url: str, monkeypatch: Any, caplog: Any
+) -> None:
+    monkeypatch.setattr(settings, "HTTP_CLIENT_HTTP2", True)
+    monkeypatch.setattr(http, "_is_http2_available", lambda: False)
+
+    async with http.create_http_client(base_url) as client:
+        response = await client.get("/")
+
+    assert response.http_version == "HTTP/1.1"
+    assert "'h2' is not installed" in caplog.text
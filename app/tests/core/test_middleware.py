@@ -0,0 +1,61 @@
+import logging
+import re
+from typing import Any
+
+from httpx import AsyncClient
+from sqlalchemy import text
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings, test_settings
+from app.core.db import track_queries, untrack_queries
+
+
+async def test_server_timing_header_counts_the_queries_of_the_request(
+    async_client: AsyncClient, x_api_key_header: dict[str, str], caplog: Any
+) -> None:
+    caplog.set_level(logging.INFO, logger="app.core.middleware")
+
+    response = await async_client.get(
+        f"{test_settings.API_V1_STR}/matches/", headers=x_api_key_header
+    )
+
+    assert response.status_code == 200
+    server_timing = response.headers["Server-Timing"]
+    match = re.match(
+        r'db;dur=[\d.]+;desc="(\d+) queries", total;dur=[\d.]+$', server_timing
+    )
+    assert match is not None
+    assert int(match.group(1)) >= 1
+    record = next(r for r in caplog.records if r.name == "app.core.middleware")
+    assert record.path == f"{test_settings.API_V1_STR}/matches/"
+    assert record.status == 200
+    assert record.db_queries == int(match.group(1))
+
+
+async def test_nested_query_stats_add_to_the_enclosing_ones(
+    session: AsyncSession,
+) -> None:
+    outer, outer_token = track_queries()
+    await session.exec(text("SELECT 1"))  # type: ignore[call-overload]
+    inner, inner_token = track_queries()
+    await session.exec(text("SELECT 1"))  # type: ignore[call-overload]
+    untrack_queries(inner_token)
+    untrack_queries(outer_token)
+
+    assert inner.count == 1
+    assert outer.count == 2
+    assert outer.time_total >= inner.time_total > 0
+
+
+async def test_slow_queries_are_logged_over_the_threshold(
+    session: AsyncSession, monkeypatch: Any, caplog: Any
+) -> None:
+    caplog.set_level(logging.WARNING, logger="app.core.db")
+    monkeypatch.setattr(settings, "SLOW_QUERY_THRESHOLD", 0.05)
+
+    await session.exec(text("SELECT 1"))  # type: ignore[call-overload]
+    await session.exec(text("SELECT pg_sleep(0.1)"))  # type: ignore[call-overload]
+
+    messages = [r.getMessage() for r in caplog.records if r.name == "app.core.db"]
+    assert len(messages) == 1
+    assert "SELECT pg_sleep(0.1)" in messages[0]
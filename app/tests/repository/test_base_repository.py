@@ -0,0 +1,237 @@
+import uuid
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.exc import IntegrityError, MultipleResultsFound
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.models.match import Match, MatchCreate, MatchStatus, MatchUpdate
+from app.models.match_player import MatchPlayer, MatchPlayerCreate, ReserveStatus
+from app.repository.base_repository import BaseRepository
+from app.repository.match_player_repository import MatchPlayerRepository
+from app.repository.match_repository import MatchRepository
+from app.services.match_service import MatchService
+from app.utilities.exceptions import NotFoundException
+
+
+def test_filter_by_values_sql_does_not_depend_on_the_number_of_values(
+    session: AsyncSession,
+) -> None:
+    repo = MatchPlayerRepository(session)
+    dialect = postgresql.dialect()  # type: ignore[no-untyped-call]
+
+    def to_sql(n_values: int) -> str:
+        values = [uuid.uuid4() for _ in range(n_values)]
+        query = repo._select_records(MatchPlayer, user_public_id=values)
+        return str(query.compile(dialect=dialect))
+
+    assert to_sql(1) == to_sql(100)
+    assert "ANY" in to_sql(1)
+
+
+async def test_delete_records_by_values(session: AsyncSession) -> None:
+    match = await MatchService().create_match(
+        session, MatchCreate(court_name="1", date="2025-04-05", time=8)
+    )
+    match_public_id = match.public_id
+    repo = MatchPlayerRepository(session)
+    user_public_ids = [uuid.uuid4() for _ in range(4)]
+    await repo.create_match_players(
+        [
+            MatchPlayerCreate(
+                match_public_id=match_public_id,
+                user_public_id=user_public_id,
+                distance=0.0,
+                reserve=ReserveStatus.SIMILAR,
+            )
+            for user_public_id in user_public_ids
+        ]
+    )
+
+    await repo.delete_match_players(
+        match_public_id=match_public_id, user_public_id=user_public_ids[:3]
+    )
+    # Empty list matches nothing
+    await repo.delete_match_players(match_public_id=match_public_id, user_public_id=[])
+
+    match_players = await repo.get_matches_players(match_public_id=match_public_id)
+    assert [player.user_public_id for player in match_players] == user_public_ids[3:]
+
+
+async def test_update_record_returns_the_updated_record(session: AsyncSession) -> None:
+    match = await MatchService().create_match(
+        session, MatchCreate(court_name="1", date="2025-04-05", time=8)
+    )
+    repo = MatchRepository(session)
+
+    updated = await repo.update_match(
+        MatchUpdate(status=MatchStatus.reserved), public_id=match.public_id
+    )
+
+    assert updated.status == MatchStatus.reserved
+    assert updated.court_name == "1"
+    match_get = await repo.get_match(public_id=match.public_id)
+    assert match_get.status == MatchStatus.reserved
+
+
+async def test_update_record_not_found(session: AsyncSession) -> None:
+    repo = MatchRepository(session)
+
+    with pytest.raises(NotFoundException):
+        await repo.update_match(
+            MatchUpdate(status=MatchStatus.reserved), public_id=uuid.uuid4()
+        )
+
+
+async def test_update_record_matching_many_records_updates_none(
+    session: AsyncSession,
+) -> None:
+    court_public_id = uuid.uuid4()
+    for time in [8, 9]:
+        await MatchService().create_match(
+            session,
+            MatchCreate(
+                court_public_id=court_public_id,
+                court_name="1",
+                date="2025-04-05",
+                time=time,
+            ),
+        )
+    repo = MatchRepository(session)
+
+    with pytest.raises(MultipleResultsFound):
+        await repo.update_match(
+            MatchUpdate(status=MatchStatus.reserved), court_public_id=court_public_id
+        )
+
+    matches = await repo.get_matches(court_public_id=court_public_id)
+    assert len(matches) == 2
+    assert MatchStatus.reserved not in {match.status for match in matches}
+
+
+async def test_update_record_matching_many_records_keeps_the_pending_changes(
+    session: AsyncSession,
+) -> None:
+    # PRE
+    court_public_id = uuid.uuid4()
+    for time in [8, 9]:
+        await MatchService().create_match(
+            session,
+            MatchCreate(
+                court_public_id=court_public_id,
+                court_name="1",
+                date="2025-04-05",
+                time=time,
+            ),
+        )
+    other_match = await MatchService().create_match(
+        session,
+        MatchCreate(
+            court_public_id=uuid.uuid4(), court_name="2", date="2025-04-05", time=8
+        ),
+    )
+    repo = MatchRepository(session)
+    await repo.update_match(
+        MatchUpdate(status=MatchStatus.cancelled),
+        should_commit=False,
+        public_id=other_match.public_id,
+    )
+
+    # ACTION
+    with pytest.raises(MultipleResultsFound):
+        await repo.update_match(
+            MatchUpdate(status=MatchStatus.reserved),
+            should_commit=False,
+            court_public_id=court_public_id,
+        )
+    await session.commit()
+
+    # POST: the earlier uncommitted update was not rolled back
+    other_match = await repo.get_match(public_id=other_match.public_id)
+    assert other_match.status == MatchStatus.cancelled
+    matches = await repo.get_matches(court_public_id=court_public_id)
+    assert MatchStatus.reserved not in {match.status for match in matches}
+
+
+def test_filters_unique_key(session: AsyncSession) -> None:
+    repo = BaseRepository(session)
+    match_public_id, user_public_id = uuid.uuid4(), uuid.uuid4()
+
+    assert repo._filters_unique_key(Match, public_id=match_public_id)
+    assert repo._filters_unique_key(Match, id=1, status=MatchStatus.reserved)
+    assert repo._filters_unique_key(
+        MatchPlayer, match_public_id=match_public_id, user_public_id=user_public_id
+    )
+    assert not repo._filters_unique_key(MatchPlayer, match_public_id=match_public_id)
+    assert not repo._filters_unique_key(Match, public_id=[match_public_id])
+    assert not repo._filters_unique_key(Match, public_id=None)
+
+
+class IgnoringRepository(BaseRepository):
+    """Handler that does not raise, the IntegrityError must still go up."""
+
+    def _handle_commit_exceptions(self, err: IntegrityError) -> None:
+        pass
+
+
+async def test_create_records_raises_when_the_handler_does_not(
+    session: AsyncSession,
+) -> None:
+    match_in = MatchCreate(
+        court_public_id=uuid.uuid4(), court_name="1", date="2025-04-05", time=8
+    )
+    await MatchService().create_match(session, match_in)
+
+    with pytest.raises(IntegrityError):
+        await IgnoringRepository(session).create_records(Match, [match_in])
+
+
+async def test_update_records_raises_when_the_handler_does_not(
+    session: AsyncSession,
+) -> None:
+    court_public_id = uuid.uuid4()
+    matches = [
+        await MatchService().create_match(
+            session,
+            MatchCreate(
+                court_public_id=court_public_id,
+                court_name=court_name,
+                date="2025-04-05",
+                time=8,
+            ),
+        )
+        for court_name in ["1", "2"]
+    ]
+
+    with pytest.raises(IntegrityError):
+        await IgnoringRepository(session).update_records(
+            Match, MatchUpdate(court_name="1"), public_id=matches[1].public_id
+        )
+
+
+async def test_create_missing_records_skips_the_existing_ones(
+    session: AsyncSession,
+) -> None:
+    court_public_id = uuid.uuid4()
+    matches_in = [
+        MatchCreate(
+            court_public_id=court_public_id,
+            court_name="1",
+            date="2025-04-05",
+            time=time,
+        )
+        for time in [8, 9, 10]
+    ]
+    existing = await MatchService().create_match(session, matches_in[1])
+    repo = MatchRepository(session)
+
+    created = await repo.create_missing_matches(matches_in, should_commit=False)
+
+    assert sorted(match.time for match in created) == [8, 10]  # type: ignore
+    assert existing.public_id not in {match.public_id for match in created}
+    # The transaction is still usable
+    await session.commit()
+    matches = await repo.get_matches(court_public_id=court_public_id)
+    assert len(matches) == 3
+
+    assert await repo.create_missing_matches(matches_in) == []
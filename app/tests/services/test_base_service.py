@@ -0,0 +1,57 @@
+import logging
+from typing import Any
+
+import httpx
+
+from app.core.http import mount_http_transport, unmount_http_transports
+from app.core.metrics import http_client_metrics
+from app.services.base_service import BaseService
+
+
+async def test_services_for_the_same_host_share_one_http_client() -> None:
+    service_1 = BaseService()
+    service_2 = BaseService()
+
+    assert service_1._get_client() is service_2._get_client()
+
+
+async def test_services_for_different_hosts_use_different_http_clients() -> None:
+    service_1 = BaseService()
+    service_2 = BaseService()
+    service_2._set_base_url(is_http=True, host="other-host", port=8000)
+
+    assert service_1._get_client() is not service_2._get_client()
+    assert not service_1._get_client().is_closed
+
+
+async def test_requests_are_measured_by_service_and_headers_redacted(
+    caplog: Any,
+) -> None:
+    http_client_metrics.reset()
+    caplog.set_level(logging.DEBUG, logger="app.services.base_service")
+    service = BaseService()
+    service.set_base_headers({"x-api-key": "secret-key"})
+    await mount_http_transport(
+        service.base_url,
+        httpx.MockTransport(
+            lambda request: httpx.Response(
+                200 if request.url.path == "/ok" else 503, json={}
+            )
+        ),
+    )
+    try:
+        await service.get("/ok", params={"a": 1})
+        await service.get("/ok")
+        await service.post("/fail", json={})
+    finally:
+        await unmount_http_transports()
+
+    assert http_client_metrics.responses == {
+        ("BaseService", "GET", "200"): 2,
+        ("BaseService", "POST", "503"): 1,
+    }
+    assert http_client_metrics.latency["BaseService", "GET"].count == 2
+    assert http_client_metrics.in_flight == {"BaseService": 0}
+    logs = caplog.text
+    assert "secret-key" not in logs
+    assert "'x-api-key': '***'" in logs
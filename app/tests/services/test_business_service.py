@@ -53,3 +53,61 @@ async def test_get_matches_for_business_court_and_date(monkeypatch: Any) -> None
         assert avail_time.date == date
         assert avail_time.time in times
         assert not avail_time.is_reserved
+
+
+async def test_get_available_times_is_cached_until_invalidated(
+    monkeypatch: Any,
+) -> None:
+    business_public_id = uuid.uuid4()
+    court_name = "1"
+    date = datetime.date(2025, 3, 3)
+    calls = []
+
+    async def mock_get(self: Any, url: str, params: Any) -> Any:  # noqa: ARG001
+        calls.append(url)
+        return {"data": []}
+
+    monkeypatch.setattr(BusinessService, "get", mock_get)
+
+    for _ in range(3):
+        await BusinessService().get_available_times(
+            business_public_id, court_name, date
+        )
+    await BusinessService().get_available_time(business_public_id, court_name, date, 8)
+    assert len(calls) == 1
+
+    BusinessService.invalidate_available_times(business_public_id, court_name, date)
+    await BusinessService().get_available_times(business_public_id, court_name, date)
+    assert len(calls) == 2
+
+
+async def test_get_courts_is_fetched_once_for_all_businesses(
+    monkeypatch: Any,
+) -> None:
+    business_public_ids = [uuid.uuid4(), uuid.uuid4()]
+    calls = []
+
+    async def mock_get(self: Any, url: str) -> Any:  # noqa: ARG001
+        calls.append(url)
+        return {
+            "data": [
+                {
+                    "business_public_id": str(business_public_id),
+                    "court_public_id": str(uuid.uuid4()),
+                    "name": "1",
+                    "price_per_hour": 0.0,
+                }
+                for business_public_id in business_public_ids
+            ]
+        }
+
+    monkeypatch.setattr(BusinessService, "get", mock_get)
+    BusinessService.invalidate_courts()
+
+    for business_public_id in business_public_ids:
+        courts = await BusinessService().get_courts(business_public_id)
+        assert len(courts) == 1
+        assert courts[0].business_public_id == business_public_id
+    assert len(calls) == 1
+
+    BusinessService.invalidate_courts()
@@ -1,12 +1,27 @@
+import asyncio
 import copy
+import datetime
 import uuid
 from typing import Any
 
 from sqlmodel.ext.asyncio.session import AsyncSession
 
-from app.models.match_generation import MatchGenerationCreateExtended
+from app.core.config import settings
+from app.core.db import track_queries, untrack_queries
+from app.models.match import MatchCreate
+from app.models.match_generation import (
+    MatchGenerationCreate,
+    MatchGenerationCreateExtended,
+)
+from app.models.match_player import ReserveStatus
+from app.models.player import Player, PlayerFilters
+from app.models.player_activity import PlayerActivity
 from app.services.business_service import BusinessService
 from app.services.match_generator_service import MatchGeneratorService
+from app.services.match_service import MatchService
+from app.services.player_activity_service import PlayerActivityService
+from app.services.players_service import PlayersService
+from app.tests.utilities.test_similarity import get_avail_time
 from app.tests.utils.utils import (
     get_mock_get_available_times,
     initial_apply_mocks_for_generate_matches,
@@ -102,3 +117,265 @@ async def test_generate_matches_for_the_same_with_new_times_twice(
     )
     # ASSERT
     assert len(response_for_new_generate_double) == 0
+
+
+async def test_generate_matches_all_bounds_concurrent_players_lookups(
+    session: AsyncSession, monkeypatch: Any
+) -> None:
+    # Test ctes
+    n_courts = 4
+    times = [8, 9, 10, 11]
+    test_data = {
+        "business_public_id": str(uuid.uuid4()),
+        "court_names": [f"Court {i}" for i in range(n_courts)],
+        "court_public_ids": [str(uuid.uuid4()) for _ in range(n_courts)],
+        "latitude": 0.0,
+        "longitude": 0.0,
+        "date": "2025-03-19",
+        "times": times,
+        "all_times": times,
+        "is_reserved": False,
+        "n_similar_players": 6,
+    }
+    concurrency = 2
+
+    _ = initial_apply_mocks_for_generate_matches(monkeypatch, **test_data)
+    monkeypatch.setattr(settings, "MATCH_GENERATION_CONCURRENCY", concurrency)
+
+    mock_get_players_by_filters = PlayersService.get_players_by_filters
+    in_flight = {"current": 0, "max": 0}
+
+    async def mock_get_players_by_filters_tracked(
+        self: Any, player_filters: PlayerFilters, exclude_uuids: Any
+    ) -> Any:
+        in_flight["current"] += 1
+        in_flight["max"] = max(in_flight["max"], in_flight["current"])
+        await asyncio.sleep(0.01)
+        in_flight["current"] -= 1
+        return await mock_get_players_by_filters(self, player_filters, exclude_uuids)
+
+    monkeypatch.setattr(
+        PlayersService, "get_players_by_filters", mock_get_players_by_filters_tracked
+    )
+
+    # Main request
+    data = {k: v for k, v in test_data.items() if k in ["business_public_id", "date"]}
+    match_gen_create = MatchGenerationCreate(**data)
+    response = await MatchGeneratorService().generate_matches_all(
+        session, match_gen_create
+    )
+
+    # Assertions
+    assert len(response) == n_courts * len(times)
+    assert in_flight["max"] == concurrency
+
+
+async def test_generate_matches_assigns_first_the_players_that_did_not_play_recently(
+    session: AsyncSession, monkeypatch: Any
+) -> None:
+    # Test ctes
+    times = [9]
+    test_data = {
+        "business_public_id": str(uuid.uuid4()),
+        "court_names": ["1"],
+        "court_public_ids": [str(uuid.uuid4())],
+        "latitude": 0.0,
+        "longitude": 0.0,
+        "date": "2025-03-19",
+        "times": times,
+        "all_times": times,
+        "is_reserved": False,
+        "n_similar_players": 6,
+    }
+
+    assigned_players = initial_apply_mocks_for_generate_matches(
+        monkeypatch, **test_data
+    )
+    band = assigned_players[PlayerFilters.MORNING]
+    # The first candidate played that same day
+    await PlayerActivityService().record_reserved(
+        session,
+        [band["assigned"].user_public_id],
+        datetime.date(2025, 3, 19),
+        should_commit=True,
+    )
+
+    # Main request
+    data = {k: v for k, v in test_data.items() if k in ["business_public_id", "date"]}
+    data["court_name"] = test_data["court_names"][0]  # type: ignore
+    match_gen_create = MatchGenerationCreateExtended(**data)
+    service = MatchGeneratorService()
+    response = await service.generate_matches(session, match_gen_create)
+
+    # Assertions
+    matches = await service.get_matches(session, response)
+    assert len(matches) == 1
+    assigned_user_public_ids = [
+        match_player.user_public_id
+        for match_player in matches[0].match_players
+        if match_player.reserve == ReserveStatus.ASSIGNED
+    ]
+    # The next one, all of them are equally far
+    assert assigned_user_public_ids == [band["similar"][0].user_public_id]
+    assigned_user_public_id = assigned_user_public_ids[0]
+
+    players_activity = await PlayerActivityService().get_players_activity(
+        session, [assigned_user_public_id]
+    )
+    assert players_activity[assigned_user_public_id].last_assigned_at is not None
+
+
+def test_choose_priority_player_prefers_the_least_recent_last_match() -> None:
+    avail_time = get_avail_time(0.0, 0.0, 9)
+    user_public_ids = [uuid.uuid4() for _ in range(3)]
+    players = [
+        Player(user_public_id=user_public_id) for user_public_id in user_public_ids
+    ]
+    players_activity = {
+        user_public_ids[0]: PlayerActivity(
+            user_public_id=user_public_ids[0],
+            last_match_date=avail_time.date - datetime.timedelta(days=1),
+        ),
+        user_public_ids[1]: PlayerActivity(
+            user_public_id=user_public_ids[1],
+            last_match_date=avail_time.date - datetime.timedelta(days=30),
+        ),
+    }
+    service = MatchGeneratorService()
+
+    player = service._choose_priority_player(avail_time, players, players_activity)
+    assert player == players[1]
+
+    # Without activity, the first one
+    assert service._choose_priority_player(avail_time, players, {}) == players[0]
+
+
+def test_assign_players_gives_the_slots_left_over_their_priority_player() -> None:
+    avail_times = [get_avail_time(0.0, 0.0, time) for time in [8, 9, 10]]
+    for avail_time in avail_times[1:]:
+        avail_time.business_public_id = avail_times[0].business_public_id
+    near, far = (
+        Player(
+            user_public_id=uuid.uuid4(),
+            latitude=0.0,
+            longitude=longitude,
+            time_availability=PlayerFilters.MORNING,
+        )
+        for longitude in [0.0, 0.1]
+    )
+    candidates = [[near, far] for _ in avail_times]
+
+    assigned = MatchGeneratorService()._assign_players(avail_times, candidates, {})
+
+    # Three slots of one band and two candidates: both are assigned, and
+    # the slot left over gets the closest one again instead of no player
+    assert {player.user_public_id for player in assigned} == {  # type: ignore
+        near.user_public_id,
+        far.user_public_id,
+    }
+    assert assigned.count(near) == 2
+
+
+async def test_generate_matches_again_for_a_generated_day_only_reads_the_matches(
+    session: AsyncSession, monkeypatch: Any
+) -> None:
+    # Test ctes
+    times = [8, 9, 10, 14]
+    test_data = {
+        "business_public_id": str(uuid.uuid4()),
+        "court_names": ["1"],
+        "court_public_ids": [str(uuid.uuid4())],
+        "latitude": 0.0,
+        "longitude": 0.0,
+        "date": "2025-03-19",
+        "times": times,
+        "all_times": times,
+        "is_reserved": False,
+        "n_similar_players": 6,
+    }
+    _ = initial_apply_mocks_for_generate_matches(monkeypatch, **test_data)
+    data = {k: v for k, v in test_data.items() if k in ["business_public_id", "date"]}
+    data["court_name"] = test_data["court_names"][0]  # type: ignore
+    match_gen_create = MatchGenerationCreateExtended(**data)
+    service = MatchGeneratorService()
+    assert len(await service.generate_matches(session, match_gen_create)) == 4
+
+    lookups = []
+
+    async def mock_get_players_by_filters(self: Any, *args: Any) -> Any:  # noqa: ARG001
+        lookups.append(args)
+        return []
+
+    monkeypatch.setattr(
+        PlayersService, "get_players_by_filters", mock_get_players_by_filters
+    )
+
+    # TEST
+    stats, token = track_queries()
+    try:
+        response = await service.generate_matches(session, match_gen_create)
+    finally:
+        untrack_queries(token)
+
+    # ASSERT
+    assert response == []
+    assert lookups == []
+    assert stats.count == 1
+
+
+async def test_generate_matches_skips_the_matches_created_meanwhile(
+    session: AsyncSession, monkeypatch: Any
+) -> None:
+    # Test ctes
+    times = [8, 9, 10]
+    test_data = {
+        "business_public_id": str(uuid.uuid4()),
+        "court_names": ["1"],
+        "court_public_ids": [str(uuid.uuid4())],
+        "latitude": 0.0,
+        "longitude": 0.0,
+        "date": "2025-03-19",
+        "times": times,
+        "all_times": times,
+        "is_reserved": False,
+        "n_similar_players": 6,
+    }
+    _ = initial_apply_mocks_for_generate_matches(monkeypatch, **test_data)
+    data = {k: v for k, v in test_data.items() if k in ["business_public_id", "date"]}
+    data["court_name"] = test_data["court_names"][0]  # type: ignore
+    match_gen_create = MatchGenerationCreateExtended(**data)
+    service = MatchGeneratorService()
+
+    # Another generation creates the match at 9 after the existing ones are read
+    filter_new_available_times = MatchGeneratorService._filter_new_available_times
+
+    async def mock_filter_new_available_times(
+        self: Any, session: AsyncSession, avail_times: Any
+    ) -> Any:
+        avail_times = await filter_new_available_times(self, session, avail_times)
+        await MatchService().create_match(
+            session,
+            MatchCreate(
+                business_public_id=test_data["business_public_id"],
+                court_public_id=test_data["court_public_ids"][0],  # type: ignore
+                court_name="1",
+                date="2025-03-19",
+                time=9,
+            ),
+        )
+        return avail_times
+
+    monkeypatch.setattr(
+        MatchGeneratorService,
+        "_filter_new_available_times",
+        mock_filter_new_available_times,
+    )
+
+    # TEST
+    response = await service.generate_matches(session, match_gen_create)
+
+    # ASSERT
+    matches = await service.get_matches(session, response)
+    assert sorted(match.match.time for match in matches) == [8, 10]  # type: ignore
+    for match in matches:
+        assert len(match.match_players) == 1 + 6
@@ -0,0 +1,127 @@
+import uuid
+from typing import Any
+
+import pytest
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.db import track_queries, untrack_queries
+from app.models.match import MatchCreate, MatchStatus
+from app.models.match_extended import MatchExtended
+from app.models.match_player import MatchPlayerCreate, MatchPlayerUpdate, ReserveStatus
+from app.models.payment import Payment
+from app.services.match_player_service import MatchPlayerService
+from app.services.match_player_update_service import MatchPlayerUpdateService
+from app.services.match_service import MatchService
+from app.services.payment_service import PaymentsService
+from app.utilities.exceptions import NotAuthorizedException
+
+
+async def test_update_match_player_assigns_then_reserves_from_one_reserve_read(
+    session: AsyncSession, monkeypatch: Any
+) -> None:
+    # PRE
+    match = await MatchService().create_match(
+        session,
+        MatchCreate(
+            business_public_id=uuid.uuid4(),
+            court_public_id=uuid.uuid4(),
+            court_name="0",
+            date="2024-11-25",
+            time=8,
+        ),
+    )
+    assigned_uuid, similar_uuid, other_similar_uuid = (uuid.uuid4() for _ in range(3))
+    await MatchPlayerService().create_match_players(
+        session,
+        [
+            MatchPlayerCreate(
+                match_public_id=match.public_id,
+                user_public_id=user_public_id,
+                distance=distance,
+                reserve=reserve,
+            )
+            for user_public_id, distance, reserve in [
+                (assigned_uuid, 0.0, ReserveStatus.ASSIGNED),
+                (other_similar_uuid, 2.0, ReserveStatus.SIMILAR),
+                (similar_uuid, 1.0, ReserveStatus.SIMILAR),
+            ]
+        ],
+    )
+
+    async def mock_create_payment(
+        _self: Any, _match_extended: MatchExtended
+    ) -> Payment:
+        return Payment(
+            public_id=uuid.uuid4(),
+            match_public_id=match.public_id,
+            user_public_id=assigned_uuid,
+            pay_url="https://www.mercadopago.com/mla/checkout/start?pref_id=123456",
+        )
+
+    monkeypatch.setattr(PaymentsService, "create_payment", mock_create_payment)
+
+    async def update_inside(user_public_id: uuid.UUID) -> int:
+        stats, token = track_queries()
+        try:
+            await MatchPlayerUpdateService().update_match_player(
+                session,
+                match.public_id,
+                user_public_id,
+                MatchPlayerUpdate(reserve=ReserveStatus.INSIDE),
+            )
+        finally:
+            untrack_queries(token)
+        return stats.count
+
+    async def get_reserves() -> dict[uuid.UUID, str | None]:
+        reserve = await MatchPlayerService().get_match_players_reserve(
+            session, match.public_id
+        )
+        return {x.user_public_id: x.reserve for x in reserve.match_players}
+
+    # ACTION: the assigned player goes inside
+    n_statements = await update_inside(assigned_uuid)
+
+    # One reserve read, the payment match, the player update and the next
+    # player assignment: outbox message, activity and reserve update
+    assert n_statements == 7
+
+    # POST: the closest similar player is assigned
+    assert await get_reserves() == {
+        assigned_uuid: ReserveStatus.INSIDE,
+        similar_uuid: ReserveStatus.ASSIGNED,
+        other_similar_uuid: ReserveStatus.SIMILAR,
+    }
+
+    # ACTION: the newly assigned player goes inside
+    n_statements = await update_inside(similar_uuid)
+
+    # One reserve read, the payment match, the player update and the match
+    # reserved: status update and activity
+    assert n_statements == 6
+
+    # POST: the match is full, nobody else is assigned
+    assert await get_reserves() == {
+        assigned_uuid: ReserveStatus.INSIDE,
+        similar_uuid: ReserveStatus.INSIDE,
+        other_similar_uuid: ReserveStatus.SIMILAR,
+    }
+    match = await MatchService().get_match(session, match.public_id)
+    assert match.status == MatchStatus.reserved
+
+    # ACTION: a similar player cannot go inside
+    stats, token = track_queries()
+    try:
+        with pytest.raises(NotAuthorizedException):
+            await MatchPlayerUpdateService().update_match_player(
+                session,
+                match.public_id,
+                other_similar_uuid,
+                MatchPlayerUpdate(reserve=ReserveStatus.INSIDE),
+            )
+    finally:
+        untrack_queries(token)
+
+    # POST: rejected from the reserve read alone, nothing changed
+    assert stats.count == 1
+    assert (await get_reserves())[other_similar_uuid] == ReserveStatus.SIMILAR
@@ -0,0 +1,125 @@
+import asyncio
+import uuid
+from collections.abc import AsyncGenerator
+from typing import Any
+
+import pytest_asyncio
+from sqlmodel import select
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import settings
+from app.models.outbox import OutboxMessage, OutboxStatus, utc_now
+from app.services import outbox_service
+from app.services.bot_service import BotService
+from app.services.outbox_service import OutboxService
+from app.simulators.fake_services import (
+    FakeServiceConfig,
+    FakeWorld,
+    install_fake_services,
+    uninstall_fake_services,
+)
+
+
+async def test_new_matches_are_sent_in_one_bulk_message(
+    session: AsyncSession, monkeypatch: Any
+) -> None:
+    sent: list[list[uuid.UUID]] = []
+
+    async def mock_send_new_matches(
+        self: Any,  # noqa: ARG001
+        user_public_ids: list[uuid.UUID],
+    ) -> Any:
+        sent.append(user_public_ids)
+        return {"status": "sent"}
+
+    monkeypatch.setattr(BotService, "send_new_matches", mock_send_new_matches)
+
+    user_public_ids = [uuid.uuid4() for _ in range(3)]
+    for user_public_id in user_public_ids:
+        await OutboxService().enqueue_new_matches(
+            session, [user_public_id], should_commit=True
+        )
+
+    n_messages = await OutboxService().process_pending(session)
+
+    assert n_messages == 3
+    assert sent == [user_public_ids]
+    messages = (await session.exec(select(OutboxMessage))).all()
+    assert {message.status for message in messages} == {OutboxStatus.DONE}
+
+    # Nothing left to deliver
+    assert await OutboxService().process_pending(session) == 0
+    assert len(sent) == 1
+
+
+@pytest_asyncio.fixture(name="bot_down")
+async def bot_down_fixture() -> AsyncGenerator[FakeWorld, None]:
+    """Fake services, the bot answering every request with a 503."""
+    world = FakeWorld()
+    await install_fake_services(
+        world, configs={"bot": FakeServiceConfig(error_rate=1.0)}
+    )
+    yield world
+    await uninstall_fake_services()
+
+
+async def test_failed_delivery_is_retried_with_backoff_until_max_attempts(
+    session: AsyncSession, monkeypatch: Any, bot_down: FakeWorld
+) -> None:
+    monkeypatch.setattr(settings, "OUTBOX_MAX_ATTEMPTS", 2)
+
+    message = await OutboxService().enqueue_new_matches(
+        session, [uuid.uuid4()], should_commit=True
+    )
+    assert message is not None
+    message_id = message.id
+
+    before = utc_now()
+    assert await OutboxService().process_pending(session) == 1
+    message = await session.get(OutboxMessage, message_id, populate_existing=True)
+    assert message is not None
+    assert message.status == OutboxStatus.PENDING
+    assert message.attempts == 1
+    assert "503" in (message.last_error or "")
+    assert message.next_attempt_at >= before
+    # Not due until the backoff ends
+    assert await OutboxService().process_pending(session) == 0
+
+    # Last attempt fails for good
+    message.next_attempt_at = utc_now()
+    session.add(message)
+    await session.commit()
+    assert await OutboxService().process_pending(session) == 1
+    message = await session.get(OutboxMessage, message_id, populate_existing=True)
+    assert message is not None
+    assert message.status == OutboxStatus.FAILED
+    assert message.attempts == 2
+    assert bot_down.messages_sent == 0
+
+
+async def test_workers_are_woken_up_after_the_commit(
+    session: AsyncSession, monkeypatch: Any
+) -> None:
+    outbox_event = asyncio.Event()
+    monkeypatch.setattr(outbox_service, "_outbox_event", outbox_event)
+
+    await OutboxService().enqueue_new_matches(session, [uuid.uuid4()])
+    await session.flush()
+    assert not outbox_event.is_set()
+
+    await session.commit()
+    assert outbox_event.is_set()
+
+
+async def test_workers_are_not_woken_up_after_a_rollback(
+    session: AsyncSession, monkeypatch: Any
+) -> None:
+    outbox_event = asyncio.Event()
+    monkeypatch.setattr(outbox_service, "_outbox_event", outbox_event)
+
+    await OutboxService().enqueue_new_matches(session, [uuid.uuid4()])
+    await session.rollback()
+    await session.commit()
+
+    assert not outbox_event.is_set()
+    assert (await session.exec(select(OutboxMessage))).all() == []
@@ -0,0 +1,62 @@
+import datetime
+import uuid
+
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.services.player_activity_service import PlayerActivityService
+
+
+async def test_record_inside_counts_the_matches(session: AsyncSession) -> None:
+    user_public_ids = [uuid.uuid4() for _ in range(2)]
+    service = PlayerActivityService()
+
+    await service.record_inside(session, user_public_ids, should_commit=True)
+    await service.record_inside(session, user_public_ids[:1], should_commit=True)
+
+    players_activity = await service.get_players_activity(session, user_public_ids)
+    assert players_activity[user_public_ids[0]].n_matches == 2
+    assert players_activity[user_public_ids[1]].n_matches == 1
+    assert players_activity[user_public_ids[1]].last_match_date is None
+
+
+async def test_record_reserved_keeps_the_last_match_date(
+    session: AsyncSession,
+) -> None:
+    user_public_id = uuid.uuid4()
+    service = PlayerActivityService()
+
+    for day in [10, 20, 15]:
+        await service.record_reserved(
+            session,
+            [user_public_id],
+            datetime.date(2025, 3, day),
+            should_commit=True,
+        )
+
+    players_activity = await service.get_players_activity(session, [user_public_id])
+    assert players_activity[user_public_id].last_match_date == datetime.date(
+        2025, 3, 20
+    )
+    assert players_activity[user_public_id].n_matches == 0
+
+
+async def test_record_assigned_sets_the_last_assignment_time(
+    session: AsyncSession,
+) -> None:
+    user_public_id = uuid.uuid4()
+    service = PlayerActivityService()
+
+    # Repeated players are recorded once
+    await service.record_assigned(
+        session, [user_public_id, user_public_id], should_commit=True
+    )
+
+    players_activity = await service.get_players_activity(session, [user_public_id])
+    assert players_activity[user_public_id].last_assigned_at is not None
+
+
+async def test_get_players_activity_without_activity(session: AsyncSession) -> None:
+    service = PlayerActivityService()
+
+    assert await service.get_players_activity(session, []) == {}
+    assert await service.get_players_activity(session, [uuid.uuid4(), None]) == {}
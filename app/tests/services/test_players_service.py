@@ -0,0 +1,119 @@
+import asyncio
+import uuid
+from typing import Any
+
+from app.models.player import PlayerFilters
+from app.services.players_service import PlayersService
+
+
+def get_mock_get(user_public_ids: list[uuid.UUID], calls: list[Any]) -> Any:
+    async def mock_get(self: Any, url: str, params: Any) -> Any:  # noqa: ARG001
+        calls.append(params)
+        await asyncio.sleep(0)
+        players = [
+            {"user_public_id": str(user_public_id), "time_availability": 1}
+            for user_public_id in user_public_ids
+        ]
+        return {"data": players[: params.get("n_players")]}
+
+    return mock_get
+
+
+def get_filters(
+    available_days: list[int], n_players: int | None = None
+) -> PlayerFilters:
+    return PlayerFilters(
+        latitude=1.0,
+        longitude=2.0,
+        time_availability=1,
+        available_days=available_days,
+        n_players=n_players,
+    )
+
+
+async def test_get_players_by_filters_shares_one_lookup_per_filters(
+    monkeypatch: Any,
+) -> None:
+    user_public_ids = [uuid.uuid4() for _ in range(4)]
+    calls: list[Any] = []
+    monkeypatch.setattr(PlayersService, "get", get_mock_get(user_public_ids, calls))
+    PlayersService.invalidate_players()
+
+    results = await asyncio.gather(
+        PlayersService().get_players_by_filters(get_filters([1, 3])),
+        PlayersService().get_players_by_filters(get_filters([3, 1])),
+    )
+    assert len(calls) == 1
+    assert [player.user_public_id for player in results[0]] == user_public_ids
+    assert results[0] == results[1]
+
+    # Other filters are another lookup
+    await PlayersService().get_players_by_filters(get_filters([2]))
+    assert len(calls) == 2
+
+    PlayersService.invalidate_players()
+    await PlayersService().get_players_by_filters(get_filters([1, 3]))
+    assert len(calls) == 3
+
+
+async def test_get_players_by_filters_shares_one_lookup_whatever_the_exclusions(
+    monkeypatch: Any,
+) -> None:
+    user_public_ids = [uuid.uuid4() for _ in range(4)]
+    calls: list[Any] = []
+    monkeypatch.setattr(PlayersService, "get", get_mock_get(user_public_ids, calls))
+    PlayersService.invalidate_players()
+
+    results = await asyncio.gather(
+        PlayersService().get_players_by_filters(
+            get_filters([1]), exclude_uuids=user_public_ids[:1]
+        ),
+        PlayersService().get_players_by_filters(
+            get_filters([1]), exclude_uuids=user_public_ids[1:3]
+        ),
+        PlayersService().get_players_by_filters(get_filters([1])),
+    )
+
+    # One lookup without the exclusions, applied to each result
+    assert len(calls) == 1
+    assert "exclude_user_public_ids" not in calls[0]
+    assert [[player.user_public_id for player in players] for players in results] == [
+        user_public_ids[1:],
+        [user_public_ids[0], user_public_ids[3]],
+        user_public_ids,
+    ]
+
+
+async def test_get_players_by_filters_fetches_room_for_the_exclusions(
+    monkeypatch: Any,
+) -> None:
+    user_public_ids = [uuid.uuid4() for _ in range(6)]
+    calls: list[Any] = []
+    monkeypatch.setattr(PlayersService, "get", get_mock_get(user_public_ids, calls))
+    PlayersService.invalidate_players()
+
+    players = await PlayersService().get_players_by_filters(
+        get_filters([1], n_players=3), exclude_uuids=user_public_ids[:2]
+    )
+
+    # Fetched again, with room for the excluded players
+    assert [call["n_players"] for call in calls] == [3, 5]
+    assert [player.user_public_id for player in players] == user_public_ids[2:5]
+
+    # Other exclusions of the same size reuse both lookups
+    players = await PlayersService().get_players_by_filters(
+        get_filters([1], n_players=3), exclude_uuids=user_public_ids[1:3]
+    )
+    assert len(calls) == 2
+    assert [player.user_public_id for player in players] == [
+        user_public_ids[0],
+        user_public_ids[3],
+        user_public_ids[4],
+    ]
+
+    # Exclusions outside the first n_players need no other lookup
+    players = await PlayersService().get_players_by_filters(
+        get_filters([1], n_players=3), exclude_uuids=user_public_ids[4:]
+    )
+    assert len(calls) == 2
+    assert [player.user_public_id for player in players] == user_public_ids[:3]
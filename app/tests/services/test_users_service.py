@@ -0,0 +1,31 @@
+import uuid
+from typing import Any
+
+from app.services.users_service import UserService
+
+
+async def test_get_telegram_ids_requests_each_user_once(monkeypatch: Any) -> None:
+    user_public_ids = [uuid.uuid4() for _ in range(5)]
+    telegram_ids = {
+        f"/api/v1/users/{user_public_id}": i
+        for i, user_public_id in enumerate(user_public_ids)
+    }
+    calls = []
+
+    async def mock_get(self: Any, url: str) -> Any:  # noqa: ARG001
+        calls.append(url)
+        return {"telegram_id": telegram_ids[url]}
+
+    monkeypatch.setattr(UserService, "get", mock_get)
+
+    result = await UserService().get_telegram_ids(user_public_ids + user_public_ids)
+    assert result == dict(zip(user_public_ids, range(5), strict=True))
+    assert len(calls) == len(user_public_ids)
+
+    # Cached
+    await UserService().get_telegram_ids(user_public_ids)
+    assert len(calls) == len(user_public_ids)
+
+    UserService.invalidate_telegram_id(user_public_ids[0])
+    await UserService().get_telegram_ids(user_public_ids)
+    assert len(calls) == len(user_public_ids) + 1
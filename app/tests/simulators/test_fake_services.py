@@ -0,0 +1,81 @@
+from collections.abc import AsyncGenerator
+
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import test_settings
+from app.models.match_player import ReserveStatus
+from app.services.business_service import BusinessService
+from app.services.outbox_service import OutboxService
+from app.services.players_service import PlayersService
+from app.simulators.fake_services import (
+    FakeServiceConfig,
+    FakeWorld,
+    install_fake_services,
+    uninstall_fake_services,
+)
+
+
+@pytest_asyncio.fixture(name="world")
+async def fake_world() -> AsyncGenerator[FakeWorld, None]:
+    world = FakeWorld(n_businesses=1, n_courts=2, n_players=50, times=[8, 14, 20])
+    BusinessService.invalidate_courts()
+    BusinessService.invalidate_available_times()
+    PlayersService.invalidate_players()
+    await install_fake_services(world, FakeServiceConfig(latency=0.001))
+    yield world
+    await uninstall_fake_services()
+    BusinessService.invalidate_courts()
+    BusinessService.invalidate_available_times()
+    PlayersService.invalidate_players()
+
+
+async def test_generate_and_accept_matches_with_fake_services(
+    async_client: AsyncClient,
+    session: AsyncSession,
+    x_api_key_header: dict[str, str],
+    world: FakeWorld,
+) -> None:
+    response = await async_client.post(
+        f"{test_settings.API_V1_STR}/matches/generation/all",
+        headers=x_api_key_header,
+        json={
+            "business_public_id": world.business_public_ids[0],
+            "date": "2025-03-19",
+        },
+    )
+
+    assert response.status_code == 201
+    matches = response.json()["data"]
+    assert len(matches) == 2 * 3
+
+    await OutboxService().process_pending(session)
+    assert world.messages_sent > 0
+
+    match = matches[0]
+    assigned = [
+        player
+        for player in match["match_players"]
+        if player["reserve"] == ReserveStatus.ASSIGNED
+    ]
+    response = await async_client.patch(
+        f"{test_settings.API_V1_STR}/matches/{match['public_id']}/players/{assigned[0]['user_public_id']}/",
+        headers=x_api_key_header,
+        json={"reserve": ReserveStatus.INSIDE},
+    )
+
+    assert response.status_code == 200
+    assert response.json()["pay_url"].startswith("https://payments.invalid/")
+    assert world.payments_created == 1
+
+
+async def test_fake_services_inject_errors() -> None:
+    await install_fake_services(
+        FakeWorld(), configs={"business": FakeServiceConfig(error_rate=1.0)}
+    )
+    try:
+        # Failed responses are returned as None
+        assert await BusinessService().get("/api/v1/padel-courts/") is None
+    finally:
+        await uninstall_fake_services()
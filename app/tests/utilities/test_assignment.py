@@ -0,0 +1,66 @@
+import itertools
+import random
+
+import pytest
+
+from app.utilities.assignment import FORBIDDEN_COST, solve_assignment
+
+
+def get_costs(n_rows: int, n_columns: int, seed: int) -> list[list[float]]:
+    rng = random.Random(seed)
+    return [[rng.uniform(0, 100) for _ in range(n_columns)] for _ in range(n_rows)]
+
+
+def brute_force_cost(costs: list[list[float]]) -> float:
+    n_rows, n_columns = len(costs), len(costs[0])
+    if n_rows <= n_columns:
+        return min(
+            sum(costs[i][j] for i, j in enumerate(columns))
+            for columns in itertools.permutations(range(n_columns), n_rows)
+        )
+    return min(
+        sum(costs[i][j] for j, i in enumerate(rows))
+        for rows in itertools.permutations(range(n_rows), n_columns)
+    )
+
+
+def total_cost(costs: list[list[float]], columns: list[int | None]) -> float:
+    return sum(costs[i][j] for i, j in enumerate(columns) if j is not None)
+
+
+@pytest.mark.parametrize("shape", [(1, 1), (3, 3), (3, 6), (5, 7), (6, 3)])
+def test_solve_assignment_is_optimal(shape: tuple[int, int]) -> None:
+    for seed in range(20):
+        costs = get_costs(*shape, seed=seed)
+        columns = solve_assignment(costs)
+
+        assigned = [j for j in columns if j is not None]
+        assert len(assigned) == min(shape)
+        assert len(set(assigned)) == len(assigned)
+        assert total_cost(costs, columns) == pytest.approx(brute_force_cost(costs))
+
+
+def test_solve_assignment_leaves_forbidden_rows_without_column() -> None:
+    costs = [
+        [1.0, 5.0, FORBIDDEN_COST],
+        [FORBIDDEN_COST, FORBIDDEN_COST, FORBIDDEN_COST],
+        [2.0, FORBIDDEN_COST, FORBIDDEN_COST],
+    ]
+
+    # The first row gives its cheapest column to the only one of the third
+    assert solve_assignment(costs) == [1, None, 0]
+
+
+def test_solve_assignment_alike_rows_take_the_cheapest_columns() -> None:
+    row = [4.0, 1.0, 3.0, FORBIDDEN_COST, 2.0]
+
+    assert solve_assignment([row] * 3) == [1, 4, 2]
+    assert solve_assignment([row] * 5) == [1, 4, 2, 0, None]
+    # More rows than columns: which ones are left without one is a tie
+    columns = solve_assignment([row] * 6)
+    assert sorted(j for j in columns if j is not None) == [0, 1, 2, 4]
+
+
+def test_solve_assignment_without_rows_or_columns() -> None:
+    assert solve_assignment([]) == []
+    assert solve_assignment([[], []]) == [None, None]
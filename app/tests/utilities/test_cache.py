@@ -0,0 +1,78 @@
+import asyncio
+
+import pytest
+
+from app.utilities.cache import AsyncTTLCache
+
+
+async def test_get_or_fetch_caches_value_until_invalidated() -> None:
+    cache: AsyncTTLCache[str, int] = AsyncTTLCache("test_values", maxsize=10, ttl=60)
+    calls = []
+
+    async def fetch() -> int:
+        calls.append(1)
+        return len(calls)
+
+    assert await cache.get_or_fetch("key", fetch) == 1
+    assert await cache.get_or_fetch("key", fetch) == 1
+    assert cache.hits == 1
+    assert cache.misses == 1
+
+    cache.invalidate("key")
+    assert await cache.get_or_fetch("key", fetch) == 2
+    assert cache.misses == 2
+
+
+async def test_expired_value_is_fetched_again() -> None:
+    cache: AsyncTTLCache[str, int] = AsyncTTLCache("test_expired", maxsize=10, ttl=0)
+    calls = []
+
+    async def fetch() -> int:
+        calls.append(1)
+        return len(calls)
+
+    assert await cache.get_or_fetch("key", fetch) == 1
+    assert await cache.get_or_fetch("key", fetch) == 2
+
+
+async def test_least_recently_used_value_is_evicted() -> None:
+    cache: AsyncTTLCache[str, str] = AsyncTTLCache("test_lru", maxsize=2, ttl=60)
+    cache.set("a", "a")
+    cache.set("b", "b")
+    assert cache.get("a") == "a"
+
+    cache.set("c", "c")
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == "a"
+    assert cache.get("c") == "c"
+
+
+async def test_concurrent_misses_share_one_fetch() -> None:
+    cache: AsyncTTLCache[str, int] = AsyncTTLCache("test_flight", maxsize=10, ttl=60)
+    calls = []
+
+    async def fetch() -> int:
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return 42
+
+    values = await asyncio.gather(*(cache.get_or_fetch("key", fetch) for _ in range(5)))
+
+    assert values == [42] * 5
+    assert len(calls) == 1
+
+
+async def test_failed_fetch_is_not_cached() -> None:
+    cache: AsyncTTLCache[str, int] = AsyncTTLCache("test_failed", maxsize=10, ttl=60)
+
+    async def fetch_error() -> int:
+        raise ValueError()
+
+    async def fetch() -> int:
+        return 1
+
+    with pytest.raises(ValueError):
+        await cache.get_or_fetch("key", fetch_error)
+    assert await cache.get_or_fetch("key", fetch) == 1
@@ -0,0 +1,43 @@
+from sqlmodel.ext.asyncio.session import AsyncSession
+
+from app.core.config import test_settings
+from app.core.db import get_async_engine, track_queries, untrack_queries
+from app.models.match import MatchCreate
+from app.services.match_service import MatchService
+
+
+async def test_commit_does_not_refresh_the_complete_records(
+    session: AsyncSession,
+) -> None:
+    stats, token = track_queries()
+    try:
+        match = await MatchService().create_match(
+            session, MatchCreate(court_name="1", date="2025-04-05", time=8)
+        )
+    finally:
+        untrack_queries(token)
+
+    # Only the INSERT ... RETURNING
+    assert stats.count == 1
+    assert match.id is not None
+    assert match.court_name == "1"
+
+
+async def test_commit_refreshes_the_expired_records(
+    session: AsyncSession,  # noqa: ARG001
+) -> None:
+    # The session fixture deletes the matches afterwards
+    engine = get_async_engine(str(test_settings.SQLALCHEMY_DATABASE_URI))
+    async with AsyncSession(engine, expire_on_commit=True) as expiring_session:
+        stats, token = track_queries()
+        try:
+            match = await MatchService().create_match(
+                expiring_session, MatchCreate(court_name="1", date="2025-04-05", time=8)
+            )
+        finally:
+            untrack_queries(token)
+
+    # The INSERT and the refresh
+    assert stats.count == 2
+    assert match.id is not None
+    assert match.court_name == "1"
@@ -0,0 +1,101 @@
+import datetime
+import uuid
+
+import pytest
+
+from app.models.available_time import AvailableTime
+from app.models.player import Player, PlayerFilters
+from app.utilities import similarity
+from app.utilities.similarity import (
+    AVAILABILITY_PENALTY_KM,
+    MAX_DISTANCE_KM,
+    NUMPY_MIN_CANDIDATES,
+    haversine_km,
+    score_players_python,
+)
+
+
+def get_avail_time(latitude: float, longitude: float, time: int) -> AvailableTime:
+    return AvailableTime(
+        business_public_id=uuid.uuid4(),
+        court_public_id=uuid.uuid4(),
+        court_name="1",
+        latitude=latitude,
+        longitude=longitude,
+        date=datetime.date(2025, 3, 19),
+        time=time,
+        is_reserved=False,
+    )
+
+
+def get_players(n_players: int) -> list[Player]:
+    players = [
+        Player(
+            user_public_id=uuid.uuid4(),
+            latitude=-34.6 + i * 0.01,
+            longitude=-58.4 - i * 0.01,
+            time_availability=1 + i % 3,
+        )
+        for i in range(n_players)
+    ]
+    players.append(Player(user_public_id=uuid.uuid4(), time_availability=1))
+    return players
+
+
+def test_haversine_km() -> None:
+    # One degree of a meridian
+    assert haversine_km(0.0, 0.0, 1.0, 0.0) == pytest.approx(111.195, abs=0.001)
+    assert haversine_km(-34.6, -58.4, -34.6, -58.4) == 0.0
+
+
+def test_score_players_python() -> None:
+    avail_time = get_avail_time(-34.6, -58.4, 8)
+    players = [
+        Player(
+            latitude=-34.6, longitude=-58.4, time_availability=PlayerFilters.MORNING
+        ),
+        Player(
+            latitude=-34.6, longitude=-58.4, time_availability=PlayerFilters.EVENING
+        ),
+        Player(
+            latitude=-33.6, longitude=-58.4, time_availability=PlayerFilters.MORNING
+        ),
+        Player(time_availability=PlayerFilters.MORNING),
+    ]
+
+    scores = score_players_python(avail_time, players)
+
+    assert scores[0] == 0.0
+    assert scores[1] == AVAILABILITY_PENALTY_KM
+    assert scores[2] == pytest.approx(111.195, abs=0.001)
+    assert scores[3] == MAX_DISTANCE_KM
+
+
+def test_score_players_numpy_matches_python() -> None:
+    avail_time = get_avail_time(-34.6, -58.4, 14)
+    players = get_players(100)
+
+    scores = similarity.score_players_numpy(avail_time, players)
+
+    assert scores == pytest.approx(score_players_python(avail_time, players))
+
+
+def test_score_players_vectorizes_from_the_threshold(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    avail_time = get_avail_time(-34.6, -58.4, 14)
+    players = get_players(NUMPY_MIN_CANDIDATES)
+    calls = []
+
+    def mock_score_players_numpy(
+        avail_time: AvailableTime, players: list[Player]
+    ) -> list[float]:
+        calls.append(len(players))
+        return score_players_python(avail_time, players)
+
+    monkeypatch.setattr(similarity, "score_players_numpy", mock_score_players_numpy)
+
+    similarity.score_players(avail_time, players[: NUMPY_MIN_CANDIDATES - 1])
+    similarity.score_players(avail_time, players[:NUMPY_MIN_CANDIDATES])
+
+    assert calls == [NUMPY_MIN_CANDIDATES]
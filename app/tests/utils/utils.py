@@ -26,6 +26,14 @@ def get_x_api_key_header() -> dict[str, str]:
     return headers
 
 
+def get_band_players(
+    assigned_players: dict[int, dict[str, Any]], time_avail: int
+) -> list[Player]:
+    """The players of a time band, the mock assigned one first."""
+    band = assigned_players[time_avail]
+    return [band["assigned"]] + band["similar"]  # type: ignore
+
+
 def get_mock_get_players_by_filters(**match_data: Any) -> Any:
     assigned_players = {}
     for time in match_data["all_times"]:
@@ -49,11 +57,15 @@ def get_mock_get_players_by_filters(**match_data: Any) -> Any:
         time_avail = player_filters.time_availability
         if time_avail is None:
             raise ValueError()
-        assigned_player = assigned_players[time_avail]["assigned"]
-        similar_players = assigned_players[time_avail]["similar"]
-        if player_filters.user_public_id == assigned_player.user_public_id:  # type: ignore
-            return similar_players
-        return [assigned_player] + similar_players  # type: ignore
+        band_players = get_band_players(assigned_players, time_avail)
+        if player_filters.user_public_id is not None:
+            # Similar to the given player: the others of its time band
+            return [
+                player
+                for player in band_players
+                if player.user_public_id != player_filters.user_public_id
+            ]
+        return band_players
 
     return mock_get_players_by_filters, assigned_players
 
@@ -112,7 +124,7 @@ def get_mock_send_messages_disable() -> Any:
         self: Any,  # noqa: ARG001
         user_public_ids: list[uuid.UUID],  # noqa: ARG001
     ) -> Any:
-        return None
+        return {"status": "sent"}
 
     return send_new_matches
 
@@ -165,7 +177,9 @@ def initial_apply_mocks_for_generate_matches(
     # Mock MatchGeneratorService
     def mock_choose_priority_player(
         self: Any,  # noqa: ARG001
-        players: list[Player],  # noqa: ARG001
+        avail_time: Any,  # noqa: ARG001
+        players: list[Player],
+        players_activity: Any,  # noqa: ARG001
     ) -> Player:
         time_avail = players[0].time_availability
         return assigned_players[time_avail]["assigned"]  # type: ignore
@@ -0,0 +1,98 @@
+import heapq
+
+import numpy as np
+
+# Cost of the pairs that are not allowed, e.g. a player not available for a slot
+FORBIDDEN_COST = 1e12
+
+
+def _candidate_columns(costs: list[list[float]]) -> list[int]:
+    """
+    Columns worth considering: the n cheapest of each of the n rows.
+    Some optimal assignment only uses them, since a row assigned outside
+    its n cheapest has one of them free to swap to.
+    """
+    n_rows = len(costs)
+    columns: set[int] = set()
+    for row in costs:
+        if len(row) <= n_rows:
+            return list(range(len(row)))
+        columns.update(heapq.nsmallest(n_rows, range(len(row)), key=row.__getitem__))
+    return sorted(columns)
+
+
+def _hungarian(costs: list[list[float]]) -> list[int]:
+    """
+    Column of each row, for n rows <= m columns (shortest augmenting paths),
+    each step vectorized over the columns.
+    """
+    n_rows, n_columns = len(costs), len(costs[0])
+    matrix = np.zeros((n_rows + 1, n_columns + 1))
+    matrix[1:, 1:] = costs
+    u = np.zeros(n_rows + 1)
+    v = np.zeros(n_columns + 1)
+    row_of = np.zeros(n_columns + 1, dtype=int)
+    way = np.zeros(n_columns + 1, dtype=int)
+    for i in range(1, n_rows + 1):
+        row_of[0] = i
+        j0 = 0
+        min_v = np.full(n_columns + 1, np.inf)
+        used = np.zeros(n_columns + 1, dtype=bool)
+        while True:
+            used[j0] = True
+            i0 = row_of[j0]
+            cur = matrix[i0] - u[i0] - v
+            improved = ~used & (cur < min_v)
+            min_v[improved] = cur[improved]
+            way[improved] = j0
+            free_min_v = np.where(used, np.inf, min_v)
+            j1 = int(np.argmin(free_min_v))
+            delta = free_min_v[j1]
+            u[row_of[used]] += delta
+            v[used] -= delta
+            min_v[~used] -= delta
+            j0 = j1
+            if row_of[j0] == 0:
+                break
+        while j0:
+            j1 = way[j0]
+            row_of[j0] = row_of[j1]
+            j0 = j1
+
+    column_of = [0] * n_rows
+    for j in range(1, n_columns + 1):
+        if row_of[j]:
+            column_of[row_of[j] - 1] = j - 1
+    return column_of
+
+
+def solve_assignment(costs: list[list[float]]) -> list[int | None]:
+    """
+    Min-cost assignment of rows to columns, each column used at most once.
+    Returns the column of each row, None for the rows left without one,
+    when there are more rows than columns or only forbidden ones.
+    """
+    if not costs or not costs[0]:
+        return [None] * len(costs)
+    n_rows, n_columns = len(costs), len(costs[0])
+    if n_rows > n_columns:
+        # Solved from the columns side
+        transposed = [list(column) for column in zip(*costs, strict=True)]
+        row_of_column = solve_assignment(transposed)
+        column_of: list[int | None] = [None] * n_rows
+        for j, i in enumerate(row_of_column):
+            if i is not None:
+                column_of[i] = j
+        return column_of
+
+    if all(row == costs[0] for row in costs[1:]):
+        # Every row alike, the common case: the n cheapest columns, in order
+        cheapest = heapq.nsmallest(n_rows, range(n_columns), key=costs[0].__getitem__)
+        return [j if costs[0][j] < FORBIDDEN_COST else None for j in cheapest]
+
+    columns = _candidate_columns(costs)
+    pruned = [[row[j] for j in columns] for row in costs]
+    return [
+        columns[j] if costs[i][columns[j]] < FORBIDDEN_COST else None
+        for i, j in enumerate(_hungarian(pruned))
+    ]
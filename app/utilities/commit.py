@@ -1,6 +1,7 @@
 from collections.abc import Callable
 from typing import Any
 
+from sqlalchemy import inspect
 from sqlalchemy.exc import IntegrityError
 
 from app.utilities.dependencies import SessionDep
@@ -10,6 +11,17 @@ def handle_commit_exceptions(err: IntegrityError) -> None:
     raise err
 
 
+def needs_refresh(record: Any) -> bool:
+    """
+    Whether the record has attributes to load from the DB: the expired ones,
+    with expire_on_commit, or server defaults the flush did not return.
+    The table models set eager_defaults, so the INSERTs of the ORM return
+    the server generated columns, and the records of a session with
+    expire_on_commit=False are already complete.
+    """
+    return bool(inspect(record).unloaded)
+
+
 async def commit_refresh_or_flush(
     session: SessionDep,
     should_commit: bool,
@@ -24,9 +36,11 @@ async def commit_refresh_or_flush(
         if should_commit:
             await session.commit()
             for record in records:
-                await session.refresh(record)
+                if needs_refresh(record):
+                    await session.refresh(record)
         else:
             await session.flush()
     except IntegrityError as e:
         await session.rollback()
         handle_commit_exceptions(e)
+        raise
@@ -0,0 +1,17 @@
+import asyncio
+from collections.abc import Awaitable
+from typing import TypeVar
+
+T = TypeVar("T")
+
+
+async def gather_with_concurrency(limit: int, *aws: Awaitable[T]) -> list[T]:
+    """Await all the awaitables, running at most `limit` at the same time.
+    Results keep the order of the given awaitables."""
+    semaphore = asyncio.Semaphore(max(limit, 1))
+
+    async def run(aw: Awaitable[T]) -> T:
+        async with semaphore:
+            return await aw
+
+    return list(await asyncio.gather(*(run(aw) for aw in aws)))
@@ -3,11 +3,10 @@ from typing import Annotated
 from uuid import UUID
 
 from fastapi import Depends, Header, Query
-from sqlalchemy.orm import sessionmaker
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from app.core.config import settings
-from app.core.db import get_async_engine
+from app.core.db import get_session
 from app.utilities.exceptions import (
     NotAuthorizedException,
     NotEnoughPermissionsException,
@@ -25,12 +24,7 @@ async def get_user_id_param(user_id: Annotated[UUID, Query()]) -> None:
 
 
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
-    async_session = sessionmaker(
-        bind=get_async_engine(),
-        class_=AsyncSession,
-        expire_on_commit=False,  # type: ignore[call-overload]
-    )
-    async with async_session() as session:
+    async with get_session() as session:
         yield session
 
 
@@ -25,3 +25,16 @@ class NotUniqueException(HTTPException):
     def __init__(self, item: str) -> None:
         detail = f"{item} already exists."
         super().__init__(status_code=status.HTTP_409_CONFLICT, detail=detail)
+
+
+class ServiceUnavailableException(HTTPException):
+    def __init__(self, service: str) -> None:
+        detail = f"{service} service unavailable."
+        super().__init__(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail=detail)
+
+
+class InvalidCursorException(HTTPException):
+    def __init__(self) -> None:
+        super().__init__(
+            status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor."
+        )
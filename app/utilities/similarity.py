@@ -0,0 +1,91 @@
+import math
+
+import numpy as np
+
+from app.models.available_time import AvailableTime
+from app.models.player import Player, PlayerFilters
+
+EARTH_RADIUS_KM = 6371.0088
+# Distance of the players without a location: half the earth circumference
+MAX_DISTANCE_KM = math.pi * EARTH_RADIUS_KM
+# Added to the distance of the players available in another time band
+AVAILABILITY_PENALTY_KM = 50.0
+# Below this many candidates, building the arrays costs more than the loop
+NUMPY_MIN_CANDIDATES = 32
+
+
+def haversine_km(
+    latitude_1: float, longitude_1: float, latitude_2: float, longitude_2: float
+) -> float:
+    lat_1, lat_2 = math.radians(latitude_1), math.radians(latitude_2)
+    d_lat = lat_2 - lat_1
+    d_lon = math.radians(longitude_2 - longitude_1)
+    a = (
+        math.sin(d_lat / 2) ** 2
+        + math.cos(lat_1) * math.cos(lat_2) * math.sin(d_lon / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def score_players_python(
+    avail_time: AvailableTime, players: list[Player]
+) -> list[float]:
+    time_availability = PlayerFilters.to_time_availability(avail_time.time)
+    scores = []
+    for player in players:
+        if player.latitude is None or player.longitude is None:
+            score = MAX_DISTANCE_KM
+        else:
+            score = haversine_km(
+                avail_time.latitude,
+                avail_time.longitude,
+                player.latitude,
+                player.longitude,
+            )
+        if player.time_availability != time_availability:
+            score += AVAILABILITY_PENALTY_KM
+        scores.append(score)
+    return scores
+
+
+def score_players_numpy(
+    avail_time: AvailableTime, players: list[Player]
+) -> list[float]:
+    # One pass over the players, the slowest part. None becomes NaN.
+    latitudes_list, longitudes_list, time_availabilities_list = [], [], []
+    for player in players:
+        latitudes_list.append(player.latitude)
+        longitudes_list.append(player.longitude)
+        time_availabilities_list.append(player.time_availability)
+    latitudes = np.array(latitudes_list, dtype=float)
+    longitudes = np.array(longitudes_list, dtype=float)
+    time_availabilities = np.array(time_availabilities_list, dtype=float)
+
+    lat_1 = math.radians(avail_time.latitude)
+    lat_2 = np.radians(latitudes)
+    d_lat = lat_2 - lat_1
+    d_lon = np.radians(longitudes - avail_time.longitude)
+    a = (
+        np.sin(d_lat / 2) ** 2
+        + math.cos(lat_1) * np.cos(lat_2) * np.sin(d_lon / 2) ** 2
+    )
+    scores = 2 * EARTH_RADIUS_KM * np.arcsin(np.minimum(1.0, np.sqrt(a)))
+    scores = np.where(np.isnan(scores), MAX_DISTANCE_KM, scores)
+
+    time_availability = PlayerFilters.to_time_availability(avail_time.time)
+    scores += np.where(
+        time_availabilities != time_availability, AVAILABILITY_PENALTY_KM, 0.0
+    )
+    return list(scores.tolist())
+
+
+def score_players(avail_time: AvailableTime, players: list[Player]) -> list[float]:
+    """
+    Distance of each player to the available time, lower is more similar:
+    the haversine distance in km, plus AVAILABILITY_PENALTY_KM when the
+    player is available in another time band.
+    Vectorized with NumPy from NUMPY_MIN_CANDIDATES players.
+    """
+    if len(players) >= NUMPY_MIN_CANDIDATES:
+        return score_players_numpy(avail_time, players)
+    return score_players_python(avail_time, players)
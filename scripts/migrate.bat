@@ -0,0 +1 @@
+docker exec matches-service-matches-service-1 alembic upgrade head
@@ -0,0 +1,3 @@
+#!/usr/bin/env bash
+
+docker exec matches-service-matches-service-1 alembic upgrade head